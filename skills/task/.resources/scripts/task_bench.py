@@ -0,0 +1,611 @@
+#!/usr/bin/env python3
+"""
+task_bench.py - Benchmarks for the task scripts on generated task corpora.
+
+Generates synthetic tasks (deterministic for a given --seed) and times the
+hot paths of the task scripts against their baselines.
+
+Usage:
+    python task_bench.py frontmatter --tasks 20000
+    python task_bench.py frontmatter --tasks 20000 --json
+    python task_bench.py discovery --tasks 2000 --latency-ms 1 --jobs 32
+    python task_bench.py memory --tasks 100000
+    python task_bench.py snapshot --tasks 100000
+    python task_bench.py graph --tasks 100000 --edges 500000
+    python task_bench.py staleness --tasks 100000
+    python task_bench.py forecast --tasks 100000
+    python task_bench.py timedelta --tasks 100000
+
+Benchmarks:
+    frontmatter   Fast-path frontmatter parser vs yaml.safe_load
+    discovery     Threaded scandir discovery vs the serial iterdir walk, with
+                  simulated per-syscall latency (stat and file reads)
+    memory        Resident size of a listed task set as per-task dicts vs
+                  compact TaskRecords (task_record.py), plus the time to
+                  build, filter and sort each
+    snapshot      A dashboard query (two group-by counts and a staleness
+                  histogram) over parsed task JSON vs task_snapshot.py
+                  columns (.json, .npz and already loaded)
+    graph         task_graph.py on a generated DAG: build, cycle detection,
+                  topological order and closure times, and ready-set upkeep
+                  per lifecycle change (incremental vs full recompute)
+    staleness     Staleness / expiry of a whole root at one instant: per-task
+                  task_status.compute_staleness vs task_snapshot.staleness_sweep
+                  over epoch columns
+    forecast      "Going stale in the next 7 days" by rescanning every task
+                  (derive_fields at both ends) vs task_forecast.py's sorted
+                  stale-at index (build once, then bisect per query)
+    timedelta     Per-row cost of timestamp + offset arithmetic: one
+                  timedelta.py process per row, parse_rfc3339 / timedelta /
+                  format_rfc3339 per row, and timedelta.py --batch
+                  (--tasks is the row count)
+"""
+
+import argparse
+import bisect
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Iterator
+
+import task_forecast
+import task_snapshot
+import task_store
+import timedelta as timedelta_cli
+from task_graph import GraphTask, TaskGraph
+from task_index import load_task_frontmatter
+from task_record import TaskRecord
+from task_list import derive_fields
+from task_status import compute_derived_status, compute_staleness
+from task_store import TASK_FILENAME, parse_frontmatter_fast
+
+KINDS = ["feature", "bugfix", "refactor", "research", "documentation", "maintenance", "exploration", "spike"]
+SCOPES = ["trivial", "minor", "moderate", "major", "epic"]
+RISKS = ["none", "low", "medium", "high", "critical"]
+EPISTEMIC_STATES = ["candidate", "draft", "validated", "invalidated"]
+LIFECYCLE_STATES = ["inactive", "active", "blocked", "completed", "abandoned"]
+CONFIDENCES = ["low", "medium", "high"]
+ORIGINS = ["human", "agent", "mixed"]
+BASE_EPOCH = 1767225600  # 2026-01-01T00:00:00Z
+
+
+def rfc3339(epoch: int) -> str:
+    """Format epoch seconds as RFC3339 UTC."""
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(epoch))
+
+
+def generate_frontmatter(rng: random.Random, index: int, unquoted_timestamps: float = 0.0) -> str:
+    """Generate one schema-shaped frontmatter block (without delimiters)."""
+    task_id = f"task-{index:06d}"
+    created = BASE_EPOCH + rng.randrange(0, 300 * 86400)
+    quote = "" if rng.random() < unquoted_timestamps else '"'
+
+    lines = [
+        f'id: "{task_id}"',
+        f'title: "Generated task {index}: {rng.choice(KINDS)} work"',
+        f"kind: {rng.choice(KINDS)}",
+        f"scope: {rng.choice(SCOPES)}",
+        f"risk: {rng.choice(RISKS)}",
+        f"epistemic_state: {rng.choice(EPISTEMIC_STATES)}",
+        f"confidence: {rng.choice(CONFIDENCES)}",
+        f"origin: {rng.choice(ORIGINS)}",
+        f"lifecycle_state: {rng.choice(LIFECYCLE_STATES)}",
+        f"created_at: {quote}{rfc3339(created)}{quote}",
+    ]
+    if rng.random() < 0.5:
+        lines.append(f'last_reviewed_at: "{rfc3339(created + rng.randrange(0, 30 * 86400))}"')
+    if rng.random() < 0.2:
+        lines.append(f'expires_at: "{rfc3339(created + rng.randrange(0, 90 * 86400))}"')
+    if rng.random() < 0.5:
+        lines.append(f"staleness_days_threshold: {rng.choice([7, 14, 30])}")
+    lines += [
+        f'intent_hash: "{rng.getrandbits(256):064x}"',
+        "intent_hash_algo: sha256-v1",
+        "intent_hash_scope: canonical-intent",
+    ]
+    if index and rng.random() < 0.5:
+        lines.append("depends_on:")
+        for _ in range(rng.randint(1, 3)):
+            lines.append(f"  - task-{rng.randrange(0, index):06d}")
+    if rng.random() < 0.5:
+        lines.append(f"tags: [{', '.join(rng.sample(['api', 'auth', 'db', 'ui', 'infra'], 2))}]")
+    return "\n" + "\n".join(lines) + "\n"
+
+
+def time_call(fn: Callable[[], object], repeat: int) -> float:
+    """Return the best wall time of `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def write_corpus(root: Path, tasks: int, seed: int) -> None:
+    """Write a generated task corpus as <root>/task-NNNNNN/00_TASK.md."""
+    rng = random.Random(seed)
+    for i in range(tasks):
+        task_dir = root / f"task-{i:06d}"
+        task_dir.mkdir(parents=True, exist_ok=True)
+        body = "\n# Task\n\n## Intent\n\nGenerated task body.\n"
+        (task_dir / TASK_FILENAME).write_text("---" + generate_frontmatter(rng, i) + "---\n" + body)
+
+
+@contextmanager
+def simulated_latency(seconds: float) -> Iterator[None]:
+    """Delay every os.stat and task file read by `seconds`, as on a remote filesystem."""
+    real_stat = os.stat
+    real_read = task_store.read_frontmatter_raw
+
+    def slow_stat(*args, **kwargs):
+        time.sleep(seconds)
+        return real_stat(*args, **kwargs)
+
+    def slow_read(*args, **kwargs):
+        time.sleep(seconds)
+        return real_read(*args, **kwargs)
+
+    os.stat = slow_stat
+    task_store.read_frontmatter_raw = slow_read
+    try:
+        yield
+    finally:
+        os.stat = real_stat
+        task_store.read_frontmatter_raw = real_read
+
+
+def read_frontmatter_or_empty(task_file: Path) -> dict:
+    """Frontmatter of a task file ({} if missing or unparseable), as the CLIs read it."""
+    try:
+        return task_store.read_frontmatter(task_file)
+    except Exception:
+        return {}
+
+
+def serial_iterdir_discover(root: Path) -> list[tuple[Path, dict]]:
+    """The original discovery walk: iterdir plus is_dir/exists per entry."""
+    found = []
+    for task_dir in root.iterdir():
+        if not task_dir.is_dir():
+            continue
+        task_file = task_dir / TASK_FILENAME
+        if not task_file.exists():
+            continue
+        frontmatter = read_frontmatter_or_empty(task_file)
+        if frontmatter:
+            found.append((task_dir, frontmatter))
+    return found
+
+
+def bench_discovery(args: argparse.Namespace) -> dict:
+    """Threaded scandir discovery vs serial iterdir under simulated I/O latency."""
+    latency = args.latency_ms / 1000.0
+
+    def cold(fn: Callable[[], list]) -> Callable[[], list]:
+        def run():
+            task_store.clear_cache()
+            return fn()
+        return run
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write_corpus(root, args.tasks, args.seed)
+        variants = [("iterdir serial (original)", cold(lambda: serial_iterdir_discover(root)))]
+        for jobs in sorted({1, 4, args.jobs}):
+            variants.append((
+                f"scandir jobs={jobs}",
+                cold(lambda jobs=jobs: load_task_frontmatter(root, read_frontmatter_or_empty, jobs)),
+            ))
+
+        expected = sorted(str(task_dir) for task_dir, _ in variants[0][1]())
+        mismatches = sum(
+            sorted(str(task_dir) for task_dir, _ in fn()) != expected for _, fn in variants[1:]
+        )
+        with simulated_latency(latency):
+            results = [{"name": name, "seconds": time_call(fn, args.repeat)} for name, fn in variants]
+
+    return {
+        "benchmark": "discovery",
+        "tasks": args.tasks,
+        "latency_ms": args.latency_ms,
+        "mismatches": mismatches,
+        "results": results,
+    }
+
+
+def bench_frontmatter(args: argparse.Namespace) -> dict:
+    """Fast-path frontmatter parser vs yaml.safe_load on a generated corpus."""
+    import yaml
+
+    tasks, repeat = args.tasks, args.repeat
+    rng = random.Random(args.seed)
+    corpus = [generate_frontmatter(rng, i, unquoted_timestamps=0.05) for i in range(tasks)]
+
+    mismatches = 0
+    fallbacks = 0
+    for raw in corpus:
+        fast = parse_frontmatter_fast(raw)
+        if fast is None:
+            fallbacks += 1
+        elif fast != yaml.safe_load(raw.strip()):
+            mismatches += 1
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    yaml_seconds = time_call(lambda: [yaml.load(raw.strip(), Loader=yaml.SafeLoader) for raw in corpus], repeat)
+    cyaml_seconds = time_call(lambda: [yaml.load(raw.strip(), Loader=loader) for raw in corpus], repeat)
+    fast_seconds = time_call(lambda: [parse_frontmatter_fast(raw) for raw in corpus], repeat)
+
+    return {
+        "benchmark": "frontmatter",
+        "tasks": tasks,
+        "fast_path_fallbacks": fallbacks,
+        "mismatches": mismatches,
+        "results": [
+            {"name": "yaml.safe_load", "seconds": yaml_seconds},
+            {"name": f"yaml.load({loader.__name__})", "seconds": cyaml_seconds},
+            {"name": "parse_frontmatter_fast", "seconds": fast_seconds},
+        ],
+    }
+
+
+def measure_resident(build: Callable[[], list]) -> tuple[list, int]:
+    """Run `build` and return its result with the bytes still allocated for it."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        return result, tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+def bench_memory(args: argparse.Namespace) -> dict:
+    """Per-task dicts (task_list default) vs TaskRecords (task_list --compact)."""
+    rng = random.Random(args.seed)
+    corpus = [
+        (f"tasks/task-{i:06d}", generate_frontmatter(rng, i))
+        for i in range(args.tasks)
+    ]
+
+    def as_dicts() -> list:
+        return [
+            {"path": path, "dir_name": path.rsplit("/", 1)[-1], **parse_frontmatter_fast(raw)}
+            for path, raw in corpus
+        ]
+
+    def as_records() -> list:
+        return [TaskRecord.from_frontmatter(path, parse_frontmatter_fast(raw)) for path, raw in corpus]
+
+    def scan(tasks: list) -> list:
+        active = [t for t in tasks if t.get("lifecycle_state") == "active" and t.get("risk") != "none"]
+        return sorted(active, key=lambda t: (t.get("created_at"), t.get("path")), reverse=True)
+
+    dicts, dict_bytes = measure_resident(as_dicts)
+    records, record_bytes = measure_resident(as_records)
+    mismatches = sum(record.to_dict() != task for record, task in zip(records, dicts))
+    scan_mismatches = [t["path"] for t in scan(dicts)] != [r.path for r in scan(records)]
+    del dicts, records
+
+    results = []
+    for name, build, size in (("dict per task", as_dicts, dict_bytes), ("TaskRecord", as_records, record_bytes)):
+        tasks = build()
+        results.append({
+            "name": name,
+            "seconds": time_call(build, args.repeat),
+            "scan_seconds": time_call(lambda: scan(tasks), args.repeat),
+            "bytes": size,
+            "bytes_per_task": size // max(args.tasks, 1),
+        })
+        del tasks
+
+    return {
+        "benchmark": "memory",
+        "tasks": args.tasks,
+        "mismatches": mismatches + scan_mismatches,
+        "results": results,
+    }
+
+
+def bench_snapshot(args: argparse.Namespace) -> dict:
+    """Dashboard aggregations over task JSON vs a columnar snapshot."""
+    rng = random.Random(args.seed)
+    rows = []
+    for i in range(args.tasks):
+        path = f"tasks/task-{i:06d}"
+        frontmatter = parse_frontmatter_fast(generate_frontmatter(rng, i))
+        rows.append((path, frontmatter, compute_derived_status(Path(path), frontmatter)))
+    edges = [0, 7, 14, 30, 90]
+
+    def from_json(text: str) -> tuple:
+        tasks = json.loads(text)
+        by_kind_risk = Counter((t.get("kind"), t.get("risk")) for t in tasks)
+        stale_by_state = Counter((t.get("lifecycle_state"),) for t in tasks if t["is_stale"])
+        buckets = [0] * (len(edges) + 1)
+        for t in tasks:
+            if t["days_since_review"] is not None:
+                buckets[bisect.bisect_right(edges, t["days_since_review"])] += 1
+        return dict(by_kind_risk), dict(stale_by_state), buckets
+
+    def from_snapshot(snapshot: task_snapshot.TaskSnapshot) -> tuple:
+        stale = task_snapshot.select(snapshot, {"is_stale": "true"})
+        return (
+            dict(task_snapshot.count_by(snapshot, ["kind", "risk"])),
+            dict(task_snapshot.count_by(snapshot, ["lifecycle_state"], stale)),
+            task_snapshot.histogram(snapshot, "days_since_review", edges)[0],
+        )
+
+    snapshot = task_snapshot.build_snapshot(rows)
+    text = json.dumps([{"path": path, **fm, **status} for path, fm, status in rows], indent=2)
+    expected = from_json(text)
+    results = [{"name": "json.loads + Counter", "seconds": time_call(lambda: from_json(text), args.repeat)}]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        formats = [".json", ".npz"] if task_snapshot.np is not None else [".json"]
+        for suffix in formats:
+            path = Path(tmp) / f"snapshot{suffix}"
+            task_snapshot.save_snapshot(snapshot, path)
+            results.append({
+                "name": f"load {suffix} snapshot + aggregate",
+                "seconds": time_call(lambda: from_snapshot(task_snapshot.load_snapshot(path)), args.repeat),
+            })
+    results.append({
+        "name": "loaded snapshot: aggregate",
+        "seconds": time_call(lambda: from_snapshot(snapshot), args.repeat),
+    })
+
+    return {
+        "benchmark": "snapshot",
+        "tasks": args.tasks,
+        "numpy": task_snapshot.np is not None,
+        "mismatches": int(from_snapshot(snapshot) != expected),
+        "results": results,
+    }
+
+
+def graph_states(rng: random.Random) -> tuple[str, str]:
+    """(lifecycle, epistemic) for a generated graph task; mostly completed and validated,
+    as in a long-running backlog, so changes propagate through satisfied chains."""
+    state = "completed" if rng.random() < 0.8 else rng.choice(LIFECYCLE_STATES)
+    epistemic = "validated" if rng.random() < 0.95 else rng.choice(EPISTEMIC_STATES)
+    return state, epistemic
+
+
+def bench_graph(args: argparse.Namespace) -> dict:
+    """Dependency graph operations at --tasks nodes / --edges edges."""
+    rng = random.Random(args.seed)
+    tasks = []
+    per_task = args.edges / max(args.tasks - 1, 1)
+    for i in range(args.tasks):
+        count = min(i, int(per_task) + (rng.random() < per_task % 1))
+        deps = tuple(f"task-{dep:06d}" for dep in rng.sample(range(i), count)) if count else ()
+        state, epistemic = graph_states(rng)
+        tasks.append(GraphTask(f"task-{i:06d}", f"task-{i:06d}", "", state, epistemic, rfc3339(BASE_EPOCH + i), deps))
+
+    started = time.perf_counter()
+    graph = TaskGraph(tasks)
+    build_seconds = time.perf_counter() - started
+    cycles_seconds = time_call(graph.cycles, args.repeat)
+    order_seconds = time_call(graph.topological_order, args.repeat)
+    probes = [task.task_id for task in rng.sample(tasks, min(100, len(tasks)))]
+    closure_seconds = time_call(lambda: [graph.dependencies(task_id) for task_id in probes], 1) / max(len(probes), 1)
+
+    changes = [
+        (task.task_id, *graph_states(rng))
+        for task in rng.sample(tasks, min(1000, len(tasks)))
+    ]
+    touched = 0
+    started = time.perf_counter()
+    for task_id, state, epistemic in changes:
+        touched += len(graph.set_state(task_id, state, epistemic))
+    incremental_seconds = (time.perf_counter() - started) / max(len(changes), 1)
+    incremental = (bytes(graph.satisfied), list(graph.pending), set(graph.ready))
+    full_seconds = time_call(graph.settle, args.repeat)
+
+    return {
+        "benchmark": "graph",
+        "tasks": args.tasks,
+        "edges": graph.edge_count,
+        "build_seconds": round(build_seconds, 4),
+        "cycles_seconds": round(cycles_seconds, 4),
+        "topological_order_seconds": round(order_seconds, 4),
+        "closure_seconds_per_query": round(closure_seconds, 6),
+        "ready": len(graph.ready),
+        "touched_per_change": round(touched / max(len(changes), 1), 2),
+        "mismatches": int(incremental != (bytes(graph.satisfied), graph.pending, graph.ready)),
+        "results": [
+            {"name": "full recompute (settle) / change", "seconds": full_seconds},
+            {"name": "incremental set_state / change", "seconds": incremental_seconds},
+        ],
+    }
+
+
+def bench_staleness(args: argparse.Namespace) -> dict:
+    """Whole-root staleness at one instant: per task vs one pass over snapshot columns."""
+    rng = random.Random(args.seed)
+    now = task_store.parse_now(rfc3339(BASE_EPOCH + 200 * 86400))
+    frontmatters = [parse_frontmatter_fast(generate_frontmatter(rng, i)) for i in range(args.tasks)]
+    snapshot = task_snapshot.build_snapshot(
+        (f"tasks/task-{i:06d}", fm, compute_staleness(fm, now)._asdict()) for i, fm in enumerate(frontmatters)
+    )
+
+    def per_task() -> tuple:
+        results = [compute_staleness(fm, now) for fm in frontmatters]
+        return (
+            [task_snapshot.NULL_INT if r.days_since_review is None else r.days_since_review for r in results],
+            [r.is_stale for r in results],
+            [r.is_expired for r in results],
+        )
+
+    def sweep() -> tuple:
+        swept = task_snapshot.staleness_sweep(snapshot, now)
+        return (
+            [int(days) for days in swept["days_since_review"]],
+            [bool(flag) for flag in swept["is_stale"]],
+            [bool(flag) for flag in swept["is_expired"]],
+        )
+
+    return {
+        "benchmark": "staleness",
+        "tasks": args.tasks,
+        "numpy": task_snapshot.np is not None,
+        "stale": sum(per_task()[1]),
+        "mismatches": int(per_task() != sweep()),
+        "results": [
+            {"name": "per task: compute_staleness", "seconds": time_call(per_task, args.repeat)},
+            {"name": "staleness_sweep", "seconds": time_call(lambda: task_snapshot.staleness_sweep(snapshot, now), args.repeat)},
+        ],
+    }
+
+
+def bench_forecast(args: argparse.Namespace) -> dict:
+    """Window queries over stale-at instants: full rescan vs the sorted index."""
+    rng = random.Random(args.seed)
+    records = [
+        TaskRecord.from_frontmatter(f"tasks/task-{i:06d}", parse_frontmatter_fast(generate_frontmatter(rng, i)))
+        for i in range(args.tasks)
+    ]
+    starts = [task_store.parse_now(rfc3339(BASE_EPOCH + rng.randrange(0, 300 * 86400))) for _ in range(20)]
+    window = timedelta(days=7)
+
+    def rescan(start: datetime) -> list[str]:
+        return [
+            task.id for task in records
+            if derive_fields(task, start + window).is_stale and not derive_fields(task, start).is_stale
+        ]
+
+    started = time.perf_counter()
+    forecast = task_forecast.StalenessForecast(filter(None, map(task_forecast.stale_entry, records)))
+    build_seconds = time.perf_counter() - started
+
+    def indexed(start: datetime) -> list[str]:
+        return [entry.task_id for entry in forecast.between(start, start + window)]
+
+    mismatches = sum(sorted(rescan(start)) != sorted(indexed(start)) for start in starts[:3])
+    return {
+        "benchmark": "forecast",
+        "tasks": args.tasks,
+        "build_seconds": round(build_seconds, 4),
+        "matches_per_query": round(sum(len(indexed(start)) for start in starts) / len(starts), 1),
+        "mismatches": mismatches,
+        "results": [
+            {"name": "rescan / query", "seconds": time_call(lambda: rescan(starts[0]), args.repeat)},
+            {"name": "sorted index / query", "seconds": time_call(lambda: [indexed(s) for s in starts], args.repeat) / len(starts)},
+        ],
+    }
+
+
+def bench_timedelta(args: argparse.Namespace) -> dict:
+    """Timestamp + offset rows: process per row vs datetime per row vs run_batch."""
+    rng = random.Random(args.seed)
+    rows = [
+        (rfc3339(BASE_EPOCH + rng.randrange(0, 300 * 86400)), rng.randrange(-30, 31))
+        for _ in range(args.tasks)
+    ]
+    lines = [f"{timestamp} {days}\n" for timestamp, days in rows]
+    script = str(Path(__file__).with_name("timedelta.py"))
+    env = {**os.environ, "TASK_DAEMON": "0"}
+    calls = min(5, len(rows))
+
+    def process_per_row() -> None:
+        for timestamp, days in rows[:calls]:
+            subprocess.run(
+                [sys.executable, script, "--from", timestamp, "--days", str(days)],
+                check=True, stdout=subprocess.DEVNULL, env=env,
+            )
+
+    def datetime_per_row() -> list[str]:
+        return [
+            timedelta_cli.format_rfc3339(timedelta_cli.parse_rfc3339(timestamp) + timedelta(days=days))
+            for timestamp, days in rows
+        ]
+
+    def batch() -> list[str]:
+        out = io.StringIO()
+        timedelta_cli.run_batch(lines, 0, out)
+        return out.getvalue().splitlines()
+
+    results = [
+        {"name": "process / row", "seconds": time_call(process_per_row, 1) / calls},
+        {"name": "parse_rfc3339 + format / row", "seconds": time_call(datetime_per_row, args.repeat) / len(rows)},
+        {"name": "run_batch / row", "seconds": time_call(batch, args.repeat) / len(rows)},
+    ]
+    return {
+        "benchmark": "timedelta",
+        "rows": len(rows),
+        "mismatches": sum(a != b for a, b in zip(datetime_per_row(), batch())),
+        "microseconds_per_row": {result["name"]: round(result["seconds"] * 1e6, 2) for result in results},
+        "results": results,
+    }
+
+
+BENCHMARKS = {
+    "discovery": bench_discovery,
+    "forecast": bench_forecast,
+    "frontmatter": bench_frontmatter,
+    "graph": bench_graph,
+    "memory": bench_memory,
+    "snapshot": bench_snapshot,
+    "staleness": bench_staleness,
+    "timedelta": bench_timedelta,
+}
+
+
+def print_report(report: dict) -> None:
+    """Print a benchmark report as a table."""
+    extra = {k: v for k, v in report.items() if k not in ("benchmark", "results")}
+    print(f"Benchmark: {report['benchmark']}")
+    for key, value in extra.items():
+        print(f"  {key}: {value}")
+    baseline = report["results"][0]["seconds"]
+    with_bytes = "bytes" in report["results"][0]
+    header = f"\n  {'NAME':<36} {'SECONDS':>10} {'SPEEDUP':>8}"
+    print(header + (f" {'SCAN':>8} {'MB':>8} {'B/TASK':>7}" if with_bytes else ""))
+    for result in report["results"]:
+        speedup = baseline / result["seconds"] if result["seconds"] else float("inf")
+        line = f"  {result['name']:<36} {result['seconds']:>10.4f} {speedup:>7.1f}x"
+        if with_bytes:
+            line += f" {result['scan_seconds']:>8.4f} {result['bytes'] / 1e6:>8.1f} {result['bytes_per_task']:>7}"
+        print(line)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark task scripts on generated task corpora"
+    )
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS), help="Benchmark to run")
+    parser.add_argument("--tasks", type=int, default=10000, help="Number of generated tasks")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus generator seed")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per variant (best is reported)")
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="discovery: simulated latency per stat/read")
+    parser.add_argument("--jobs", type=int, default=16, help="discovery: thread count to compare")
+    parser.add_argument("--edges", type=int, default=50000, help="graph: number of dependency edges")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+
+    try:
+        report = BENCHMARKS[args.benchmark](args)
+    except ImportError as e:
+        print(f"Error: benchmark requires a missing module: {e}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+task_client.py - Hand a task CLI call to a running task_daemon.py.
+
+task_list.py, task_nav.py, task_status.py and task_hash.py call delegate()
+as the first thing they run, before their own imports, so a delegated call
+costs interpreter startup plus this module (stdlib only) rather than the
+CLI's full import graph. When no daemon answers, the CLI carries on locally.
+
+The daemon streams a call's output back as JSON lines: {"stdout": text} and
+{"stderr": text} frames as the command writes, then {"exit_code": n}. Large
+outputs (e.g. task_list.py --ndjson) are passed through chunk by chunk and
+never held whole on either side.
+
+Usage (at the top of a CLI, before its other imports):
+    if __name__ == "__main__":
+        from task_client import delegate
+
+        delegate("task_list")
+"""
+
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Iterator, Optional
+
+SOCKET_FILENAME = ".task_daemon.sock"
+ROOT_COMMANDS = ("task_list", "task_nav")
+REQUEST_TIMEOUT = 30.0
+# len(task_layout.SHARD_KEYS): the deepest a task sits below its root.
+MAX_SHARD_DEPTH = 4
+# task_store.NOW_ENV, forwarded so delegated runs use the client's clock.
+NOW_ENV = "TASK_NOW"
+
+
+def socket_path(root: Path) -> Path:
+    """Return the socket path for a task root."""
+    override = os.environ.get("TASK_DAEMON_SOCKET")
+    if override:
+        return Path(override)
+    return root / SOCKET_FILENAME
+
+
+def _option_value(argv: list[str], option: str) -> Optional[str]:
+    """Return the value of `--option X` / `--option=X` from argv, if present."""
+    for i, arg in enumerate(argv):
+        if arg == option and i + 1 < len(argv):
+            return argv[i + 1]
+        if arg.startswith(option + "="):
+            return arg[len(option) + 1:]
+    return None
+
+
+def resolve_root(command: str, argv: list[str]) -> Optional[Path]:
+    """Return the task root a CLI invocation operates on, or None if it must run locally."""
+    root = _option_value(argv, "--root")
+    if command in ROOT_COMMANDS:
+        return Path(root or "tasks/")
+    if root is not None:
+        return None
+    task = _option_value(argv, "--task")
+    if task is None:
+        return None
+    # In a sharded root the task sits below one or more shard directories.
+    for parent in list(Path(task).parents)[:MAX_SHARD_DEPTH + 1]:
+        if socket_path(parent).exists():
+            return parent
+    return None
+
+
+def stream_request(path: Path, payload: dict, timeout: float = REQUEST_TIMEOUT) -> Iterator[dict]:
+    """Send one JSON request to a daemon socket and yield its JSON response lines as they arrive."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(path))
+        sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as f:
+            for line in f:
+                yield json.loads(line)
+
+
+def send_request(path: Path, payload: dict, timeout: float = REQUEST_TIMEOUT) -> dict:
+    """Send one JSON request to a daemon socket and return its (single-line) JSON response."""
+    responses = stream_request(path, payload, timeout)
+    try:
+        response = next(responses, None)
+    finally:
+        responses.close()
+    if response is None:
+        raise ValueError("Empty response from task daemon")
+    return response
+
+
+def delegate(command: str) -> None:
+    """
+    Run this process's CLI call on the daemon serving its root and exit with its code.
+
+    Returns (so the CLI runs locally) when TASK_DAEMON=0, when no daemon
+    socket exists for the root, or when the daemon fails before sending
+    any output. A connection lost mid-stream exits with status 1.
+    """
+    if os.environ.get("TASK_DAEMON") == "0":
+        return
+    argv = sys.argv[1:]
+    root = resolve_root(command, argv)
+    path = socket_path(root) if root is not None else None
+    if path is None or not path.exists():
+        return
+
+    frames = stream_request(path, {
+        "command": command,
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "now": os.environ.get(NOW_ENV),
+    })
+    started = False
+    try:
+        while True:
+            try:
+                frame = next(frames, None)
+            except (OSError, ValueError) as e:
+                if not started:
+                    return
+                print(f"Error: Lost connection to task daemon: {e}", file=sys.stderr)
+                sys.exit(1)
+            if frame is None or not ({"stdout", "stderr", "exit_code"} & frame.keys()):
+                if not started:
+                    return
+                print("Error: Task daemon ended the call without an exit code", file=sys.stderr)
+                sys.exit(1)
+            if "exit_code" in frame:
+                sys.exit(frame["exit_code"])
+            started = True
+            if "stdout" in frame:
+                sys.stdout.write(frame["stdout"])
+            else:
+                sys.stderr.write(frame["stderr"])
+    finally:
+        frames.close()
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+task_daemon.py - Resident task server for the task scripts.
+
+Keeps parsed task files in memory and answers task_list, task_status,
+task_nav and task_hash invocations over a Unix socket, so repeated calls
+skip the CLIs' imports and reparsing. The CLIs delegate to a running daemon
+transparently (task_client.py, before their own imports) and run locally
+when none is listening. Output is streamed back to the client as the
+command writes it.
+
+The resident task set is kept current by task_watch.py: each request first
+applies pending change events. With inotify that costs O(changes); the
+polling backend (sharded roots, or --poll) stats every task file per request,
+which is still far cheaper than reparsing the root.
+
+Usage:
+    python task_daemon.py --root tasks/
+    python task_daemon.py --root tasks/ --status
+    python task_daemon.py --root tasks/ --stop
+
+Options:
+    --interval  Seconds between background event drains (default: 2)
+    --poll      Use the polling watcher even where inotify is available
+    --socket    Socket path (default: <root>/.task_daemon.sock)
+
+Environment:
+    TASK_DAEMON=0         Never delegate CLI calls to a daemon
+    TASK_DAEMON_SOCKET    Socket path used by clients and the daemon
+    TASK_NOW              Forwarded with each call, so delegated runs use the
+                          client's clock (see task_store.init_clock)
+
+Delegated calls:
+    task_list.py, task_nav.py, and task_status.py / task_hash.py with --task.
+    Bulk --root modes of task_status.py / task_hash.py use process pools and
+    always run locally.
+"""
+
+import argparse
+import importlib
+import io
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Callable, Optional
+
+from task_client import send_request, socket_path
+from task_layout import read_layout
+from task_query import AttributeIndex
+from task_store import NOW_ENV, TASK_FILENAME, invalidate, read_frontmatter, reset_clock, set_resident
+from task_watch import PollingWatcher, TaskEvent, open_watcher
+
+COMMANDS = ("task_list", "task_nav", "task_status", "task_hash")
+# Characters of stdout buffered per frame sent to the client.
+FRAME_CHARS = 64 * 1024
+
+
+class FrameStream(io.TextIOBase):
+    """
+    A text stream that forwards writes to the client as {name: text} frames.
+
+    Up to `limit` characters are buffered per frame (0 sends every write).
+    `ahead` is flushed before each frame, so stderr lines stay in order
+    with the stdout written before them.
+    """
+
+    def __init__(self, name: str, send: Callable[[dict], None], limit: int, ahead: Optional["FrameStream"] = None):
+        self.name = name
+        self.send = send
+        self.limit = limit
+        self.ahead = ahead
+        self.parts: list[str] = []
+        self.size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        self.parts.append(text)
+        self.size += len(text)
+        if self.size >= self.limit:
+            self.flush()
+        return len(text)
+
+    def flush(self) -> None:
+        if self.ahead is not None:
+            self.ahead.flush()
+        if self.parts:
+            text = "".join(self.parts)
+            self.parts, self.size = [], 0
+            self.send({self.name: text})
+
+
+def execute(command: str, argv: list[str], cwd: str, now: Optional[str], send: Callable[[dict], None]) -> int:
+    """Run a task CLI's main() in this process, streaming its output through `send`; return its exit code.
+
+    `now` is the client's TASK_NOW; it applies for this call only.
+    """
+    main = importlib.import_module(command).main
+    stdout = FrameStream("stdout", send, FRAME_CHARS)
+    stderr = FrameStream("stderr", send, 0, ahead=stdout)
+    saved_argv, saved_cwd, saved_now = sys.argv, os.getcwd(), os.environ.get(NOW_ENV)
+    try:
+        os.chdir(cwd)
+        sys.argv = [f"{command}.py", *argv]
+        if now:
+            os.environ[NOW_ENV] = now
+        else:
+            os.environ.pop(NOW_ENV, None)
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                exit_code = main()
+            except SystemExit as e:
+                exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            except Exception as e:
+                print(f"Error: {e}", file=sys.stderr)
+                exit_code = 1
+            stdout.flush()
+    finally:
+        sys.argv = saved_argv
+        os.chdir(saved_cwd)
+        if saved_now is None:
+            os.environ.pop(NOW_ENV, None)
+        else:
+            os.environ[NOW_ENV] = saved_now
+        reset_clock()
+    return exit_code
+
+
+def load_frontmatter(task_dir: Path) -> dict:
+    """Parse a task's frontmatter ({} if unreadable or invalid)."""
+    try:
+        return read_frontmatter(task_dir / TASK_FILENAME)
+    except Exception:
+        return {}
+
+
+def apply_events(
+    root: Path,
+    tasks: dict[str, dict],
+    index: AttributeIndex,
+    events: list[TaskEvent],
+) -> None:
+    """Update a resident {relative path: frontmatter} set and its index from watcher events."""
+    for event in events:
+        task_dir = root / event.dir_name
+        invalidate(task_dir)
+        previous = tasks.pop(event.dir_name, None)
+        if previous is not None:
+            index.remove(event.dir_name, previous)
+        if event.kind != "delete":
+            frontmatter = load_frontmatter(task_dir)
+            tasks[event.dir_name] = frontmatter
+            index.add(event.dir_name, frontmatter)
+
+
+class TaskRequestHandler(socketserver.StreamRequestHandler):
+    """Handle one JSON request per connection (a CLI call streams several response lines)."""
+
+    connected = True
+
+    def send(self, frame: dict) -> None:
+        """Write one response line. After the client has gone, further lines are dropped."""
+        if not self.connected:
+            return
+        try:
+            self.wfile.write(json.dumps(frame).encode("utf-8") + b"\n")
+        except OSError:
+            # Raised once into the running command, so it stops producing output.
+            self.connected = False
+            raise
+
+    def handle(self) -> None:
+        server = self.server
+        try:
+            request = json.loads(self.rfile.readline())
+            command = request.get("command")
+            with server.lock:
+                server.sync()
+                if command in COMMANDS:
+                    exit_code = execute(
+                        command,
+                        list(request.get("argv", [])),
+                        request.get("cwd") or os.getcwd(),
+                        request.get("now"),
+                        self.send,
+                    )
+                    response = {"exit_code": exit_code}
+                    server.requests += 1
+                elif command == "ping":
+                    response = {
+                        "root": str(server.root),
+                        "pid": os.getpid(),
+                        "tasks": len(server.tasks),
+                        "watcher": server.watcher.backend,
+                        "requests": server.requests,
+                        "uptime_seconds": round(time.monotonic() - server.started, 1),
+                    }
+                elif command == "shutdown":
+                    response = {"stopping": True}
+                    threading.Thread(target=server.shutdown, daemon=True).start()
+                else:
+                    response = {"error": f"Unknown command: {command}"}
+        except (ValueError, AttributeError) as e:
+            response = {"error": f"Bad request: {e}"}
+        try:
+            self.send(response)
+        except OSError:
+            pass
+
+
+class TaskDaemon(socketserver.UnixStreamServer):
+    """Unix socket server holding the resident task set for one root."""
+
+    def __init__(self, path: Path, root: Path, watcher: PollingWatcher):
+        super().__init__(str(path), TaskRequestHandler)
+        self.root = root
+        self.watcher = watcher
+        self.tasks = {name: load_frontmatter(root / name) for name in sorted(watcher.known)}
+        self.index = AttributeIndex()
+        for name, frontmatter in self.tasks.items():
+            self.index.add(name, frontmatter)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.started = time.monotonic()
+        set_resident(root, self.tasks, self.index)
+
+    def server_bind(self) -> None:
+        """Bind the socket owner-only from the start (it runs CLIs as this user)."""
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+        os.chmod(self.server_address, 0o600)
+
+    def sync(self) -> None:
+        """Apply pending filesystem events to the resident task set."""
+        try:
+            apply_events(self.root, self.tasks, self.index, self.watcher.poll())
+        except OSError:
+            pass
+
+
+def drain(server: TaskDaemon, interval: float, stop: threading.Event) -> None:
+    """Background loop applying events between requests (keeps the queue short)."""
+    while not stop.wait(interval):
+        with server.lock:
+            server.sync()
+
+
+def serve(root: Path, path: Path, interval: float, use_inotify: bool = True) -> int:
+    """Run the daemon in the foreground until stopped."""
+    if path.exists():
+        try:
+            send_request(path, {"command": "ping"}, timeout=2.0)
+            print(f"Error: A task daemon is already serving {path}", file=sys.stderr)
+            return 1
+        except (OSError, ValueError):
+            path.unlink()
+
+    resolved = root.resolve()
+    server = TaskDaemon(path, resolved, open_watcher(resolved, use_inotify))
+
+    stop = threading.Event()
+    threading.Thread(target=drain, args=(server, interval, stop), daemon=True).start()
+    print(
+        f"Serving {len(server.tasks)} task(s) from {root} on {path} ({server.watcher.backend})",
+        file=sys.stderr,
+    )
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+        server.watcher.close()
+        path.unlink(missing_ok=True)
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Serve task list/status/nav/hash requests from a resident process"
+    )
+    parser.add_argument(
+        "--root",
+        type=str,
+        default="tasks/",
+        help="Root directory containing task directories"
+    )
+    parser.add_argument("--socket", type=str, help="Socket path (default: <root>/.task_daemon.sock)")
+    parser.add_argument("--interval", type=float, default=2.0, help="Seconds between background event drains")
+    parser.add_argument("--poll", action="store_true", help="Use the polling watcher instead of inotify")
+    parser.add_argument("--status", action="store_true", help="Report whether a daemon is running")
+    parser.add_argument("--stop", action="store_true", help="Stop a running daemon")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+    root = Path(args.root)
+    path = Path(args.socket) if args.socket else socket_path(root)
+
+    if not root.is_dir():
+        print(f"Error: Root directory does not exist: {root}", file=sys.stderr)
+        return 1
+
+    if args.status or args.stop:
+        try:
+            response = send_request(path, {"command": "shutdown" if args.stop else "ping"}, timeout=5.0)
+        except (OSError, ValueError):
+            if args.json:
+                print(json.dumps({"running": False, "socket": str(path)}))
+            else:
+                print(f"No task daemon running on {path}")
+            return 1
+        if args.json:
+            print(json.dumps({"running": True, "socket": str(path), **response}))
+        elif args.stop:
+            print(f"Stopped task daemon on {path}")
+        else:
+            print(f"Task daemon running on {path}")
+            print(f"  PID: {response['pid']}")
+            print(f"  Tasks: {response['tasks']}")
+            print(f"  Watcher: {response['watcher']}")
+            print(f"  Requests: {response['requests']}")
+            print(f"  Uptime: {response['uptime_seconds']}s")
+        return 0
+
+    try:
+        read_layout(root)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    return serve(root, path, args.interval, use_inotify=not args.poll)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+task_forecast.py - Forecast which tasks go stale in a time window.
+
+Computes each task's stale-at instant (task_list.stale_at: the reference
+time, last_reviewed_at or created_at, plus the staleness threshold, or
+expires_at, whichever comes first), sorts the tasks by it once, and answers
+window queries by bisection in O(log n + k) for k matching tasks.
+
+A task counts as going stale in a window (FROM, UNTIL] when it is not stale
+at FROM and is stale at UNTIL, exactly as task_list.py --stale would report
+at those two instants.
+
+Usage:
+    python task_forecast.py --root tasks/ --days 14
+    python task_forecast.py --root tasks/ --from 2026-03-01T00:00:00Z --until 2026-04-01T00:00:00Z
+    python task_forecast.py --root tasks/ --overdue
+    python task_forecast.py --root tasks/ --days 7 --json
+
+Options:
+    --days      Window of N days starting at --from
+    --from      Window start, RFC3339 (default: now)
+    --until     Window end, RFC3339
+    --overdue   Tasks already stale at --from
+    --all       Include completed and abandoned tasks
+    --now       Current time, RFC3339 (default: $TASK_NOW, else the system clock)
+    --no-index  Scan every task instead of using the persistent index
+
+Output:
+    One line per task, soonest first: stale-at instant, reason (review or
+    expiry) and task ID (JSON object with --json)
+"""
+
+import argparse
+import bisect
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional
+
+from task_graph import CLOSED_STATES
+from task_layout import read_layout
+from task_list import MIN_DATETIME, Task, iter_tasks, stale_at
+from task_store import init_clock, parse_now
+from timedelta import format_rfc3339
+
+
+class StaleEntry(NamedTuple):
+    """A task and the instant it goes stale (MIN_DATETIME: invalid expires_at)."""
+
+    stale_at: datetime
+    reason: str
+    task_id: str
+    path: str
+    lifecycle_state: str
+
+
+def stale_entry(task: Task) -> Optional[StaleEntry]:
+    """Return a task's StaleEntry, or None if it never goes stale."""
+    due = stale_at(task)
+    if due is None:
+        return None
+    return StaleEntry(
+        due[0],
+        due[1],
+        str(task.get("id") or task.get("dir_name")),
+        task.get("path"),
+        str(task.get("lifecycle_state") or "inactive"),
+    )
+
+
+class StalenessForecast:
+    """Tasks sorted by stale-at instant; window queries by bisection."""
+
+    def __init__(self, entries: Iterable[StaleEntry]):
+        self.entries = sorted(entries)
+        self.instants = [entry.stale_at for entry in self.entries]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def stale_by(self, at: datetime) -> list[StaleEntry]:
+        """Tasks stale at `at`, soonest first."""
+        return self.entries[:bisect.bisect_right(self.instants, at)]
+
+    def between(self, start: datetime, end: datetime) -> list[StaleEntry]:
+        """Tasks not stale at `start` but stale at `end`, soonest first."""
+        lo = bisect.bisect_right(self.instants, start)
+        hi = bisect.bisect_right(self.instants, end)
+        return self.entries[lo:hi]
+
+
+def load_forecast(root: Path, use_index: bool = True, include_closed: bool = False) -> StalenessForecast:
+    """Build the forecast for every task under root (open tasks only unless include_closed)."""
+    entries = []
+    for task in iter_tasks(root, use_index):
+        if not include_closed and task.get("lifecycle_state") in CLOSED_STATES:
+            continue
+        entry = stale_entry(task)
+        if entry is not None:
+            entries.append(entry)
+    return StalenessForecast(entries)
+
+
+def format_instant(instant: datetime) -> Optional[str]:
+    return None if instant == MIN_DATETIME else format_rfc3339(instant)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Forecast which tasks go stale in a time window"
+    )
+    parser.add_argument(
+        "--root",
+        type=str,
+        default="tasks/",
+        help="Root directory containing task directories"
+    )
+    window = parser.add_mutually_exclusive_group(required=True)
+    window.add_argument("--days", type=int, help="Tasks going stale within N days after --from")
+    window.add_argument("--until", type=str, help="Tasks going stale up to this RFC3339 time")
+    window.add_argument("--overdue", action="store_true", help="Tasks already stale at --from")
+    parser.add_argument("--from", dest="from_time", type=str, help="Window start, RFC3339 (default: now)")
+    parser.add_argument("--all", action="store_true", help="Include completed and abandoned tasks")
+    parser.add_argument("--now", type=str, help="Current time, RFC3339 (default: $TASK_NOW)")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--no-index", action="store_true", help="Scan all tasks instead of using the index")
+
+    args = parser.parse_args()
+    root = Path(args.root)
+
+    if not root.is_dir():
+        print(f"Error: Root directory does not exist: {root}", file=sys.stderr)
+        return 1
+
+    try:
+        read_layout(root)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    try:
+        now = init_clock(args.now)
+        start = parse_now(args.from_time) if args.from_time else now
+        if args.days is not None:
+            if args.days < 0:
+                raise ValueError("--days must not be negative")
+            end = start + timedelta(days=args.days)
+        elif args.until:
+            end = parse_now(args.until)
+            if end < start:
+                raise ValueError("--until must not be before --from")
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    forecast = load_forecast(root, use_index=not args.no_index, include_closed=args.all)
+    entries = forecast.stale_by(start) if args.overdue else forecast.between(start, end)
+
+    if args.json:
+        result = {
+            "from": None if args.overdue else format_rfc3339(start),
+            "until": format_rfc3339(start if args.overdue else end),
+            "count": len(entries),
+            "total": len(forecast),
+            "tasks": [
+                {
+                    "id": entry.task_id,
+                    "path": entry.path,
+                    "stale_at": format_instant(entry.stale_at),
+                    "reason": entry.reason,
+                    "lifecycle_state": entry.lifecycle_state,
+                }
+                for entry in entries
+            ],
+        }
+        print(json.dumps(result, indent=2))
+        return 0
+
+    if not entries:
+        print("No tasks found.")
+    else:
+        print(f"{'STALE AT':<20}  {'REASON':<6}  TASK")
+        for entry in entries:
+            print(f"{format_instant(entry.stale_at) or '-':<20}  {entry.reason:<6}  {entry.task_id}")
+    if args.overdue:
+        print(f"\n{len(entries)} of {len(forecast)} task(s) stale at {format_rfc3339(start)}")
+    else:
+        print(f"\n{len(entries)} of {len(forecast)} task(s) going stale after {format_rfc3339(start)} until {format_rfc3339(end)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+task_graph.py - Dependency graph over depends_on / blocked_by.
+
+Builds an in-memory graph with an edge from each task to every task it
+lists in depends_on or blocked_by (both mean "must be completed first").
+Edges name tasks by id, or by directory name where no task has that id.
+
+    cycles          Tarjan's strongly connected components, O(tasks + edges)
+    order           Kahn's topological order: dependencies first, ties by
+                    created_at (oldest first), then directory name
+    satisfied       A task satisfies its dependents when it is completed, not
+                    invalidated, and its own dependencies are satisfied, so
+                    invalidating a task blocks everything built on it
+    ready set       Open tasks (not completed or abandoned) whose every
+                    dependency exists and is satisfied
+    propagation     TaskGraph.set_state walks only the dependents whose
+                    satisfaction actually flips: O(affected subgraph)
+    closure         Transitive dependencies / dependents of one task
+
+Usage:
+    python task_graph.py --root tasks/ --ready
+    python task_graph.py --root tasks/ --order
+    python task_graph.py --root tasks/ --check
+    python task_graph.py --root tasks/ --deps implement-auth
+    python task_graph.py --root tasks/ --dependents implement-auth --json
+
+Options:
+    --check       Report cycles and references to unknown tasks (exit 1 if any)
+    --no-index    Scan every task instead of using the persistent index
+
+Output:
+    Task IDs, one per line (JSON object with --json)
+"""
+
+import argparse
+import heapq
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional
+
+from task_index import created_key, find_task_dirs
+from task_layout import read_layout
+from task_list import Task, iter_tasks, read_frontmatter
+
+DEPENDENCY_FIELDS = ("depends_on", "blocked_by")
+# Lifecycle states that satisfy dependents / take a task out of the ready set.
+DONE_STATE = "completed"
+CLOSED_STATES = frozenset(["completed", "abandoned"])
+# An invalidated task satisfies nothing, whatever its lifecycle state.
+INVALID_STATE = "invalidated"
+
+
+class GraphTask(NamedTuple):
+    """The fields of a task the dependency graph uses."""
+
+    task_id: str
+    dir_name: str
+    path: str
+    lifecycle_state: str
+    epistemic_state: str
+    created_at: str
+    depends_on: tuple[str, ...]
+
+
+def graph_task(task: Task) -> GraphTask:
+    """Extract a GraphTask from a task record or dict."""
+    dir_name = task.get("dir_name")
+    depends_on = []
+    for field in DEPENDENCY_FIELDS:
+        value = task.get(field) or []
+        depends_on.extend(str(item) for item in (value if isinstance(value, list) else [value]))
+    return GraphTask(
+        str(task.get("id") or dir_name),
+        dir_name,
+        task.get("path"),
+        str(task.get("lifecycle_state") or "inactive"),
+        str(task.get("epistemic_state") or "candidate"),
+        str(task.get("created_at") or ""),
+        tuple(depends_on),
+    )
+
+
+class TaskGraph:
+    """Dependency graph over tasks; nodes are ints in (created_at, dir_name) order."""
+
+    def __init__(self, tasks: Iterable[GraphTask]):
+        self.tasks = sorted(tasks, key=lambda t: (created_key(t.created_at), t.dir_name))
+        count = len(self.tasks)
+        self.index: dict[str, int] = {}
+        self.duplicates: list[str] = []
+        for node, task in enumerate(self.tasks):
+            if task.task_id in self.index:
+                self.duplicates.append(task.task_id)
+            else:
+                self.index[task.task_id] = node
+        for node, task in enumerate(self.tasks):
+            self.index.setdefault(task.dir_name, node)
+
+        self.deps: list[list[int]] = [[] for _ in range(count)]
+        self.dependents: list[list[int]] = [[] for _ in range(count)]
+        self.missing: dict[int, list[str]] = {}
+        for node, task in enumerate(self.tasks):
+            resolved = []
+            for name in dict.fromkeys(task.depends_on):
+                dep = self.index.get(name)
+                if dep is None:
+                    self.missing.setdefault(node, []).append(name)
+                else:
+                    resolved.append(dep)
+            # An id and a directory name can name the same task.
+            resolved = list(dict.fromkeys(resolved))
+            self.deps[node] = resolved
+            for dep in resolved:
+                self.dependents[dep].append(node)
+
+        self.states = [task.lifecycle_state for task in self.tasks]
+        self.epistemic = [task.epistemic_state for task in self.tasks]
+        self._paths: Optional[dict[str, int]] = None
+        self.settle()
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(deps) for deps in self.deps)
+
+    def node(self, task_id: str) -> int:
+        """Return the node for a task id or directory name. Raises KeyError."""
+        return self.index[task_id]
+
+    def locate(self, task_dir: str) -> Optional[int]:
+        """Return the node for a task directory path, or None."""
+        if self._paths is None:
+            self._paths = {os.path.abspath(task.path): node for node, task in enumerate(self.tasks) if task.path}
+        return self._paths.get(os.path.abspath(task_dir))
+
+    def ids(self, nodes: Iterable[int]) -> list[str]:
+        return [self.tasks[node].task_id for node in nodes]
+
+    def _satisfies(self, node: int) -> bool:
+        return (
+            self.states[node] == DONE_STATE
+            and self.epistemic[node] != INVALID_STATE
+            and not self.pending[node]
+        )
+
+    def _update_ready(self, node: int) -> None:
+        if not self.pending[node] and self.states[node] not in CLOSED_STATES:
+            self.ready.add(node)
+        else:
+            self.ready.discard(node)
+
+    def settle(self) -> None:
+        """Recompute satisfied / pending / ready for every node from the current states."""
+        count = len(self.tasks)
+        self.satisfied = bytearray(count)
+        # Unsatisfied dependencies per node; unknown references never resolve.
+        self.pending = [len(self.missing.get(node, ())) for node in range(count)]
+        order, stuck = self.topological_order()
+        # Dependencies first, so each node sees its dependencies' final flags;
+        # nodes in or behind a cycle never satisfy anything.
+        for node in order:
+            self.pending[node] += sum(1 for dep in self.deps[node] if not self.satisfied[dep])
+            self.satisfied[node] = self._satisfies(node)
+        for node in stuck:
+            self.pending[node] += sum(1 for dep in self.deps[node] if not self.satisfied[dep])
+        self.ready = {
+            node for node in range(count)
+            if not self.pending[node] and self.states[node] not in CLOSED_STATES
+        }
+
+    def dependencies_met(self, node: int) -> bool:
+        return not self.pending[node]
+
+    def blocking(self, node: int) -> list[str]:
+        """Direct dependencies of a node that are unsatisfied or unknown, by name."""
+        names = [self.tasks[dep].task_id for dep in self.deps[node] if not self.satisfied[dep]]
+        return names + self.missing.get(node, [])
+
+    def set_state(self, task_id: str, lifecycle_state: str, epistemic_state: Optional[str] = None) -> list[int]:
+        """Change a task's states; return the dependents whose blocking dependencies changed.
+
+        Propagation continues only through dependents whose dependencies_met
+        flips, so the cost is O(affected subgraph). Raises KeyError for unknown
+        tasks.
+        """
+        node = self.node(task_id)
+        self.states[node] = lifecycle_state
+        if epistemic_state is not None:
+            self.epistemic[node] = epistemic_state
+        changed: list[int] = []
+        queue = [node]
+        # Flips all go one way per call, so each node is queued at most once.
+        while queue:
+            current = queue.pop()
+            satisfied = self._satisfies(current)
+            if satisfied == self.satisfied[current]:
+                continue
+            self.satisfied[current] = satisfied
+            delta = -1 if satisfied else 1
+            for dependent in self.dependents[current]:
+                was_met = not self.pending[dependent]
+                self.pending[dependent] += delta
+                changed.append(dependent)
+                if was_met != (not self.pending[dependent]):
+                    queue.append(dependent)
+        self._update_ready(node)
+        changed = list(dict.fromkeys(changed))
+        for dependent in changed:
+            self._update_ready(dependent)
+        return changed
+
+    def ready_nodes(self) -> list[int]:
+        """Ready tasks, oldest first."""
+        return sorted(self.ready)
+
+    def cycles(self) -> list[list[int]]:
+        """Return every dependency cycle (strongly connected component) as sorted nodes."""
+        count = len(self.tasks)
+        deps = self.deps
+        order = [-1] * count
+        low = [0] * count
+        on_stack = bytearray(count)
+        stack: list[int] = []
+        components = []
+        counter = 0
+        for start in range(count):
+            if order[start] != -1:
+                continue
+            order[start] = low[start] = counter
+            counter += 1
+            stack.append(start)
+            on_stack[start] = 1
+            work = [(start, iter(deps[start]))]
+            while work:
+                node, edges = work[-1]
+                for child in edges:
+                    if order[child] == -1:
+                        order[child] = low[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack[child] = 1
+                        work.append((child, iter(deps[child])))
+                        break
+                    if on_stack[child] and order[child] < low[node]:
+                        low[node] = order[child]
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        if low[node] < low[parent]:
+                            low[parent] = low[node]
+                    if low[node] == order[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = 0
+                            component.append(member)
+                            if member == node:
+                                break
+                        if len(component) > 1 or node in deps[node]:
+                            components.append(sorted(component))
+        components.sort()
+        return components
+
+    def topological_order(self) -> tuple[list[int], list[int]]:
+        """Return (schedulable nodes, dependencies first; nodes in or behind a cycle)."""
+        remaining = [len(deps) for deps in self.deps]
+        heap = [node for node, count in enumerate(remaining) if not count]
+        heapq.heapify(heap)
+        order = []
+        while heap:
+            node = heapq.heappop(heap)
+            order.append(node)
+            for dependent in self.dependents[node]:
+                remaining[dependent] -= 1
+                if not remaining[dependent]:
+                    heapq.heappush(heap, dependent)
+        stuck = [node for node, count in enumerate(remaining) if count]
+        return order, stuck
+
+    def _reachable(self, start: int, edges: list[list[int]]) -> list[int]:
+        seen = {start}
+        frontier = [start]
+        while frontier:
+            next_frontier = []
+            for node in frontier:
+                for neighbor in edges[node]:
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        seen.discard(start)
+        return sorted(seen)
+
+    def dependencies(self, task_id: str) -> list[int]:
+        """Every task `task_id` transitively depends on. Raises KeyError."""
+        return self._reachable(self.node(task_id), self.deps)
+
+    def transitive_dependents(self, task_id: str) -> list[int]:
+        """Every task that transitively depends on `task_id`. Raises KeyError."""
+        return self._reachable(self.node(task_id), self.dependents)
+
+
+def load_graph(root: Path, use_index: bool = True) -> TaskGraph:
+    """Build the dependency graph of every task under root."""
+    return TaskGraph(graph_task(task) for task in iter_tasks(root, use_index))
+
+
+def dependency_subgraph(root: Path, task: GraphTask) -> TaskGraph:
+    """
+    Build the part of root's graph that decides whether `task`'s dependencies are met.
+
+    That is the task, its dependencies and, transitively, the dependencies of
+    every dependency that is completed and not invalidated (any other
+    dependency is unsatisfied whatever it depends on). Names are resolved
+    with task_index.find_task_dirs, so the cost follows the chain, not the
+    root.
+    """
+    tasks = {os.path.abspath(task.path): task}
+    frontier = [task]
+    while frontier:
+        names = {name for current in frontier for name in current.depends_on}
+        frontier = []
+        for task_dir in find_task_dirs(root, names, read_frontmatter).values():
+            key = os.path.abspath(task_dir)
+            if key in tasks:
+                continue
+            frontmatter = read_frontmatter(task_dir / "00_TASK.md")
+            dep = graph_task({**frontmatter, "path": str(task_dir), "dir_name": task_dir.name})
+            tasks[key] = dep
+            if dep.lifecycle_state == DONE_STATE and dep.epistemic_state != INVALID_STATE:
+                frontier.append(dep)
+    return TaskGraph(tasks.values())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Query the task dependency graph (depends_on / blocked_by)"
+    )
+    parser.add_argument(
+        "--root",
+        type=str,
+        default="tasks/",
+        help="Root directory containing task directories"
+    )
+    query = parser.add_mutually_exclusive_group(required=True)
+    query.add_argument("--ready", action="store_true", help="Open tasks whose dependencies are all satisfied")
+    query.add_argument("--order", action="store_true", help="Topological order (dependencies first)")
+    query.add_argument("--check", action="store_true", help="Report cycles and unknown dependencies")
+    query.add_argument("--deps", type=str, metavar="TASK", help="Transitive dependencies of a task")
+    query.add_argument("--dependents", type=str, metavar="TASK", help="Tasks transitively depending on a task")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--no-index", action="store_true", help="Scan all tasks instead of using the index")
+
+    args = parser.parse_args()
+    root = Path(args.root)
+
+    if not root.is_dir():
+        print(f"Error: Root directory does not exist: {root}", file=sys.stderr)
+        return 1
+
+    try:
+        read_layout(root)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    graph = load_graph(root, use_index=not args.no_index)
+
+    if args.check:
+        cycles = [graph.ids(component) for component in graph.cycles()]
+        missing = {graph.tasks[node].task_id: names for node, names in sorted(graph.missing.items())}
+        if args.json:
+            print(json.dumps({
+                "tasks": len(graph),
+                "edges": graph.edge_count,
+                "cycles": cycles,
+                "missing": missing,
+                "duplicate_ids": graph.duplicates,
+            }, indent=2))
+        else:
+            for cycle in cycles:
+                print(f"Cycle: {', '.join(cycle)}")
+            for task_id, names in missing.items():
+                print(f"Missing: {task_id} depends on unknown {', '.join(names)}")
+            for task_id in graph.duplicates:
+                print(f"Duplicate id: {task_id}")
+            print(f"\n{len(graph)} task(s), {graph.edge_count} edge(s), {len(cycles)} cycle(s), {len(missing)} with unknown dependencies")
+        return 1 if cycles or missing else 0
+
+    stuck: list[int] = []
+    target: Optional[str] = args.deps or args.dependents
+    try:
+        if args.ready:
+            key, nodes = "ready", graph.ready_nodes()
+        elif args.order:
+            key, (nodes, stuck) = "order", graph.topological_order()
+        elif args.deps:
+            key, nodes = "dependencies", graph.dependencies(args.deps)
+        else:
+            key, nodes = "dependents", graph.transitive_dependents(args.dependents)
+    except KeyError:
+        print(f"Error: Task not found: {target}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        result = {key: graph.ids(nodes), "count": len(nodes), "total": len(graph)}
+        if target:
+            result["task"] = target
+        if args.order:
+            result["cyclic"] = graph.ids(stuck)
+        print(json.dumps(result, indent=2))
+    else:
+        for task_id in graph.ids(nodes):
+            print(task_id)
+        if stuck:
+            print(f"Unschedulable (in or behind a cycle): {', '.join(graph.ids(stuck))}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
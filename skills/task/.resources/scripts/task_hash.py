@@ -9,25 +9,68 @@ Usage:
     python task_hash.py --task /path/to/task-dir
     python task_hash.py --task /path/to/task-dir --update
     python task_hash.py --task /path/to/task-dir --check
+    python task_hash.py --root tasks/ --check --jobs 8 --json
 
 Options:
     --update    Update 00_TASK.md frontmatter with computed hash
     --check     Check if stored hash matches computed hash (exit 0 if match, 1 if mismatch)
     --state     Also write hash record to 99_STATE.md
+    --changed-only  With --state, skip the write when only computed_at would change
+    --no-cache  Ignore and do not update the intent hash cache
+    --root      Check every task under root (requires --check)
+    --jobs      Worker processes for --root (default: CPU count)
+    --now       computed_at for --state (RFC3339; default: $TASK_NOW, else current time)
+
+Exit codes (--check):
+    0  match (every task matches)
+    1  mismatch or error (any task)
+    2  no stored hash (any task, and no mismatches or errors)
+
+Cache:
+    Computed hashes are cached in the root's index (<root>/.task_index.sqlite,
+    see task_index.py), keyed by 00_TASK.md size, mtime_ns and a BLAKE2b
+    digest of its raw bytes. When all three match, the canonical intent is not
+    re-extracted. Nothing is written into task directories; task_status.py and
+    task_snapshot.py read the cache but never write it.
 """
 
+import sys
+
+if __name__ == "__main__":
+    # Hand the call to a running task_daemon.py before the imports below (see task_client.py).
+    from task_client import delegate
+
+    delegate("task_hash")
+
 import argparse
 import hashlib
 import json
+import os
 import re
-import sys
-from datetime import datetime, timezone
+import time
 from pathlib import Path
+from typing import NamedTuple, Optional
+
+from task_index import load_hash_cache, scan_task_files, store_hash_cache
+
+from task_intent_extract import hash_canonical_intent
+from task_layout import find_root, read_layout, relative_task_path
+from task_store import (
+    TASK_FILENAME,
+    STATE_FILENAME,
+    init_clock,
+    invalidate,
+    load_task,
+    utc_now,
+    write_state,
+)
+
+HASH_ALGO = "sha256-v1"
 
 
 def get_utc_now_rfc3339() -> str:
-    """Return current UTC time in RFC3339 format."""
-    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    """Return current UTC time in RFC3339 format (the shared clock, see task_store.utc_now)."""
+    return utc_now().strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
 def compute_hash(canonical_blob: str) -> str:
@@ -35,56 +78,167 @@ def compute_hash(canonical_blob: str) -> str:
     return hashlib.sha256(canonical_blob.encode("utf-8")).hexdigest()
 
 
-def extract_canonical_intent(task_dir: Path) -> str:
-    """Extract canonical intent blob (delegating to task_intent_extract logic)."""
-    import importlib.util
-    
-    script_dir = Path(__file__).parent
-    extract_script = script_dir / "task_intent_extract.py"
-    
-    if extract_script.exists():
-        spec = importlib.util.spec_from_file_location("task_intent_extract", extract_script)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        return module.extract_canonical_intent(task_dir)
-    else:
-        raise ImportError("task_intent_extract.py not found in script directory")
+def fast_digest(data: bytes) -> str:
+    """Cheap content digest used to validate hash cache entries."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
 
 
-def read_frontmatter(task_file: Path) -> tuple[dict, str, str]:
-    """Read frontmatter and body from task file. Returns (frontmatter_dict, frontmatter_raw, body)."""
-    content = task_file.read_text(encoding="utf-8")
-    
-    if not content.startswith("---"):
-        raise ValueError("Missing frontmatter delimiter")
-    
-    parts = content.split("---", 2)
-    if len(parts) < 3:
-        raise ValueError("Missing closing frontmatter delimiter")
-    
-    frontmatter_raw = parts[1]
-    body = parts[2]
-    
+class IntentHash(NamedTuple):
+    """A computed intent hash and the raw stored intent_hash ("" if absent).
+
+    `entry` is a fresh cache entry for the caller to persist (store_hash_cache),
+    or None on a cache hit or when 00_TASK.md changed while it was read.
+    """
+
+    computed_hash: str
+    stored_hash: str
+    cache_hit: bool
+    entry: Optional[dict]
+
+
+def cache_entry_matches(entry: Optional[dict], st: os.stat_result, digest: str) -> bool:
+    """True if a cache entry matches the given 00_TASK.md stat and digest."""
+    return (
+        isinstance(entry, dict)
+        and entry.get("algo") == HASH_ALGO
+        and entry.get("size") == st.st_size
+        and entry.get("mtime_ns") == st.st_mtime_ns
+        and entry.get("digest") == digest
+    )
+
+
+def lookup_hash_cache(task_dir: Path) -> tuple[Path, str, Optional[dict]]:
+    """Return (root, cache key, stored cache entry or None) for a single task."""
+    root = find_root(task_dir)
+    key = relative_task_path(root, task_dir)
+    return root, key, load_hash_cache(root, [key]).get(key)
+
+
+def compute_intent_hash(task_dir: Path, cached: Optional[dict] = None) -> IntentHash:
+    """
+    Compute the intent hash for a task.
+
+    `cached` is the task's stored cache entry (load_hash_cache); when it still
+    matches 00_TASK.md the canonical intent is not re-extracted.
+    """
+    task_file = task_dir / TASK_FILENAME
+    st = task_file.stat()
+    digest = fast_digest(task_file.read_bytes())
+
+    if cached is not None and cache_entry_matches(cached, st, digest):
+        return IntentHash(cached["intent_hash"], cached["stored_hash"], True, None)
+
+    computed_hash = hash_canonical_intent(task_dir)
+    task = load_task(task_dir)
+    stored_hash = task.frontmatter.get("intent_hash", "")
+
+    entry = None
+    if task.mtime_ns == st.st_mtime_ns and task.size == st.st_size:
+        entry = {
+            "algo": HASH_ALGO,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "digest": digest,
+            "intent_hash": computed_hash,
+            "stored_hash": stored_hash,
+        }
+
+    return IntentHash(computed_hash, stored_hash, False, entry)
+
+
+def normalize_stored_hash(stored_hash: str) -> str:
+    """Treat template placeholders ({{INTENT_HASH}}) as no stored hash."""
+    if stored_hash.startswith("{{"):
+        return ""
+    return stored_hash
+
+
+def check_task(task_dir: str, cached: Optional[dict] = None) -> dict:
+    """Check one task's stored hash against its computed hash. Never raises.
+
+    Returns {"path", "result", ...} where result is MATCH, MISMATCH,
+    NO_STORED_HASH or ERROR, plus "cache_entry" when a new cache entry was
+    computed (see IntentHash).
+    """
     try:
-        import yaml
-        frontmatter = yaml.safe_load(frontmatter_raw.strip())
-    except ImportError:
-        frontmatter = _parse_simple_yaml(frontmatter_raw.strip())
-    
-    return frontmatter, frontmatter_raw, body
+        computed_hash, stored_hash, _, entry = compute_intent_hash(Path(task_dir), cached)
+        stored_hash = normalize_stored_hash(stored_hash)
+    except Exception as e:
+        return {"path": task_dir, "result": "ERROR", "error": str(e)}
+
+    if not stored_hash:
+        result = "NO_STORED_HASH"
+    elif stored_hash != computed_hash:
+        result = "MISMATCH"
+    else:
+        result = "MATCH"
+    checked = {
+        "path": task_dir,
+        "result": result,
+        "stored_hash": stored_hash or None,
+        "computed_hash": computed_hash,
+    }
+    if entry is not None:
+        checked["cache_entry"] = entry
+    return checked
 
 
-def _parse_simple_yaml(raw: str) -> dict:
-    """Simple YAML parser fallback."""
-    result = {}
-    for line in raw.split("\n"):
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-        if ":" in line:
-            key, _, value = line.partition(":")
-            result[key.strip()] = value.strip().strip('"').strip("'")
-    return result
+def check_root(root: Path, jobs: int, use_cache: bool = True) -> dict:
+    """Check every task under root over a process pool and summarize.
+
+    The hash cache is read once up front and new entries are written back in
+    one transaction at the end.
+    """
+    task_dirs = sorted(str(task_dir) for task_dir, _ in scan_task_files(root))
+    keys = [relative_task_path(root, Path(task_dir)) for task_dir in task_dirs]
+    cache = load_hash_cache(root) if use_cache else {}
+    cached = [cache.get(key) for key in keys]
+    started = time.perf_counter()
+
+    if jobs <= 1 or len(task_dirs) <= 1:
+        results = list(map(check_task, task_dirs, cached))
+    else:
+        # Only --root uses a process pool; task_status.py imports this module too.
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunksize = max(1, min(64, len(task_dirs) // (jobs * 4)))
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(check_task, task_dirs, cached, chunksize=chunksize))
+
+    fresh = {key: result.pop("cache_entry") for key, result in zip(keys, results) if "cache_entry" in result}
+    if use_cache:
+        store_hash_cache(root, fresh)
+    elapsed = time.perf_counter() - started
+    counts = {"MATCH": 0, "MISMATCH": 0, "NO_STORED_HASH": 0, "ERROR": 0}
+    for result in results:
+        counts[result["result"]] += 1
+
+    return {
+        "root": str(root),
+        "total": len(results),
+        "match": counts["MATCH"],
+        "mismatch": counts["MISMATCH"],
+        "no_stored_hash": counts["NO_STORED_HASH"],
+        "errors": counts["ERROR"],
+        "elapsed_seconds": round(elapsed, 3),
+        "tasks_per_second": round(len(results) / elapsed, 1) if elapsed > 0 else None,
+        "failures": [r for r in results if r["result"] != "MATCH"],
+    }
+
+
+def summary_exit_code(summary: dict) -> int:
+    """Aggregate exit code: 1 on any mismatch/error, else 2 on any missing hash, else 0."""
+    if summary["mismatch"] or summary["errors"]:
+        return 1
+    if summary["no_stored_hash"]:
+        return 2
+    return 0
+
+
+def read_frontmatter(task_file: Path) -> tuple[dict, str, str]:
+    """Read frontmatter and body from task file. Returns (frontmatter_dict, frontmatter_raw, body)."""
+    task = load_task(task_file.parent)
+    return task.frontmatter, task.frontmatter_raw, task.body
 
 
 def update_frontmatter_hash(task_file: Path, new_hash: str) -> None:
@@ -107,12 +261,15 @@ def update_frontmatter_hash(task_file: Path, new_hash: str) -> None:
             content = "---".join(parts)
     
     task_file.write_text(content, encoding="utf-8")
+    invalidate(task_file.parent)
 
 
-def write_state_hash_record(task_dir: Path, hash_record: dict) -> None:
-    """Write hash record to 99_STATE.md."""
-    state_file = task_dir / "99_STATE.md"
-    
+def write_state_hash_record(task_dir: Path, hash_record: dict, only_if_changed: bool = False) -> bool:
+    """Write hash record to 99_STATE.md. Returns True if the file was written.
+
+    With `only_if_changed`, the existing file is left untouched when it differs
+    from the new record only in `computed_at`.
+    """
     state_content = f"""---
 hash_record:
   intent_hash: "{hash_record['intent_hash']}"
@@ -134,19 +291,24 @@ This file is auto-generated by task scripts. Do not edit manually.
 - **Mismatch**: {hash_record.get('hash_mismatch', False)}
 """
     
-    state_file.write_text(state_content, encoding="utf-8")
+    return write_state(task_dir / STATE_FILENAME, state_content, only_if_changed)
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="Compute and update intent hash for a task"
     )
-    parser.add_argument(
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument(
         "--task",
         type=str,
-        required=True,
         help="Path to task directory"
     )
+    target.add_argument(
+        "--root",
+        type=str,
+        help="Root directory: check every task (requires --check)"
+    )
     parser.add_argument(
         "--update",
         action="store_true",
@@ -162,13 +324,70 @@ def main() -> int:
         action="store_true",
         help="Write hash record to 99_STATE.md"
     )
+    parser.add_argument(
+        "--changed-only",
+        action="store_true",
+        help="With --state, only rewrite 99_STATE.md when the hash record changed"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore and do not update the intent hash cache"
+    )
     parser.add_argument(
         "--json",
         action="store_true",
         help="Output as JSON"
     )
 
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes for --root (default: CPU count)"
+    )
+    parser.add_argument(
+        "--now",
+        type=str,
+        help="computed_at for --state, as RFC3339 (default: $TASK_NOW, else current time)"
+    )
+
     args = parser.parse_args()
+
+    try:
+        init_clock(args.now)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.root:
+        root = Path(args.root)
+        if not args.check or args.update or args.state:
+            print("Error: --root only supports --check", file=sys.stderr)
+            return 1
+        if not root.is_dir():
+            print(f"Error: Root directory does not exist: {root}", file=sys.stderr)
+            return 1
+        try:
+            read_layout(root)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        summary = check_root(root, args.jobs, use_cache=not args.no_cache)
+        if args.json:
+            print(json.dumps(summary, indent=2))
+        else:
+            for failure in summary["failures"]:
+                detail = failure.get("error") or (failure["computed_hash"] or "")[:16] + "..."
+                print(f"{failure['result']}: {failure['path']} {detail}")
+            print(
+                f"Checked {summary['total']} task(s) in {summary['elapsed_seconds']}s "
+                f"({summary['tasks_per_second']} tasks/s): "
+                f"{summary['match']} match, {summary['mismatch']} mismatch, "
+                f"{summary['no_stored_hash']} no stored hash, {summary['errors']} error(s)"
+            )
+        return summary_exit_code(summary)
+
     task_dir = Path(args.task)
 
     if not task_dir.exists() or not task_dir.is_dir():
@@ -176,25 +395,26 @@ def main() -> int:
         return 1
 
     try:
-        canonical_blob = extract_canonical_intent(task_dir)
-        computed_hash = compute_hash(canonical_blob)
-        
-        task_file = task_dir / "00_TASK.md"
-        frontmatter, _, _ = read_frontmatter(task_file)
-        stored_hash = frontmatter.get("intent_hash", "")
+        task_file = task_dir / TASK_FILENAME
+        cached = None
+        if not args.no_cache:
+            root, key, cached = lookup_hash_cache(task_dir)
+        computed_hash, stored_hash, cache_hit, entry = compute_intent_hash(task_dir, cached)
+        if entry is not None and not args.no_cache:
+            store_hash_cache(root, {key: entry})
         
-        if stored_hash.startswith("{{"):
-            stored_hash = ""
+        stored_hash = normalize_stored_hash(stored_hash)
         
         hash_mismatch = stored_hash != "" and stored_hash != computed_hash
         
         hash_record = {
             "intent_hash": computed_hash,
-            "intent_hash_algo": "sha256-v1",
+            "intent_hash_algo": HASH_ALGO,
             "intent_hash_scope": "canonical-intent",
             "computed_at": get_utc_now_rfc3339(),
             "stored_hash": stored_hash if stored_hash else None,
-            "hash_mismatch": hash_mismatch
+            "hash_mismatch": hash_mismatch,
+            "cached": cache_hit
         }
         
         if args.check:
@@ -213,8 +433,9 @@ def main() -> int:
             hash_record["updated"] = True
         
         if args.state:
-            write_state_hash_record(task_dir, hash_record)
-            hash_record["state_written"] = True
+            hash_record["state_written"] = write_state_hash_record(
+                task_dir, hash_record, only_if_changed=args.changed_only
+            )
         
         if args.json:
             print(json.dumps(hash_record, indent=2))
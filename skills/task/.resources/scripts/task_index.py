@@ -0,0 +1,647 @@
+#!/usr/bin/env python3
+"""
+task_index.py - Persistent frontmatter index for a task root.
+
+Caches parsed 00_TASK.md frontmatter in a SQLite file stored under the task
+root. Entries are keyed by task directory relative to the root (so the same
+root spelled differently shares one index) and validated against the file's
+mtime and size, so a warm listing only stats files and reparses the ones
+that changed since the last run. A secondary attribute table indexes
+lifecycle_state, epistemic_state, kind, risk and tags, so selective
+task_list.py queries decode only the matching entries.
+
+Also stores task_hash.py's intent hash cache (one row per task, keyed by
+the task directory relative to the root), so hash checks leave the task
+directories untouched.
+
+The index lives in <root>/.task_index.sqlite next to a persistent
+<root>/.task_index.sqlite-journal. Both are local caches; when the index is
+created, a .gitignore listing them is written to the root unless the root
+already has one.
+
+Also maintains a chronological index (created_at order) for task_nav.py.
+It is revalidated by the mtime of each leaf shard directory (the root itself
+for a flat root, see task_layout.py), so a warm --next/--prev is a few stats
+plus a B-tree lookup. New or removed task directories are applied
+incrementally, per changed shard. created_at is treated as immutable; use
+--rebuild after editing it by hand.
+
+Usage:
+    python task_index.py --root tasks/
+    python task_index.py --root tasks/ --rebuild
+    python task_index.py --root tasks/ --drop
+
+Output:
+    Index summary (entries, reparsed, removed)
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar
+
+from task_layout import ShardPrune, read_layout, scan_dir_names, shard_dirs, walk_task_dirs
+from task_query import INDEXED_FIELDS, attribute_values
+from task_store import parse_rfc3339
+
+INDEX_FILENAME = ".task_index.sqlite"
+JOURNAL_FILENAME = INDEX_FILENAME + "-journal"
+INDEX_VERSION = 6
+TASK_FILENAME = "00_TASK.md"
+MIN_CREATED_KEY = -(2 ** 62)
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+DEFAULT_DISCOVERY_JOBS = 1
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def index_path(root: Path) -> Path:
+    """Return the index file location for a task root."""
+    return root / INDEX_FILENAME
+
+
+def ignore_index_files(root: Path) -> None:
+    """Write a .gitignore for the index files into root, unless root has one (failures are ignored)."""
+    try:
+        with open(root / ".gitignore", "x", encoding="utf-8") as f:
+            f.write(f"# Local caches of task_index.py\n{INDEX_FILENAME}\n{JOURNAL_FILENAME}\n")
+    except OSError:
+        pass
+
+
+def open_index(root: Path) -> sqlite3.Connection:
+    """Open (and create or migrate) the index database for a task root."""
+    conn = sqlite3.connect(str(index_path(root)), timeout=5.0)
+    # Keep the journal file in place between transactions: creating and
+    # deleting it would bump the root mtime the chronological index relies on.
+    conn.execute("PRAGMA journal_mode = PERSIST")
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version != INDEX_VERSION:
+        ignore_index_files(root)
+        conn.executescript(
+            """
+            DROP TABLE IF EXISTS frontmatter;
+            DROP TABLE IF EXISTS chrono;
+            DROP TABLE IF EXISTS meta;
+            DROP TABLE IF EXISTS attrs;
+            DROP TABLE IF EXISTS intent_hashes;
+            CREATE TABLE frontmatter (
+                rel_path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE TABLE chrono (
+                rel_path TEXT PRIMARY KEY,
+                shard TEXT NOT NULL,
+                dir_name TEXT NOT NULL,
+                id TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                created_key INTEGER NOT NULL
+            );
+            CREATE INDEX chrono_order ON chrono (created_key, dir_name, rel_path);
+            CREATE INDEX chrono_id ON chrono (id);
+            CREATE INDEX chrono_dir_name ON chrono (dir_name);
+            CREATE INDEX chrono_shard ON chrono (shard);
+            CREATE TABLE attrs (
+                rel_path TEXT NOT NULL,
+                field TEXT NOT NULL,
+                value TEXT NOT NULL
+            );
+            CREATE INDEX attrs_lookup ON attrs (field, value);
+            CREATE INDEX attrs_path ON attrs (rel_path);
+            CREATE TABLE intent_hashes (
+                path TEXT PRIMARY KEY,
+                data TEXT NOT NULL
+            );
+            CREATE TABLE meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            """
+        )
+        conn.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+        conn.commit()
+    return conn
+
+
+def load_entries(conn: sqlite3.Connection) -> dict[str, tuple[int, int]]:
+    """Load the validity key of every index row as {rel_path: (mtime_ns, size)}."""
+    rows = conn.execute("SELECT rel_path, mtime_ns, size FROM frontmatter")
+    return {rel_path: (mtime_ns, size) for rel_path, mtime_ns, size in rows}
+
+
+def map_threads(fn: Callable[[T], R], items: Iterable[T], jobs: int) -> list[R]:
+    """Map `fn` over `items` in order, overlapping I/O latency with `jobs` threads."""
+    items = list(items)
+    if jobs <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(jobs, len(items))) as pool:
+        return list(pool.map(fn, items, chunksize=1))
+
+
+def list_task_dirs(root: Path, prune: Optional[ShardPrune] = None) -> list[Path]:
+    """
+    Return candidate task directories.
+
+    These are the immediate subdirectories of a flat root, or the leaves of a
+    sharded one (see task_layout.py), skipping shards excluded by `prune`.
+    """
+    return walk_task_dirs(root, prune=prune)
+
+
+def _stat_task_file(task_dir: Path) -> Optional[os.stat_result]:
+    try:
+        return os.stat(task_dir / TASK_FILENAME)
+    except OSError:
+        return None
+
+
+def scan_task_files(
+    root: Path,
+    jobs: int = 1,
+    prune: Optional[ShardPrune] = None,
+) -> list[tuple[Path, os.stat_result]]:
+    """Return (task_dir, stat) for every task directory holding 00_TASK.md."""
+    task_dirs = list_task_dirs(root, prune)
+    stats = map_threads(_stat_task_file, task_dirs, jobs)
+    return [(task_dir, st) for task_dir, st in zip(task_dirs, stats) if st is not None]
+
+
+def load_task_frontmatter(
+    root: Path,
+    parse: Callable[[Path], dict[str, Any]],
+    jobs: int = 1,
+    prune: Optional[ShardPrune] = None,
+) -> list[tuple[Path, dict[str, Any]]]:
+    """
+    Parse 00_TASK.md in every task directory of root, without an index.
+
+    `parse` must return {} for a missing or unparseable file; those tasks
+    are omitted. With `jobs` > 1 the opens and reads run on a thread pool.
+    """
+    task_dirs = list_task_dirs(root, prune)
+    results = map_threads(lambda task_dir: parse(task_dir / TASK_FILENAME), task_dirs, jobs)
+    return [(task_dir, fm) for task_dir, fm in zip(task_dirs, results) if fm]
+
+
+def refresh_index(
+    root: Path,
+    parse: Callable[[Path], dict[str, Any]],
+    jobs: int = 1,
+    prune: Optional[ShardPrune] = None,
+    select: Optional[dict[str, frozenset]] = None,
+) -> tuple[list[tuple[Path, dict[str, Any]]], dict[str, int]]:
+    """
+    Bring the index up to date and return frontmatter for every task.
+
+    Only task files whose (mtime_ns, size) differ from the indexed entry are
+    passed to `parse`. Entries for vanished tasks are removed, unless `prune`
+    restricted the scan to some shards. Task files are stat'ed (and changed
+    ones parsed) on `jobs` threads.
+
+    `select` ({field: allowed values}, see task_query.index_constraints)
+    restricts the result to tasks matching it in the secondary attribute
+    index; other entries are kept fresh but never decoded.
+
+    Returns ([(task_dir, frontmatter), ...], stats).
+    """
+    entries, stats = iter_index(root, parse, jobs, prune, select)
+    return list(entries), stats
+
+
+def iter_index(
+    root: Path,
+    parse: Callable[[Path], dict[str, Any]],
+    jobs: int = 1,
+    prune: Optional[ShardPrune] = None,
+    select: Optional[dict[str, frozenset]] = None,
+) -> tuple[Iterator[tuple[Path, dict[str, Any]]], dict[str, int]]:
+    """
+    Like refresh_index, but return the tasks as an iterator.
+
+    The index is updated before this returns. Entries are then decoded one
+    at a time from an index cursor, in index order rather than scan order,
+    so a streaming caller holds one task at a time. stats["selected"] is set
+    once the iterator is exhausted.
+    """
+    conn = open_index(root)
+    try:
+        entries = load_entries(conn)
+        scanned = scan_task_files(root, jobs, prune)
+        keys = [task_dir.relative_to(root).as_posix() for task_dir, _ in scanned]
+
+        changed = []
+        for key, (task_dir, st) in zip(keys, scanned):
+            cached = entries.get(key)
+            if not (cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size):
+                changed.append((key, task_dir))
+        parsed = dict(zip(
+            (key for key, _ in changed),
+            map_threads(lambda item: parse(item[1] / TASK_FILENAME), changed, jobs),
+        ))
+
+        updates = []
+        for key, (_, st) in zip(keys, scanned):
+            if key in parsed:
+                updates.append((
+                    key,
+                    st.st_mtime_ns,
+                    st.st_size,
+                    json.dumps(parsed[key], default=str, sort_keys=True),
+                ))
+        seen = set(keys)
+        removed = [] if prune is not None else [(key,) for key in entries if key not in seen]
+
+        if updates or removed:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO frontmatter (rel_path, mtime_ns, size, data) VALUES (?, ?, ?, ?)",
+                    updates,
+                )
+                conn.executemany("DELETE FROM frontmatter WHERE rel_path = ?", removed)
+                stale_attrs = [(key,) for key, *_ in updates] + removed
+                conn.executemany("DELETE FROM attrs WHERE rel_path = ?", stale_attrs)
+                conn.executemany(
+                    "INSERT INTO attrs (rel_path, field, value) VALUES (?, ?, ?)",
+                    [
+                        (key, field, value)
+                        for key, frontmatter in parsed.items()
+                        for field in INDEXED_FIELDS
+                        for value in attribute_values(frontmatter, field)
+                    ],
+                )
+
+        wanted = select_paths(conn, select) & seen if select else None
+    except BaseException:
+        conn.close()
+        raise
+
+    stats = {
+        "entries": len(scanned),
+        "selected": 0,
+        "reparsed": len(updates),
+        "removed": len(removed),
+    }
+
+    def rows() -> Iterator[tuple[str, str]]:
+        if wanted is None:
+            yield from conn.execute("SELECT rel_path, data FROM frontmatter")
+            return
+        for key in sorted(wanted):
+            row = conn.execute("SELECT data FROM frontmatter WHERE rel_path = ?", (key,)).fetchone()
+            if row:
+                yield key, row[0]
+
+    def decode() -> Iterator[tuple[Path, dict[str, Any]]]:
+        try:
+            for key, data in rows():
+                if key not in seen:
+                    continue
+                # Freshly parsed tasks are returned as parsed, not round-tripped through JSON.
+                frontmatter = parsed.pop(key) if key in parsed else json.loads(data)
+                stats["selected"] += 1
+                yield root / key, frontmatter
+        finally:
+            conn.close()
+
+    return decode(), stats
+
+
+def select_paths(conn: sqlite3.Connection, constraints: dict[str, frozenset]) -> set[str]:
+    """Return task directories (relative to the root) whose indexed attributes satisfy every constraint."""
+    result: Optional[set[str]] = None
+    for field, values in sorted(constraints.items(), key=lambda item: len(item[1])):
+        values = sorted(values)
+        rows = conn.execute(
+            f"SELECT rel_path FROM attrs WHERE field = ? AND value IN ({', '.join('?' * len(values))})",
+            (field, *values),
+        )
+        paths = {row[0] for row in rows}
+        result = paths if result is None else result & paths
+        if not result:
+            return set()
+    return result if result is not None else set()
+
+
+def created_key(created_at: Any) -> int:
+    """Sortable integer key (UTC epoch microseconds) for a created_at value."""
+    if isinstance(created_at, datetime):
+        dt = created_at
+    else:
+        dt = parse_rfc3339(str(created_at or ""))
+    if dt is None:
+        return MIN_CREATED_KEY
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - EPOCH) // timedelta(microseconds=1)
+
+
+def _get_meta(conn: sqlite3.Connection, key: str) -> Optional[str]:
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def refresh_chrono(
+    conn: sqlite3.Connection,
+    root: Path,
+    parse: Callable[[Path], dict[str, Any]],
+) -> dict[str, int]:
+    """
+    Bring the chronological index up to date with the task root.
+
+    Leaf shard directories (just the root when flat) are compared by mtime.
+    If none changed, only directories that previously had no parseable
+    00_TASK.md are re-checked. Otherwise each changed shard's listing is
+    diffed against the index and only new directories are parsed.
+    """
+    current = shard_dirs(root, read_layout(root))
+    previous = json.loads(_get_meta(conn, "shard_mtimes") or "{}")
+    previous_pending = json.loads(_get_meta(conn, "pending") or "[]")
+    changed = [shard for shard, mtime in current.items() if previous.get(shard) != mtime]
+    vanished = [shard for shard in previous if shard not in current]
+    removed = 0
+
+    candidates = [rel for rel in previous_pending if _shard_of(rel) in current and _shard_of(rel) not in changed]
+    for shard in vanished:
+        removed += conn.execute("DELETE FROM chrono WHERE shard = ?", (shard,)).rowcount
+    for shard in changed:
+        names = {f"{shard}/{name}" if shard else name for name in scan_dir_names(root / shard)}
+        indexed = {row[0] for row in conn.execute("SELECT rel_path FROM chrono WHERE shard = ?", (shard,))}
+        stale = indexed - names
+        removed += len(stale)
+        conn.executemany("DELETE FROM chrono WHERE rel_path = ?", [(rel,) for rel in stale])
+        candidates.extend(sorted(names - indexed))
+
+    rows = []
+    pending = []
+    for rel in candidates:
+        task_file = root / rel / TASK_FILENAME
+        frontmatter = parse(task_file) if task_file.exists() else {}
+        if not frontmatter:
+            pending.append(rel)
+            continue
+        dir_name = rel.rsplit("/", 1)[-1]
+        created_at = frontmatter.get("created_at", "")
+        rows.append((
+            rel,
+            _shard_of(rel),
+            dir_name,
+            str(frontmatter.get("id", dir_name)),
+            str(created_at or ""),
+            created_key(created_at),
+        ))
+    added = len(rows)
+
+    if not (changed or vanished or rows or pending != previous_pending):
+        return {"added": 0, "removed": 0, "pending": len(pending)}
+
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO chrono (rel_path, shard, dir_name, id, created_at, created_key) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('pending', ?)", (json.dumps(pending),))
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('shard_mtimes', ?)", (json.dumps(current),))
+
+    return {"added": added, "removed": removed, "pending": len(pending)}
+
+
+def _shard_of(rel_path: str) -> str:
+    return rel_path.rpartition("/")[0]
+
+
+def _chrono_row(root: Path, row: Optional[tuple]) -> Optional[dict[str, str]]:
+    if row is None:
+        return None
+    rel_path, dir_name, task_id, created_at = row[:4]
+    return {
+        "id": task_id,
+        "path": str(root / rel_path),
+        "dir_name": dir_name,
+        "created_at": created_at,
+    }
+
+
+def chrono_edge(conn: sqlite3.Connection, root: Path, newest: bool) -> Optional[dict[str, str]]:
+    """Return the newest (or oldest) task."""
+    order = "DESC" if newest else "ASC"
+    row = conn.execute(
+        f"SELECT rel_path, dir_name, id, created_at FROM chrono "
+        f"ORDER BY created_key {order}, dir_name {order}, rel_path {order} LIMIT 1"
+    ).fetchone()
+    return _chrono_row(root, row)
+
+
+def chrono_step(
+    conn: sqlite3.Connection,
+    root: Path,
+    task_id: str,
+    older: bool,
+) -> tuple[bool, Optional[dict[str, str]]]:
+    """
+    Return the task adjacent to `task_id` (matched by id or directory name).
+
+    Order is created_at descending (newest first) with directory name (then
+    path within the root) as the tie-breaker; `older=True` steps towards the
+    oldest task. Returns (found, neighbour); neighbour is None at a boundary.
+    """
+    anchor = conn.execute(
+        "SELECT created_key, dir_name, rel_path FROM chrono WHERE id = ? OR dir_name = ? "
+        "ORDER BY created_key DESC, dir_name DESC, rel_path DESC LIMIT 1",
+        (task_id, task_id),
+    ).fetchone()
+    if anchor is None:
+        return False, None
+
+    if older:
+        query = (
+            "SELECT rel_path, dir_name, id, created_at FROM chrono "
+            "WHERE (created_key, dir_name, rel_path) < (?, ?, ?) "
+            "ORDER BY created_key DESC, dir_name DESC, rel_path DESC LIMIT 1"
+        )
+    else:
+        query = (
+            "SELECT rel_path, dir_name, id, created_at FROM chrono "
+            "WHERE (created_key, dir_name, rel_path) > (?, ?, ?) "
+            "ORDER BY created_key ASC, dir_name ASC, rel_path ASC LIMIT 1"
+        )
+    return True, _chrono_row(root, conn.execute(query, anchor).fetchone())
+
+
+def find_task_dirs(
+    root: Path,
+    names: Iterable[str],
+    parse: Callable[[Path], dict[str, Any]],
+) -> dict[str, Path]:
+    """
+    Resolve task ids / directory names to task directories without a full scan.
+
+    Matches task_graph.py's edges: an id wins over a directory name, and the
+    oldest task (created_at, then directory name) wins a tie. Uses the
+    chronological index when the root has one (warm: a stat per leaf shard);
+    otherwise only directory names are matched, in each leaf shard. Names
+    that resolve to nothing are left out.
+    """
+    names = sorted(set(names))
+    found: dict[str, Path] = {}
+    if index_path(root).exists():
+        try:
+            conn = open_index(root)
+            try:
+                refresh_chrono(conn, root, parse)
+                for name in names:
+                    for column in ("id", "dir_name"):
+                        row = conn.execute(
+                            f"SELECT rel_path FROM chrono WHERE {column} = ? "
+                            "ORDER BY created_key, dir_name, rel_path LIMIT 1",
+                            (name,),
+                        ).fetchone()
+                        if row:
+                            found[name] = root / row[0]
+                            break
+            finally:
+                conn.close()
+            return found
+        except sqlite3.Error:
+            found = {}
+
+    leaves = list(shard_dirs(root, read_layout(root)))
+    for name in names:
+        if not name or name.startswith(".") or "/" in name or os.sep in name:
+            continue
+        candidates = [root / leaf / name for leaf in leaves if (root / leaf / name / TASK_FILENAME).is_file()]
+        if candidates:
+            found[name] = min(
+                candidates,
+                key=lambda task_dir: (created_key(parse(task_dir / TASK_FILENAME).get("created_at", "")), str(task_dir)),
+            )
+    return found
+
+
+def load_hash_cache(root: Path, paths: Optional[list[str]] = None) -> dict[str, dict]:
+    """
+    Return stored intent hash cache entries as {relative task path: entry}.
+
+    Only the given paths when `paths` is set. Never creates the index: a
+    root without one has an empty cache.
+    """
+    if not index_path(root).exists():
+        return {}
+    try:
+        conn = open_index(root)
+        try:
+            if paths is None:
+                rows = conn.execute("SELECT path, data FROM intent_hashes").fetchall()
+            else:
+                rows = [
+                    row
+                    for path in paths
+                    for row in conn.execute("SELECT path, data FROM intent_hashes WHERE path = ?", (path,))
+                ]
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return {}
+    return {path: json.loads(data) for path, data in rows}
+
+
+def store_hash_cache(root: Path, entries: dict[str, dict]) -> None:
+    """Persist intent hash cache entries in one transaction. Failures (e.g. a read-only root) are ignored."""
+    if not entries:
+        return
+    try:
+        conn = open_index(root)
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO intent_hashes (path, data) VALUES (?, ?)",
+                    [(path, json.dumps(entry, sort_keys=True)) for path, entry in entries.items()],
+                )
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError):
+        pass
+
+
+def drop_index(root: Path) -> bool:
+    """Delete the index file (and its journal) for a task root. Returns True if one existed."""
+    path = index_path(root)
+    path.with_name(JOURNAL_FILENAME).unlink(missing_ok=True)
+    if path.exists():
+        path.unlink()
+        return True
+    return False
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Build or refresh the persistent frontmatter index for a task root"
+    )
+    parser.add_argument(
+        "--root",
+        type=str,
+        default="tasks/",
+        help="Root directory containing task directories"
+    )
+    parser.add_argument("--rebuild", action="store_true", help="Discard and rebuild the index")
+    parser.add_argument("--drop", action="store_true", help="Delete the index file")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+    root = Path(args.root)
+
+    if not root.exists():
+        print(f"Error: Root directory does not exist: {root}", file=sys.stderr)
+        return 1
+
+    try:
+        read_layout(root)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.drop:
+        dropped = drop_index(root)
+        print("Index dropped." if dropped else "No index present.")
+        return 0
+
+    if args.rebuild:
+        drop_index(root)
+
+    from task_list import read_frontmatter
+
+    try:
+        _, stats = refresh_index(root, read_frontmatter)
+        conn = open_index(root)
+        try:
+            chrono_stats = refresh_chrono(conn, root, read_frontmatter)
+        finally:
+            conn.close()
+        stats["chrono_added"] = chrono_stats["added"]
+        stats["chrono_removed"] = chrono_stats["removed"]
+    except (sqlite3.Error, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps({"index": str(index_path(root)), **stats}, indent=2))
+    else:
+        print(f"Index: {index_path(root)}")
+        print(f"  Entries: {stats['entries']}")
+        print(f"  Reparsed: {stats['reparsed']}")
+        print(f"  Removed: {stats['removed']}")
+        print(f"  Chronological: +{stats['chrono_added']} / -{stats['chrono_removed']}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,72 +20,24 @@ Output:
 """
 
 import argparse
+import hashlib
 import json
 import re
 import sys
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
 
+from task_store import load_task, parse_yaml, split_frontmatter
 
-def parse_frontmatter(content: str) -> tuple[dict[str, Any], str]:
-    """Parse YAML frontmatter from markdown content."""
-    if not content.startswith("---"):
-        raise ValueError("Missing frontmatter delimiter at start of file")
-    
-    parts = content.split("---", 2)
-    if len(parts) < 3:
-        raise ValueError("Missing closing frontmatter delimiter")
-    
-    frontmatter_raw = parts[1].strip()
-    body = parts[2]
-    
-    try:
-        import yaml
-        frontmatter = yaml.safe_load(frontmatter_raw)
-        if frontmatter is None:
-            frontmatter = {}
-    except ImportError:
-        frontmatter = _parse_simple_yaml(frontmatter_raw)
-    
-    return frontmatter, body
+CANONICAL_HEADERS = frozenset(["Goal", "Acceptance", "Constraints", "Dependencies"])
+REQUIRED_FIELDS = ["id", "title", "kind", "scope", "risk", "epistemic_state",
+                   "confidence", "origin", "lifecycle_state", "created_at"]
 
 
-def _parse_simple_yaml(raw: str) -> dict[str, Any]:
-    """Simple YAML parser for basic key-value pairs (fallback)."""
-    result = {}
-    current_key = None
-    current_list = None
-    
-    for line in raw.split("\n"):
-        line = line.rstrip()
-        if not line or line.startswith("#"):
-            continue
-        
-        if line.startswith("  - "):
-            if current_list is not None:
-                current_list.append(line[4:].strip().strip('"').strip("'"))
-            continue
-        
-        if line.startswith("- "):
-            if current_list is not None:
-                current_list.append(line[2:].strip().strip('"').strip("'"))
-            continue
-        
-        if ":" in line:
-            key, _, value = line.partition(":")
-            key = key.strip()
-            value = value.strip().strip('"').strip("'")
-            
-            if value == "" or value == "|" or value == ">":
-                current_key = key
-                current_list = []
-                result[key] = current_list
-            else:
-                result[key] = value
-                current_key = None
-                current_list = None
-    
-    return result
+def parse_frontmatter(content: str) -> tuple[dict[str, Any], str]:
+    """Parse YAML frontmatter from markdown content."""
+    frontmatter_raw, body = split_frontmatter(content)
+    return parse_yaml(frontmatter_raw), body
 
 
 def serialize_frontmatter_canonical(fm: dict[str, Any]) -> str:
@@ -120,7 +72,11 @@ def serialize_frontmatter_canonical(fm: dict[str, Any]) -> str:
 
 
 def extract_canonical_sections(body: str) -> str:
-    """Extract canonical intent sections from body (Goal, Acceptance, Constraints, Dependencies)."""
+    """Extract canonical intent sections from body (Goal, Acceptance, Constraints, Dependencies).
+
+    Reference implementation of sha256-v1 extraction; hashing uses the
+    single-pass `iter_canonical_lines` path, which must stay byte-identical.
+    """
     canonical_headers = ["Goal", "Acceptance", "Constraints", "Dependencies"]
     exclude_headers = ["Evidence"]
     
@@ -152,7 +108,7 @@ def extract_canonical_sections(body: str) -> str:
 
 
 def canonicalize_text(text: str) -> str:
-    """Apply canonical transformations to text."""
+    """Apply canonical transformations to text (sha256-v1 reference implementation)."""
     text = text.replace("\r\n", "\n").replace("\r", "\n")
     lines = [line.rstrip() for line in text.split("\n")]
     text = "\n".join(lines)
@@ -161,28 +117,112 @@ def canonicalize_text(text: str) -> str:
     return text
 
 
-def extract_canonical_intent(task_dir: Path) -> str:
-    """Extract canonical intent blob from task directory."""
+def _iter_split(text: str) -> Iterator[str]:
+    """Yield the segments of text.split("\\n") without building the list."""
+    start = 0
+    find = text.find
+    while True:
+        end = find("\n", start)
+        if end < 0:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+
+def iter_intent_segments(frontmatter: dict[str, Any], body: str) -> Iterator[str]:
+    """Yield the "\\n"-separated segments of the raw (pre-canonicalization) intent blob.
+
+    Streaming equivalent of f"---\\n{fm}\\n---\\n{extract_canonical_sections(body)}".
+    """
+    yield "---"
+    yield from serialize_frontmatter_canonical(frontmatter).split("\n")
+    yield "---"
+
+    emitted = False
+    in_canonical_section = False
+    for line in _iter_split(body):
+        stripped = line.strip()
+        if stripped.startswith("##") and len(stripped) > 2 and stripped[2].isspace():
+            header_name = stripped[2:].strip()
+            in_canonical_section = header_name in CANONICAL_HEADERS
+            if in_canonical_section:
+                emitted = True
+                yield line
+        elif in_canonical_section:
+            if not stripped.startswith("<!--") and not stripped.endswith("-->") and "<!--" not in line:
+                emitted = True
+                yield line
+
+    if not emitted:
+        yield ""
+
+
+def iter_canonical_lines(segments: Iterable[str]) -> Iterator[str]:
+    """
+    Canonicalize raw "\\n"-separated segments in a single pass.
+
+    Streaming equivalent of canonicalize_text("\\n".join(segments)).split("\\n"):
+    CR/CRLF become line breaks, trailing whitespace is trimmed, blank-line runs
+    collapse to one blank line, and leading/trailing blank lines are dropped.
+    """
+    started = False
+    pending_blank = False
+    for segment in segments:
+        if "\r" in segment:
+            # A trailing CR pairs with the following newline separator (CRLF).
+            if segment.endswith("\r"):
+                segment = segment[:-1]
+            parts = segment.split("\r")
+        else:
+            parts = (segment,)
+        for line in parts:
+            line = line.rstrip()
+            if not line:
+                pending_blank = started
+                continue
+            if not started:
+                started = True
+                line = line.lstrip()
+            elif pending_blank:
+                yield ""
+            pending_blank = False
+            yield line
+
+
+def _validated_intent(task_dir: Path) -> tuple[dict[str, Any], str]:
+    """Load a task and check the frontmatter fields required for hashing."""
     task_file = task_dir / "00_TASK.md"
     
     if not task_file.exists():
         raise FileNotFoundError(f"00_TASK.md not found in {task_dir}")
     
-    content = task_file.read_text(encoding="utf-8")
-    frontmatter, body = parse_frontmatter(content)
+    task = load_task(task_dir)
+    frontmatter, body = task.frontmatter, task.body
     
-    required_fields = ["id", "title", "kind", "scope", "risk", "epistemic_state", 
-                       "confidence", "origin", "lifecycle_state", "created_at"]
-    missing = [f for f in required_fields if f not in frontmatter]
+    missing = [f for f in REQUIRED_FIELDS if f not in frontmatter]
     if missing:
         raise ValueError(f"Missing required frontmatter fields: {', '.join(missing)}")
     
-    canonical_fm = serialize_frontmatter_canonical(frontmatter)
-    canonical_body = extract_canonical_sections(body)
-    canonical_blob = f"---\n{canonical_fm}\n---\n{canonical_body}"
-    canonical_blob = canonicalize_text(canonical_blob)
-    
-    return canonical_blob
+    return frontmatter, body
+
+
+def extract_canonical_intent(task_dir: Path) -> str:
+    """Extract canonical intent blob from task directory."""
+    frontmatter, body = _validated_intent(task_dir)
+    return "\n".join(iter_canonical_lines(iter_intent_segments(frontmatter, body)))
+
+
+def hash_canonical_intent(task_dir: Path) -> str:
+    """Compute the sha256-v1 intent hash, feeding canonical lines to SHA-256 incrementally."""
+    frontmatter, body = _validated_intent(task_dir)
+    digest = hashlib.sha256()
+    separator = b""
+    for line in iter_canonical_lines(iter_intent_segments(frontmatter, body)):
+        digest.update(separator)
+        digest.update(line.encode("utf-8"))
+        separator = b"\n"
+    return digest.hexdigest()
 
 
 def main() -> int:
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+task_layout.py - Sharded task root layouts.
+
+A task root is flat by default (<root>/<task>/00_TASK.md). A root can instead
+declare a shard layout in <root>/.task_layout, one line of shard keys joined
+by "/":
+
+    year/month      <root>/2026/10/<task>/
+    kind            <root>/feature/<task>/
+    prefix:2        <root>/3f/<task>/   (first N hex chars of sha256(<task>))
+    kind/year       <root>/bugfix/2026/<task>/
+
+Discovery walks the shard levels and can prune whole shards: date shards by
+--created-after/--created-before, kind shards by --kind. Shard values are
+derived from created_at, kind and the task directory name when the task is
+placed. created_at and the name are immutable; after changing a task's kind
+in a kind-sharded root, run --check/--apply.
+
+Usage:
+    python task_layout.py --root tasks/
+    python task_layout.py --root tasks/ --set year/month --apply
+    python task_layout.py --root tasks/ --check
+
+Output:
+    Layout summary, or misplaced tasks with --check
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, NamedTuple, Optional
+
+from task_store import TASK_FILENAME, parse_rfc3339, read_frontmatter
+
+LAYOUT_FILENAME = ".task_layout"
+SHARD_KEYS = ("year", "month", "kind", "prefix")
+MAX_PREFIX = 4
+
+
+class ShardPrune(NamedTuple):
+    """Constraints used to skip shards during discovery (None = unconstrained)."""
+
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    kinds: Optional[frozenset] = None
+
+
+def parse_layout(spec: str) -> list[str]:
+    """
+    Parse a layout spec ("year/month", "prefix:2", "" for flat).
+
+    Raises ValueError on unknown keys, repeats, or a month shard without a
+    year shard above it.
+    """
+    layout = [part.strip() for part in spec.strip().split("/") if part.strip()]
+    seen = set()
+    for shard in layout:
+        key, _, arg = shard.partition(":")
+        if key not in SHARD_KEYS:
+            raise ValueError(f"Unknown shard key: {shard} (valid: {', '.join(SHARD_KEYS)})")
+        if key == "prefix":
+            if not arg.isdigit() or not 1 <= int(arg) <= MAX_PREFIX:
+                raise ValueError(f"prefix shard needs a length 1-{MAX_PREFIX}, e.g. prefix:2")
+        elif arg:
+            raise ValueError(f"Shard key {key} takes no argument")
+        if key in seen:
+            raise ValueError(f"Shard key repeated: {key}")
+        if key == "month" and "year" not in seen:
+            raise ValueError("month shard must come after a year shard")
+        seen.add(key)
+    return layout
+
+
+def read_layout(root: Path) -> list[str]:
+    """Return the declared shard layout of a task root ([] for flat); raises ValueError if invalid."""
+    try:
+        spec = (root / LAYOUT_FILENAME).read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return []
+    try:
+        return parse_layout(spec)
+    except ValueError as e:
+        raise ValueError(f"Invalid {root / LAYOUT_FILENAME}: {e}") from None
+
+
+def shard_values(layout: list[str], frontmatter: dict[str, Any], dir_name: str) -> list[str]:
+    """Return the shard directory names a task belongs in."""
+    created = frontmatter.get("created_at", "")
+    dt = created if isinstance(created, datetime) else parse_rfc3339(str(created or ""))
+    dt = _as_utc(dt)
+
+    values = []
+    for shard in layout:
+        key, _, arg = shard.partition(":")
+        if key == "year":
+            values.append(f"{dt.year:04d}" if dt else "unknown")
+        elif key == "month":
+            values.append(f"{dt.month:02d}" if dt else "unknown")
+        elif key == "kind":
+            values.append(str(frontmatter.get("kind") or "unknown"))
+        else:
+            values.append(hashlib.sha256(dir_name.encode("utf-8")).hexdigest()[:int(arg)])
+    return values
+
+
+def _as_utc(dt: Optional[datetime]) -> Optional[datetime]:
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _keep_shard(key: str, value: str, context: dict[str, int], prune: ShardPrune) -> bool:
+    """Decide whether a shard directory can contain tasks matching `prune`."""
+    if key == "kind":
+        return prune.kinds is None or value in prune.kinds
+    if key not in ("year", "month"):
+        return True
+    if prune.created_after is None and prune.created_before is None:
+        return True
+    if not value.isdigit():
+        # "unknown" shards hold tasks without a valid created_at, which a
+        # date filter excludes anyway.
+        return False
+    context[key] = int(value)
+    span = (context["year"], context.get("month", 0)) if key == "month" else (context["year"],)
+    if prune.created_after is not None:
+        after = prune.created_after
+        if span < ((after.year, after.month) if key == "month" else (after.year,)):
+            return False
+    if prune.created_before is not None:
+        before = prune.created_before
+        if span > ((before.year, before.month) if key == "month" else (before.year,)):
+            return False
+    return True
+
+
+def scan_dir_names(path: Path) -> list[str]:
+    """Names of the subdirectories of `path` (one scandir; DirEntry type info avoids stats)."""
+    names = []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                if entry.is_dir():
+                    names.append(entry.name)
+            except OSError:
+                continue
+    return names
+
+
+def walk_task_dirs(
+    root: Path,
+    layout: Optional[list[str]] = None,
+    prune: Optional[ShardPrune] = None,
+) -> list[Path]:
+    """
+    Return candidate task directories (the leaves of the shard tree).
+
+    For a flat root this is every immediate subdirectory. Shard directories
+    whose name starts with "." are skipped; shards excluded by `prune` are
+    never listed.
+    """
+    if layout is None:
+        layout = read_layout(root)
+    prune = prune or ShardPrune()
+    prune = prune._replace(
+        created_after=_as_utc(prune.created_after),
+        created_before=_as_utc(prune.created_before),
+    )
+
+    found = []
+
+    def walk(path: Path, depth: int, context: dict[str, int]) -> None:
+        if depth == len(layout):
+            found.extend(path / name for name in scan_dir_names(path))
+            return
+        key = layout[depth].partition(":")[0]
+        for name in sorted(scan_dir_names(path)):
+            if name.startswith("."):
+                continue
+            child_context = dict(context)
+            if _keep_shard(key, name, child_context, prune):
+                walk(path / name, depth + 1, child_context)
+
+    walk(root, 0, {})
+    return found
+
+
+def shard_dirs(root: Path, layout: Optional[list[str]] = None) -> dict[str, int]:
+    """Return {relative path: mtime_ns} of every leaf shard directory ("" for a flat root)."""
+    if layout is None:
+        layout = read_layout(root)
+    leaves = [""]
+    for _ in layout:
+        leaves = [
+            f"{parent}/{name}" if parent else name
+            for parent in leaves
+            for name in sorted(scan_dir_names(root / parent))
+            if not name.startswith(".")
+        ]
+    return {rel: os.stat(root / rel).st_mtime_ns for rel in leaves}
+
+
+def find_root(task_dir: Path) -> Path:
+    """Return the task root a task directory belongs to.
+
+    That is the nearest ancestor whose declared layout is exactly as deep as
+    the shard directories between it and the task, else the task's parent.
+    """
+    for depth, parent in enumerate(list(task_dir.parents)[:len(SHARD_KEYS) + 1]):
+        try:
+            if depth and len(read_layout(parent)) == depth:
+                return parent
+        except (OSError, ValueError):
+            continue
+    return task_dir.parent
+
+
+def relative_task_path(root: Path, task_dir: Path) -> str:
+    """Return a task directory's path relative to its root, "/"-separated."""
+    return Path(os.path.relpath(task_dir, root)).as_posix()
+
+
+def find_misplaced(root: Path, layout: list[str]) -> list[tuple[Path, Path]]:
+    """Return (current, expected) directories for tasks not where the layout puts them."""
+    misplaced = []
+    depth = len(layout)
+    for task_dir in _walk_any_depth(root, max_depth=len(SHARD_KEYS)):
+        try:
+            frontmatter = read_frontmatter(task_dir / TASK_FILENAME)
+        except Exception:
+            continue
+        expected = root.joinpath(*shard_values(layout, frontmatter, task_dir.name), task_dir.name)
+        if len(task_dir.relative_to(root).parts) != depth + 1 or task_dir != expected:
+            misplaced.append((task_dir, expected))
+    return misplaced
+
+
+def _walk_any_depth(root: Path, max_depth: int) -> list[Path]:
+    """Find task directories at any depth (used when re-sharding)."""
+    found = []
+    stack = [(root, 0)]
+    while stack:
+        path, depth = stack.pop()
+        for name in sorted(scan_dir_names(path)):
+            if name.startswith("."):
+                continue
+            child = path / name
+            if (child / TASK_FILENAME).is_file():
+                found.append(child)
+            elif depth < max_depth:
+                stack.append((child, depth + 1))
+    return sorted(found)
+
+
+def apply_layout(root: Path, layout: list[str]) -> list[tuple[Path, Path]]:
+    """Move misplaced tasks into their shards and remove emptied shard directories."""
+    moved = []
+    for current, expected in find_misplaced(root, layout):
+        if expected.exists():
+            raise FileExistsError(f"Cannot move {current}: {expected} already exists")
+        expected.parent.mkdir(parents=True, exist_ok=True)
+        os.rename(current, expected)
+        moved.append((current, expected))
+        parent = current.parent
+        while parent != root:
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+            parent = parent.parent
+    return moved
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Show, change or check the shard layout of a task root"
+    )
+    parser.add_argument(
+        "--root",
+        type=str,
+        default="tasks/",
+        help="Root directory containing task directories"
+    )
+    parser.add_argument("--set", dest="spec", type=str, help='New layout, e.g. "year/month" ("flat" to unshard)')
+    parser.add_argument("--check", action="store_true", help="List tasks not placed per the layout")
+    parser.add_argument("--apply", action="store_true", help="Move misplaced tasks into their shards")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+    root = Path(args.root)
+
+    if not root.is_dir():
+        print(f"Error: Root directory does not exist: {root}", file=sys.stderr)
+        return 1
+
+    try:
+        if args.spec is not None:
+            layout = parse_layout("" if args.spec == "flat" else args.spec)
+        else:
+            layout = read_layout(root)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    spec = "/".join(layout) or "flat"
+    misplaced = find_misplaced(root, layout)
+    moved = []
+
+    if misplaced and args.spec is not None and not args.apply:
+        print(
+            f"Error: {len(misplaced)} task(s) would be misplaced under {spec}; rerun with --apply to move them",
+            file=sys.stderr,
+        )
+        return 1
+
+    if args.apply:
+        try:
+            moved = apply_layout(root, layout)
+        except OSError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        misplaced = []
+        if moved:
+            # Index entries are keyed by path; rebuild from the new tree.
+            from task_index import drop_index
+            drop_index(root)
+
+    if args.spec is not None:
+        if layout:
+            (root / LAYOUT_FILENAME).write_text(spec + "\n", encoding="utf-8")
+        else:
+            (root / LAYOUT_FILENAME).unlink(missing_ok=True)
+
+    if args.json:
+        print(json.dumps({
+            "layout": spec,
+            "shards": len(shard_dirs(root, layout)),
+            "moved": [[str(a), str(b)] for a, b in moved],
+            "misplaced": [[str(a), str(b)] for a, b in misplaced],
+        }, indent=2))
+    else:
+        print(f"Layout: {spec}")
+        print(f"  Shards: {len(shard_dirs(root, layout))}")
+        if args.apply:
+            print(f"  Moved: {len(moved)}")
+        for current, expected in misplaced:
+            print(f"  Misplaced: {current} -> {expected}")
+
+    return 1 if misplaced and args.check else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
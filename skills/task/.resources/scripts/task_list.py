@@ -9,169 +9,508 @@ Usage:
     python task_list.py --root tasks/ --stale
     python task_list.py --root tasks/ --validated --active
     python task_list.py --root tasks/ --json
+    python task_list.py --root tasks/ --no-index
+    python task_list.py --root tasks/ --created-after 2026-10-01T00:00:00Z
+    python task_list.py --root tasks/ --where "kind=feature and risk>=high"
+    python task_list.py --root tasks/ --limit 20
+    python task_list.py --root tasks/ --limit 20 --cursor <token from previous page>
+    python task_list.py --root tasks/ --ndjson > tasks.ndjson
+    python task_list.py --root tasks/ --compact --ndjson > tasks.ndjson
 
 Options:
-    --stale         Show only stale tasks
-    --validated     Show only validated tasks
-    --active        Show only active tasks
-    --inactive      Show only inactive tasks
-    --sort          Sort field (default: created_at)
-    --desc          Descending order (default)
-    --asc           Ascending order
+    --stale           Show only stale tasks
+    --validated       Show only validated tasks
+    --active          Show only active tasks
+    --inactive        Show only inactive tasks
+    --created-after   Only tasks created at or after an RFC3339 timestamp
+    --created-before  Only tasks created before an RFC3339 timestamp
+    --where           Query expression (see task_query.py), ANDed with the flags
+    --sort            Sort field (default: created_at)
+    --desc            Descending order (default)
+    --asc             Ascending order
+    --limit           Show at most N tasks (heap top-k; no full sort)
+    --offset          Skip the first N tasks of the sorted listing
+    --cursor          Continue after the last task of a previous page
+    --unsorted        Discovery order instead of a sort
+    --ndjson          One JSON object per line, streamed as tasks are read
+    --no-index        Bypass the persistent frontmatter index (.task_index.sqlite)
+    --compact         Hold tasks as TaskRecords (task_record.py): about a
+                      quarter of the memory of dicts, at some build CPU
+    --jobs            Threads for task discovery (default: 1; use 16+ on NFS)
+    --now             Evaluate staleness as of an RFC3339 timestamp (default:
+                      $TASK_NOW, else the current time)
+
+Sharded roots (see task_layout.py) are walked shard by shard; date and kind
+filters skip shards that cannot contain matching tasks.
+
+Staleness and parsed timestamps are derived once per task, all against a
+single "now" pinned at the start of the run (task_store.init_clock), and
+shared by filters, sorting and output.
+
+Ties in the sort field are ordered by task path. A paginated listing prints
+"Next page: --cursor <token>" (on stderr with --json) while more tasks remain;
+the cursor stays valid when tasks are added or removed. --count reports all
+matching tasks regardless of pagination.
+
+--ndjson keeps memory flat on large roots: with --unsorted tasks are written
+as they are read; otherwise they are sorted in bounded runs spilled to
+temporary files and merged (or, with --limit, selected with a k-sized heap).
 """
 
+import sys
+
+if __name__ == "__main__":
+    # Hand the call to a running task_daemon.py before the imports below (see task_client.py).
+    from task_client import delegate
+
+    delegate("task_list")
+
 import argparse
+import base64
+import binascii
+import heapq
+import itertools
 import json
-import sys
-from datetime import datetime, timezone
+import math
+import os
+import pickle
+import sqlite3
+import tempfile
+import textwrap
+from datetime import datetime, timedelta, timezone
+from operator import itemgetter
 from pathlib import Path
+from typing import IO, Any, Callable, Iterable, Iterator, NamedTuple, Optional, Union
+
+import task_store
+from task_index import DEFAULT_DISCOVERY_JOBS, iter_index, load_task_frontmatter
+from task_layout import ShardPrune, read_layout
+from task_query import compile_node, index_constraints, merge_constraints, parse_query
+from task_record import DERIVED_SLOT, TaskRecord
+
+
+MIN_DATETIME = datetime.min.replace(tzinfo=timezone.utc)
+TIME_SORT_FIELDS = ("created_at", "last_reviewed_at", "expires_at")
+# Tasks are dicts ({"path", "dir_name", **frontmatter}), or the equivalent
+# TaskRecords when iter_tasks is asked for compact tasks.
+Task = Union[dict, TaskRecord]
+# Key under which derived fields (TaskDerived) are attached to a task.
+DERIVED_KEY = DERIVED_SLOT
+# Tasks held in memory per sorted run when streaming --ndjson output.
+SORT_RUN_SIZE = 10000
 
 
 def parse_rfc3339(timestamp: str) -> datetime:
-    """Parse RFC3339 timestamp to datetime."""
-    if not timestamp:
-        return datetime.min.replace(tzinfo=timezone.utc)
-    timestamp = timestamp.replace("Z", "+00:00")
-    try:
-        return datetime.fromisoformat(timestamp)
-    except ValueError:
-        return datetime.min.replace(tzinfo=timezone.utc)
+    """Parse RFC3339 timestamp to datetime (datetime.min if empty or invalid)."""
+    return task_store.parse_rfc3339(timestamp) or MIN_DATETIME
+
+
+def parse_filter_time(timestamp: str) -> datetime:
+    """Parse an RFC3339 filter argument (naive means UTC). Raises ValueError."""
+    dt = task_store.parse_rfc3339(timestamp)
+    if dt is None:
+        raise ValueError(f"Invalid RFC3339 timestamp: {timestamp}")
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def created_datetime(task: Task) -> datetime:
+    """Return a task's created_at as an aware datetime (datetime.min if invalid)."""
+    return task_derived(task).created_at
 
 
 def read_frontmatter(task_file: Path) -> dict:
-    """Read frontmatter from task file."""
-    try:
-        content = task_file.read_text(encoding="utf-8")
-    except Exception:
-        return {}
-    
-    if not content.startswith("---"):
-        return {}
-    
-    parts = content.split("---", 2)
-    if len(parts) < 3:
-        return {}
-    
+    """Read frontmatter from task file ({} if missing or unparseable)."""
     try:
-        import yaml
-        return yaml.safe_load(parts[1].strip()) or {}
-    except ImportError:
-        return _parse_simple_yaml(parts[1].strip())
+        return task_store.read_frontmatter(task_file)
     except Exception:
         return {}
 
 
-def _parse_simple_yaml(raw: str) -> dict:
-    """Simple YAML parser fallback."""
-    result = {}
-    for line in raw.split("\n"):
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-        if ":" in line:
-            key, _, value = line.partition(":")
-            value = value.strip().strip('"').strip("'")
-            if value.lower() == "true":
-                value = True
-            elif value.lower() == "false":
-                value = False
-            result[key.strip()] = value
-    return result
-
-
-def discover_tasks(root: Path) -> list[dict]:
-    """Discover all task directories under root."""
-    tasks = []
-    
+def discover_tasks(
+    root: Path,
+    use_index: bool = True,
+    jobs: int = DEFAULT_DISCOVERY_JOBS,
+    prune: ShardPrune = None,
+    select: dict[str, frozenset] = None,
+) -> list[dict]:
+    """Discover all task directories under root (see iter_tasks)."""
+    return list(iter_tasks(root, use_index, jobs, prune, select))
+
+
+def task_dict(path: str, frontmatter: dict) -> dict:
+    """Return the dict form of a task: frontmatter plus path and dir_name."""
+    return {"path": path, "dir_name": path.rpartition(os.sep)[2], **frontmatter}
+
+
+def iter_tasks(
+    root: Path,
+    use_index: bool = True,
+    jobs: int = DEFAULT_DISCOVERY_JOBS,
+    prune: ShardPrune = None,
+    select: dict[str, frozenset] = None,
+    compact: bool = False,
+) -> Iterator[Task]:
+    """Yield a dict (frontmatter plus path and dir_name) for every task under root.
+
+    When `use_index` is set, frontmatter is served from the persistent index
+    in the root and only changed task files are reparsed; index entries are
+    decoded one at a time as the caller consumes them. If the index cannot
+    be opened or written (e.g. read-only root), falls back to a full scan.
+    Inside task_daemon.py the resident task set is used without touching disk.
+    Per-task stats and reads run on `jobs` threads. In a sharded root (see
+    task_layout.py), shards excluded by `prune` are not visited. `select`
+    ({field: allowed values}) narrows the result through the secondary
+    attribute index where one is available. Callers still apply their own
+    filters to the result. With `compact`, tasks are TaskRecords (see
+    task_record.py) instead: a fraction of the memory on large roots, for
+    some extra CPU per task to build them.
+    """
     if not root.exists():
-        return tasks
+        return
+    make_task = TaskRecord.from_frontmatter if compact else task_dict
+    
+    resident = task_store.resident_tasks(root)
+    if resident is not None:
+        index = task_store.resident_index(root)
+        keys = index.candidates(select) if select and index is not None else None
+        items = list(resident.items()) if keys is None else [(key, resident[key]) for key in sorted(keys)]
+        for rel_path, frontmatter in items:
+            if frontmatter:
+                yield make_task(str(root / rel_path), frontmatter)
+        return
     
-    for task_dir in root.iterdir():
-        if not task_dir.is_dir():
-            continue
-        
-        task_file = task_dir / "00_TASK.md"
-        if not task_file.exists():
-            continue
-        
-        frontmatter = read_frontmatter(task_file)
-        if not frontmatter:
-            continue
-        
-        tasks.append({
-            "path": str(task_dir),
-            "dir_name": task_dir.name,
-            **frontmatter
-        })
+    if use_index:
+        try:
+            entries, _ = iter_index(root, read_frontmatter, jobs, prune, select)
+        except (sqlite3.Error, OSError):
+            entries = None
+        if entries is not None:
+            for task_dir, frontmatter in entries:
+                if not frontmatter:
+                    continue
+                yield make_task(str(task_dir), frontmatter)
+            return
     
-    return tasks
+    for task_dir, frontmatter in load_task_frontmatter(root, read_frontmatter, jobs, prune):
+        yield make_task(str(task_dir), frontmatter)
 
 
-def filter_tasks(tasks: list[dict], filters: dict) -> list[dict]:
-    """Apply filters to task list."""
-    result = tasks
+# Boolean flags that select one value of an indexed field.
+FLAG_FILTERS = [
+    ("validated", "epistemic_state", "validated"),
+    ("invalidated", "epistemic_state", "invalidated"),
+    ("active", "lifecycle_state", "active"),
+    ("inactive", "lifecycle_state", "inactive"),
+    ("blocked", "lifecycle_state", "blocked"),
+    ("completed", "lifecycle_state", "completed"),
+]
+
+
+def filter_constraints(filters: dict) -> dict[str, frozenset]:
+    """Index constraints ({field: allowed values}) implied by the fixed filter flags."""
+    constraints = [
+        {field: frozenset([value])}
+        for flag, field, value in FLAG_FILTERS
+        if filters.get(flag)
+    ]
+    if filters.get("kind"):
+        constraints.append({"kind": frozenset([filters["kind"]])})
+    return merge_constraints(*constraints)
+
+
+def task_filter(filters: dict) -> Optional[Callable[[Task], bool]]:
+    """Combine the active filters into one predicate (None if no filter is set).
+
+    `filters["where"]` may hold a compiled task_query predicate; it is
+    combined with the flag filters.
+    """
+    checks = []
     
     if filters.get("stale"):
-        result = [t for t in result if is_task_stale(t)]
-    
-    if filters.get("validated"):
-        result = [t for t in result if t.get("epistemic_state") == "validated"]
-    
-    if filters.get("invalidated"):
-        result = [t for t in result if t.get("epistemic_state") == "invalidated"]
+        checks.append(lambda t: task_derived(t).is_stale)
     
-    if filters.get("active"):
-        result = [t for t in result if t.get("lifecycle_state") == "active"]
+    for flag, field, value in FLAG_FILTERS:
+        if filters.get(flag):
+            checks.append(lambda t, field=field, value=value: t.get(field) == value)
     
-    if filters.get("inactive"):
-        result = [t for t in result if t.get("lifecycle_state") == "inactive"]
+    if filters.get("kind"):
+        checks.append(lambda t: t.get("kind") == filters["kind"])
     
-    if filters.get("blocked"):
-        result = [t for t in result if t.get("lifecycle_state") == "blocked"]
+    if filters.get("created_after"):
+        checks.append(lambda t: task_derived(t).created_at >= filters["created_after"])
     
-    if filters.get("completed"):
-        result = [t for t in result if t.get("lifecycle_state") == "completed"]
+    if filters.get("created_before"):
+        checks.append(lambda t: MIN_DATETIME < task_derived(t).created_at < filters["created_before"])
     
-    if filters.get("kind"):
-        result = [t for t in result if t.get("kind") == filters["kind"]]
+    if filters.get("where"):
+        checks.append(filters["where"])
     
-    return result
+    if not checks:
+        return None
+    return lambda t: all(check(t) for check in checks)
 
 
-def is_task_stale(task: dict) -> bool:
-    """Check if task is stale based on frontmatter."""
-    now = datetime.now(timezone.utc)
+def filter_tasks(tasks: list[Task], filters: dict) -> list[Task]:
+    """Apply filters to task list in a single pass."""
+    keep = task_filter(filters)
+    if keep is None:
+        return list(tasks)
+    return [t for t in tasks if keep(t)]
+
+
+class TaskDerived(NamedTuple):
+    """Fields derived from a task's frontmatter against one fixed "now".
+
+    Timestamps are aware datetimes (MIN_DATETIME when missing or invalid);
+    days_since_review is None when the task has no valid reference time.
+    """
+
+    created_at: datetime
+    last_reviewed_at: datetime
+    expires_at: datetime
+    days_since_review: Optional[int]
+    is_expired: bool
+    is_stale: bool
+
+
+def _timestamp(task: Task, field: str) -> tuple[datetime, bool]:
+    """A timestamp field as (aware datetime, whether it is set)."""
+    value = task.get(field)
+    return _aware(value), bool(value)
+
+
+def _aware(timestamp: Any) -> datetime:
+    dt = task_store.parse_rfc3339(str(timestamp)) if timestamp else None
+    if dt is None:
+        return MIN_DATETIME
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def derive_fields(task: Task, now: datetime) -> TaskDerived:
+    """Compute a task's parsed timestamps and staleness as of `now`."""
+    created_at, _ = _timestamp(task, "created_at")
+    last_reviewed_at, reviewed = _timestamp(task, "last_reviewed_at")
+    expires_at, expires = _timestamp(task, "expires_at")
     
-    last_reviewed = task.get("last_reviewed_at")
-    created = task.get("created_at")
-    threshold = task.get("staleness_days_threshold", 14)
-    expires = task.get("expires_at")
+    # A set but unparseable expires_at counts as expired.
+    is_expired = expires and expires_at < now
     
-    if expires:
-        expires_dt = parse_rfc3339(expires)
-        if expires_dt < now:
-            return True
+    # The reference is last_reviewed_at if set (even if invalid), else created_at.
+    reference = last_reviewed_at if reviewed else created_at
+    days_since_review = None if reference == MIN_DATETIME else (now - reference).days
+    threshold = task.get("staleness_days_threshold", 14)
     
-    reference = parse_rfc3339(last_reviewed or created or "")
-    if reference == datetime.min.replace(tzinfo=timezone.utc):
-        return False
+    is_stale = is_expired or (days_since_review is not None and days_since_review > threshold)
+    return TaskDerived(created_at, last_reviewed_at, expires_at, days_since_review, is_expired, is_stale)
+
+
+def stale_at(task: Task) -> Optional[tuple[datetime, str]]:
+    """
+    The first whole second at which derive_fields reports a task stale, and
+    why ("review" or "expiry"); None if it never goes stale.
+
+    Mirrors derive_fields: stale from the day after the threshold has passed
+    since the reference time, or once expires_at is in the past (MIN_DATETIME
+    for an invalid expires_at, which always counts as expired).
+    """
+    created_at, _ = _timestamp(task, "created_at")
+    last_reviewed_at, reviewed = _timestamp(task, "last_reviewed_at")
+    expires_at, expires = _timestamp(task, "expires_at")
     
-    days_since = (now - reference).days
-    return days_since > threshold
+    candidates = []
+    if expires:
+        # expires_at < now first holds at the next whole second.
+        candidates.append((_next_second(expires_at) if expires_at != MIN_DATETIME else MIN_DATETIME, "expiry"))
+    reference = last_reviewed_at if reviewed else created_at
+    threshold = task.get("staleness_days_threshold", 14)
+    if reference != MIN_DATETIME and isinstance(threshold, (int, float)) and not isinstance(threshold, bool):
+        # days_since_review > threshold first holds floor(threshold) + 1 days after the reference.
+        try:
+            due = reference + timedelta(days=math.floor(threshold) + 1)
+        except OverflowError:
+            due = None
+        if due is not None:
+            candidates.append((due if not due.microsecond else _next_second(due), "review"))
+    return min(candidates) if candidates else None
+
+
+def _next_second(instant: datetime) -> datetime:
+    """The first whole second strictly after `instant`."""
+    return instant.replace(microsecond=0) + timedelta(seconds=1)
+
+
+def with_derived(task: Task, now: datetime) -> Task:
+    """Attach derived fields (computed against `now`) to a task and return it."""
+    task[DERIVED_KEY] = derive_fields(task, now)
+    return task
+
+
+def task_derived(task: Task) -> TaskDerived:
+    """Return a task's attached derived fields, computing them against the current time if absent."""
+    derived = task.get(DERIVED_KEY)
+    if derived is None:
+        derived = derive_fields(task, task_store.utc_now())
+    return derived
+
+
+def is_task_stale(task: Task) -> bool:
+    """Check if task is stale based on frontmatter."""
+    return task_derived(task).is_stale
+
+
+def sort_value(task: Task, sort_field: str) -> Union[datetime, str]:
+    """Return a task's value for a sort field (time fields from the derived, pre-parsed values)."""
+    if sort_field in TIME_SORT_FIELDS:
+        return getattr(task_derived(task), sort_field)
+    return str(task.get(sort_field, "")).lower()
 
 
-def sort_tasks(tasks: list[dict], sort_field: str, descending: bool) -> list[dict]:
+def sort_key(task: Task, sort_field: str) -> tuple:
+    """Total sort key: the field value, then the task path to order ties."""
+    return (sort_value(task, sort_field), task.get("path", ""))
+
+
+def sort_tasks(tasks: list[Task], sort_field: str, descending: bool) -> list[Task]:
     """Sort tasks by field."""
-    def get_sort_key(task):
-        value = task.get(sort_field, "")
-        if sort_field in ["created_at", "last_reviewed_at", "expires_at"]:
-            return parse_rfc3339(value)
-        return str(value).lower()
-    
-    return sorted(tasks, key=get_sort_key, reverse=descending)
+    return select_page(tasks, sort_field, descending)[0]
+
+
+def select_page(
+    tasks: Iterable[Task],
+    sort_field: str,
+    descending: bool,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    cursor: Optional[tuple] = None,
+) -> tuple[list[Task], bool]:
+    """
+    Return (page, more): one page of tasks in sort order, and whether
+    further tasks follow it.
+
+    Keys are computed once per task. Tasks at or before `cursor` (a sort key
+    from decode_cursor) are skipped. With a `limit`, the first offset + limit
+    tasks are selected with a heap in O(n log k) instead of sorting them all;
+    only those are held in memory when `tasks` is an iterator.
+    """
+    keyed = after_cursor(((sort_key(task, sort_field), task) for task in tasks), descending, cursor)
+    if limit is None:
+        ordered = sorted(keyed, key=itemgetter(0), reverse=descending)
+        return [task for _, task in ordered[offset:]], False
+    select = heapq.nlargest if descending else heapq.nsmallest
+    ordered = select(offset + limit + 1, keyed, key=itemgetter(0))
+    return [task for _, task in ordered[offset:offset + limit]], len(ordered) > offset + limit
+
+
+def after_cursor(keyed: Iterable[tuple], descending: bool, cursor: Optional[tuple]) -> Iterable[tuple]:
+    """Drop (key, task) pairs at or before `cursor` in the sort direction."""
+    if cursor is None:
+        return keyed
+    if descending:
+        return (item for item in keyed if item[0] < cursor)
+    return (item for item in keyed if item[0] > cursor)
+
+
+def external_sort(
+    tasks: Iterable[Task],
+    sort_field: str,
+    descending: bool,
+    cursor: Optional[tuple] = None,
+    run_size: int = SORT_RUN_SIZE,
+) -> Iterator[Task]:
+    """
+    Yield tasks in sort order, holding at most `run_size` tasks in memory.
+
+    Tasks are collected into runs; each full run is sorted and spilled to a
+    temporary file, and the runs are then k-way merged. A listing smaller
+    than one run is sorted in memory without touching disk.
+    """
+    runs = []
+    run = []
+    try:
+        for item in after_cursor(((sort_key(task, sort_field), task) for task in tasks), descending, cursor):
+            run.append(item)
+            if len(run) >= run_size:
+                runs.append(_spill_run(run, descending))
+                run = []
+        run.sort(key=itemgetter(0), reverse=descending)
+        merged = heapq.merge(*(_read_run(f) for f in runs), run, key=itemgetter(0), reverse=descending)
+        for _, task in merged:
+            yield task
+    finally:
+        for f in runs:
+            f.close()
+
+
+def _spill_run(run: list[tuple], descending: bool) -> IO[bytes]:
+    run.sort(key=itemgetter(0), reverse=descending)
+    f = tempfile.TemporaryFile()
+    pickler = pickle.Pickler(f, protocol=pickle.HIGHEST_PROTOCOL)
+    for item in run:
+        pickler.dump(item)
+        # Don't let the memo keep every spilled task alive.
+        pickler.clear_memo()
+    f.seek(0)
+    return f
 
 
-def format_task_line(task: dict) -> str:
+def _read_run(f: IO[bytes]) -> Iterator[tuple]:
+    while True:
+        try:
+            yield pickle.load(f)
+        except EOFError:
+            return
+
+
+def encode_cursor(task: Task, sort_field: str) -> str:
+    """Return an opaque cursor positioned after `task` in a listing sorted by `sort_field`."""
+    value, path = sort_key(task, sort_field)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort_field, value, path], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_field: str) -> tuple:
+    """Decode a cursor from encode_cursor into a sort key. Raises ValueError."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        field, value, path = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        value = datetime.fromisoformat(value) if field in TIME_SORT_FIELDS else str(value)
+    except (ValueError, TypeError, binascii.Error):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    if field != sort_field:
+        raise ValueError(f"Cursor was issued for --sort {field}, not --sort {sort_field}")
+    return (value, str(path))
+
+
+def task_json(task: Task) -> dict:
+    """Return the JSON output record for a task."""
+    return {
+        "id": task.get("id", task.get("dir_name")),
+        "title": task.get("title"),
+        "path": task.get("path"),
+        "epistemic_state": task.get("epistemic_state"),
+        "lifecycle_state": task.get("lifecycle_state"),
+        "created_at": task.get("created_at"),
+        "is_stale": is_task_stale(task)
+    }
+
+
+def write_json_array(items: Iterable[dict]) -> None:
+    """Write items to stdout as an indented JSON array, one element at a time.
+
+    The text is identical to print(json.dumps(list(items), indent=2)).
+    """
+    out = sys.stdout
+    first = True
+    for item in items:
+        out.write("[\n" if first else ",\n")
+        out.write(textwrap.indent(json.dumps(item, indent=2), "  "))
+        first = False
+    out.write("[]\n" if first else "\n]\n")
+
+
+def format_task_line(task: Task) -> str:
     """Format single task for display."""
     task_id = task.get("id", task.get("dir_name", "?"))
     title = task.get("title", "Untitled")[:50]
@@ -202,10 +541,27 @@ def main() -> int:
     parser.add_argument("--blocked", action="store_true", help="Show only blocked tasks")
     parser.add_argument("--completed", action="store_true", help="Show only completed tasks")
     parser.add_argument("--kind", type=str, help="Filter by kind")
+    parser.add_argument("--created-after", type=str, help="Only tasks created at or after this RFC3339 time")
+    parser.add_argument("--created-before", type=str, help="Only tasks created before this RFC3339 time")
+    parser.add_argument("--where", type=str, help='Query, e.g. "kind=feature and risk>=high" (see task_query.py)')
     parser.add_argument("--sort", type=str, default="created_at", help="Sort field")
     parser.add_argument("--asc", action="store_true", help="Ascending order")
+    parser.add_argument("--limit", type=int, help="Show at most N tasks")
+    parser.add_argument("--offset", type=int, default=0, help="Skip the first N tasks")
+    parser.add_argument("--cursor", type=str, help="Continue after a previous page (from its Next page line)")
+    parser.add_argument("--unsorted", action="store_true", help="Discovery order instead of a sort")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--ndjson", action="store_true", help="Output one JSON object per line, streamed")
     parser.add_argument("--count", action="store_true", help="Output only count")
+    parser.add_argument("--no-index", action="store_true", help="Bypass the persistent frontmatter index")
+    parser.add_argument("--compact", action="store_true", help="Hold tasks as compact TaskRecords (less memory)")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_DISCOVERY_JOBS,
+        help=f"Threads for task discovery (default: {DEFAULT_DISCOVERY_JOBS}; raise on high-latency filesystems)"
+    )
+    parser.add_argument("--now", type=str, help="Evaluate staleness as of this RFC3339 time (default: $TASK_NOW)")
 
     args = parser.parse_args()
     root = Path(args.root)
@@ -214,7 +570,36 @@ def main() -> int:
         print(f"Error: Root directory does not exist: {root}", file=sys.stderr)
         return 1
 
-    tasks = discover_tasks(root)
+    try:
+        read_layout(root)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    try:
+        now = task_store.init_clock(args.now)
+        created_after = parse_filter_time(args.created_after) if args.created_after else None
+        created_before = parse_filter_time(args.created_before) if args.created_before else None
+        query = parse_query(args.where) if args.where else None
+        where = compile_node(query) if query else None
+        cursor = decode_cursor(args.cursor, args.sort) if args.cursor else None
+        if args.limit is not None and args.limit < 1:
+            raise ValueError("--limit must be at least 1")
+        if args.offset < 0:
+            raise ValueError("--offset must not be negative")
+        if args.unsorted and cursor is not None:
+            raise ValueError("--cursor needs a sorted listing (drop --unsorted)")
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    
+    prune = ShardPrune(
+        created_after=created_after,
+        created_before=created_before,
+        kinds=frozenset([args.kind]) if args.kind else None,
+    )
+    if prune == ShardPrune():
+        prune = None
     
     filters = {
         "stale": args.stale,
@@ -224,39 +609,70 @@ def main() -> int:
         "inactive": args.inactive,
         "blocked": args.blocked,
         "completed": args.completed,
-        "kind": args.kind
+        "kind": args.kind,
+        "created_after": created_after,
+        "created_before": created_before,
+        "where": where
     }
+    select = merge_constraints(filter_constraints(filters), index_constraints(query) if query else {})
     
-    tasks = filter_tasks(tasks, filters)
-    tasks = sort_tasks(tasks, args.sort, not args.asc)
+    tasks = iter_tasks(
+        root, use_index=not args.no_index, jobs=args.jobs, prune=prune, select=select, compact=args.compact
+    )
+    # Derived fields are computed once per task, all against the same now.
+    tasks = (with_derived(t, now) for t in tasks)
+    keep = task_filter(filters)
+    if keep is not None:
+        tasks = (t for t in tasks if keep(t))
     
     if args.count:
-        print(len(tasks))
+        print(sum(1 for _ in tasks))
         return 0
     
+    if args.ndjson:
+        next_cursor = None
+        if args.unsorted:
+            end = args.offset + args.limit if args.limit is not None else None
+            page = itertools.islice(tasks, args.offset, end)
+        elif args.limit is not None:
+            page, more = select_page(tasks, args.sort, not args.asc, args.limit, args.offset, cursor)
+            next_cursor = encode_cursor(page[-1], args.sort) if more and page else None
+        else:
+            page = itertools.islice(external_sort(tasks, args.sort, not args.asc, cursor), args.offset, None)
+        for task in page:
+            sys.stdout.write(json.dumps(task_json(task)) + "\n")
+        if next_cursor:
+            print(f"Next page: --cursor {next_cursor}", file=sys.stderr)
+        return 0
+    
+    tasks = list(tasks)
+    total = len(tasks)
+    paginated = args.limit is not None or args.offset or cursor is not None
+    if args.unsorted:
+        end = args.offset + args.limit if args.limit is not None else None
+        page, more = tasks[args.offset:end], end is not None and total > end
+    else:
+        page, more = select_page(tasks, args.sort, not args.asc, args.limit, args.offset, cursor)
+    next_cursor = encode_cursor(page[-1], args.sort) if more and page and not args.unsorted else None
+    
     if args.json:
-        output = [
-            {
-                "id": t.get("id", t.get("dir_name")),
-                "title": t.get("title"),
-                "path": t.get("path"),
-                "epistemic_state": t.get("epistemic_state"),
-                "lifecycle_state": t.get("lifecycle_state"),
-                "created_at": t.get("created_at"),
-                "is_stale": is_task_stale(t)
-            }
-            for t in tasks
-        ]
-        print(json.dumps(output, indent=2))
+        write_json_array(task_json(t) for t in page)
+        if next_cursor:
+            print(f"Next page: --cursor {next_cursor}", file=sys.stderr)
     else:
-        if not tasks:
+        if not page:
             print("No tasks found.")
         else:
             print(f"{'ID':<20} {'EPIST':<6} {'LIFE':<8} {'CREATED':<12} {'STATUS':<8} TITLE")
             print("-" * 80)
-            for task in tasks:
+            for task in page:
                 print(format_task_line(task))
-            print(f"\nTotal: {len(tasks)} task(s)")
+            if paginated:
+                print(f"\nShowing {len(page)} of {total} task(s)")
+            else:
+                print(f"\nTotal: {total} task(s)")
+            if next_cursor:
+                print(f"Next page: --cursor {next_cursor}")
     
     return 0
 
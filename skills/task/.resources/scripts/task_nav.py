@@ -9,84 +9,77 @@ Usage:
     python task_nav.py --root tasks/ --prev task-id
     python task_nav.py --root tasks/ --first
     python task_nav.py --root tasks/ --last
+    python task_nav.py --root tasks/ --next task-id --no-index
+    python task_nav.py --root tasks/ --next task-id --no-index --jobs 16
+    python task_nav.py --root tasks/ --next task-id --order topo
+
+Ordering:
+    created_at descending (newest first); ties broken by directory name.
+    Lookups use the chronological index in <root>/.task_index.sqlite
+    (see task_index.py); --no-index scans and sorts every task instead.
+    With --order topo: dependency order (see task_graph.py), dependencies
+    first, oldest first among independent tasks; tasks in or behind a
+    dependency cycle come last.
 
 Output:
     Task ID of the next/previous task, or empty if at boundary
 """
 
+import sys
+
+if __name__ == "__main__":
+    # Hand the call to a running task_daemon.py before the imports below (see task_client.py).
+    from task_client import delegate
+
+    delegate("task_nav")
+
 import argparse
 import json
-import sys
-from datetime import datetime, timezone
+import sqlite3
 from pathlib import Path
 
-
-def parse_rfc3339(timestamp: str) -> datetime:
-    """Parse RFC3339 timestamp to datetime."""
-    if not timestamp:
-        return datetime.min.replace(tzinfo=timezone.utc)
-    timestamp = timestamp.replace("Z", "+00:00")
-    try:
-        return datetime.fromisoformat(timestamp)
-    except ValueError:
-        return datetime.min.replace(tzinfo=timezone.utc)
+import task_store
+from task_index import (
+    DEFAULT_DISCOVERY_JOBS,
+    chrono_edge,
+    chrono_step,
+    created_key,
+    load_task_frontmatter,
+    open_index,
+    refresh_chrono,
+)
+from task_layout import read_layout
 
 
 def read_frontmatter(task_file: Path) -> dict:
-    """Read frontmatter from task file."""
+    """Read frontmatter from task file ({} if missing or unparseable)."""
     try:
-        content = task_file.read_text(encoding="utf-8")
+        return task_store.read_frontmatter(task_file)
     except Exception:
         return {}
-    
-    if not content.startswith("---"):
-        return {}
-    
-    parts = content.split("---", 2)
-    if len(parts) < 3:
-        return {}
-    
-    try:
-        import yaml
-        return yaml.safe_load(parts[1].strip()) or {}
-    except ImportError:
-        return _parse_simple_yaml(parts[1].strip())
-    except Exception:
-        return {}
-
 
-def _parse_simple_yaml(raw: str) -> dict:
-    """Simple YAML parser fallback."""
-    result = {}
-    for line in raw.split("\n"):
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-        if ":" in line:
-            key, _, value = line.partition(":")
-            result[key.strip()] = value.strip().strip('"').strip("'")
-    return result
 
-
-def discover_tasks(root: Path) -> list[dict]:
-    """Discover all task directories under root."""
+def discover_tasks(root: Path, jobs: int = DEFAULT_DISCOVERY_JOBS) -> list[dict]:
+    """Discover all task directories under root (reads run on `jobs` threads)."""
     tasks = []
     
     if not root.exists():
         return tasks
     
-    for task_dir in root.iterdir():
-        if not task_dir.is_dir():
-            continue
-        
-        task_file = task_dir / "00_TASK.md"
-        if not task_file.exists():
-            continue
-        
-        frontmatter = read_frontmatter(task_file)
-        if not frontmatter:
-            continue
-        
+    resident = task_store.resident_tasks(root)
+    if resident is not None:
+        for rel_path, frontmatter in resident.items():
+            if frontmatter:
+                dir_name = rel_path.rsplit("/", 1)[-1]
+                tasks.append({
+                    "id": frontmatter.get("id", dir_name),
+                    "path": str(root / rel_path),
+                    "dir_name": dir_name,
+                    "created_at": frontmatter.get("created_at", "")
+                })
+        return tasks
+    
+    for task_dir, frontmatter in load_task_frontmatter(root, read_frontmatter, jobs):
         task_id = frontmatter.get("id", task_dir.name)
         tasks.append({
             "id": task_id,
@@ -99,9 +92,9 @@ def discover_tasks(root: Path) -> list[dict]:
 
 
 def sort_tasks_chronologically(tasks: list[dict], descending: bool = True) -> list[dict]:
-    """Sort tasks by created_at timestamp."""
+    """Sort tasks by created_at timestamp (directory name breaks ties)."""
     def get_sort_key(task):
-        return parse_rfc3339(task.get("created_at", ""))
+        return created_key(task.get("created_at", "")), task["dir_name"]
     
     return sorted(tasks, key=get_sort_key, reverse=descending)
 
@@ -114,6 +107,77 @@ def find_task_index(tasks: list[dict], task_id: str) -> int:
     return -1
 
 
+def navigate_scan(root: Path, mode: str, task_id: str = None, jobs: int = DEFAULT_DISCOVERY_JOBS) -> tuple[str, dict]:
+    """Resolve a navigation request by scanning and sorting every task.
+
+    Returns (status, task) where status is "ok", "empty" or "not_found";
+    task is None at a boundary.
+    """
+    tasks = discover_tasks(root, jobs)
+    if not tasks:
+        return "empty", None
+    
+    tasks = sort_tasks_chronologically(tasks, descending=True)
+    
+    if mode == "first":
+        return "ok", tasks[0]
+    if mode == "last":
+        return "ok", tasks[-1]
+    
+    idx = find_task_index(tasks, task_id)
+    if idx == -1:
+        return "not_found", None
+    if mode == "next":
+        return "ok", tasks[idx + 1] if idx + 1 < len(tasks) else None
+    return "ok", tasks[idx - 1] if idx > 0 else None
+
+
+def navigate_indexed(root: Path, mode: str, task_id: str = None) -> tuple[str, dict]:
+    """Resolve a navigation request against the persistent chronological index.
+
+    Same contract as navigate_scan, but a warm lookup is a root stat plus a
+    B-tree seek instead of a full scan and sort.
+    """
+    conn = open_index(root)
+    try:
+        refresh_chrono(conn, root, read_frontmatter)
+        if conn.execute("SELECT 1 FROM chrono LIMIT 1").fetchone() is None:
+            return "empty", None
+        if mode in ("first", "last"):
+            return "ok", chrono_edge(conn, root, newest=mode == "first")
+        found, task = chrono_step(conn, root, task_id, older=mode == "next")
+        return ("ok" if found else "not_found"), task
+    finally:
+        conn.close()
+
+
+def navigate_topological(root: Path, mode: str, task_id: str = None, use_index: bool = True) -> tuple[str, dict]:
+    """Resolve a navigation request in dependency order (same contract as navigate_scan)."""
+    from task_graph import load_graph
+
+    graph = load_graph(root, use_index)
+    if not len(graph):
+        return "empty", None
+    order, stuck = graph.topological_order()
+    nodes = order + stuck
+
+    def as_task(position: int) -> dict:
+        task = graph.tasks[nodes[position]]
+        return {"id": task.task_id, "path": task.path, "created_at": task.created_at}
+
+    if mode == "first":
+        return "ok", as_task(0)
+    if mode == "last":
+        return "ok", as_task(len(nodes) - 1)
+    node = graph.index.get(task_id)
+    if node is None:
+        return "not_found", None
+    idx = nodes.index(node)
+    if mode == "next":
+        return "ok", as_task(idx + 1) if idx + 1 < len(nodes) else None
+    return "ok", as_task(idx - 1) if idx > 0 else None
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="Navigate between tasks in deterministic order"
@@ -130,6 +194,19 @@ def main() -> int:
     parser.add_argument("--last", action="store_true", help="Get last task (oldest)")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
     parser.add_argument("--path", action="store_true", help="Output path instead of ID")
+    parser.add_argument("--no-index", action="store_true", help="Scan and sort all tasks instead of using the index")
+    parser.add_argument(
+        "--order",
+        choices=["created", "topo"],
+        default="created",
+        help="created: newest first (default); topo: dependencies first (see task_graph.py)"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_DISCOVERY_JOBS,
+        help=f"Threads for the --no-index scan (default: {DEFAULT_DISCOVERY_JOBS}; raise on high-latency filesystems)"
+    )
 
     args = parser.parse_args()
     root = Path(args.root)
@@ -138,46 +215,49 @@ def main() -> int:
         print(f"Error: Root directory does not exist: {root}", file=sys.stderr)
         return 1
 
-    tasks = discover_tasks(root)
-    if not tasks:
-        if args.json:
-            print(json.dumps({"error": "No tasks found", "result": None}))
-        else:
-            print("No tasks found.", file=sys.stderr)
+    try:
+        read_layout(root)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
         return 1
 
-    tasks = sort_tasks_chronologically(tasks, descending=True)
-    
-    result_task = None
-    
     if args.first:
-        result_task = tasks[0]
+        mode, task_id = "first", None
     elif args.last:
-        result_task = tasks[-1]
+        mode, task_id = "last", None
     elif args.next_id:
-        idx = find_task_index(tasks, args.next_id)
-        if idx == -1:
-            if args.json:
-                print(json.dumps({"error": f"Task not found: {args.next_id}", "result": None}))
-            else:
-                print(f"Error: Task not found: {args.next_id}", file=sys.stderr)
-            return 1
-        if idx + 1 < len(tasks):
-            result_task = tasks[idx + 1]
+        mode, task_id = "next", args.next_id
     elif args.prev_id:
-        idx = find_task_index(tasks, args.prev_id)
-        if idx == -1:
-            if args.json:
-                print(json.dumps({"error": f"Task not found: {args.prev_id}", "result": None}))
-            else:
-                print(f"Error: Task not found: {args.prev_id}", file=sys.stderr)
-            return 1
-        if idx > 0:
-            result_task = tasks[idx - 1]
+        mode, task_id = "prev", args.prev_id
     else:
         print("Error: Must specify --next, --prev, --first, or --last", file=sys.stderr)
         return 1
 
+    status = None
+    if args.order == "topo":
+        status, result_task = navigate_topological(root, mode, task_id, use_index=not args.no_index)
+    elif not args.no_index:
+        try:
+            status, result_task = navigate_indexed(root, mode, task_id)
+        except (sqlite3.Error, OSError):
+            status = None
+    if status is None:
+        status, result_task = navigate_scan(root, mode, task_id, args.jobs)
+
+    if status == "empty":
+        if args.json:
+            print(json.dumps({"error": "No tasks found", "result": None}))
+        else:
+            print("No tasks found.", file=sys.stderr)
+        return 1
+
+    if status == "not_found":
+        if args.json:
+            print(json.dumps({"error": f"Task not found: {task_id}", "result": None}))
+        else:
+            print(f"Error: Task not found: {task_id}", file=sys.stderr)
+        return 1
+
     if result_task:
         if args.json:
             print(json.dumps({
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+task_query.py - Query language for filtering tasks.
+
+Compiles expressions such as
+
+    kind=feature and risk>=high and created_at>2026-09-01
+    (lifecycle_state=active or lifecycle_state=blocked) and not tags=infra
+    title~auth
+
+into a single predicate over task frontmatter, and extracts the equality
+constraints on indexed fields so callers can narrow candidates through a
+secondary index before evaluating the predicate.
+
+Syntax:
+    comparison   field OP value     OP: = == != < <= > >= ~ (substring, case-insensitive)
+    boolean      and, or, not, parentheses
+    values       bare words, or "quoted" / 'quoted' strings
+
+Semantics:
+    risk, scope, confidence     compared by rank (e.g. low < medium < high)
+    created_at, last_reviewed_at, expires_at
+                                compared as instants; a bare date means 00:00Z
+    list fields (tags, depends_on, blocked_by)
+                                = / != test membership
+    integers                    compared numerically
+    missing fields              match only != comparisons
+
+Usage:
+    python task_query.py "kind=feature and risk>=high"
+
+Output:
+    The parsed query and the index constraints derived from it
+"""
+
+import argparse
+import json
+import re
+import sys
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional, Union
+
+from task_store import parse_rfc3339
+
+ORDERED_FIELDS = {
+    "risk": ["none", "low", "medium", "high", "critical"],
+    "scope": ["trivial", "minor", "moderate", "major", "epic"],
+    "confidence": ["low", "medium", "high"],
+}
+TIME_FIELDS = frozenset(["created_at", "last_reviewed_at", "expires_at"])
+LIST_FIELDS = frozenset(["tags", "depends_on", "blocked_by"])
+INDEXED_FIELDS = ("lifecycle_state", "epistemic_state", "kind", "risk", "tags")
+KEYWORDS = frozenset(["and", "or", "not"])
+
+_TOKEN_PATTERN = re.compile(
+    r"""\s*(?:(?P<paren>[()])|(?P<op><=|>=|!=|==|=|<|>|~)|"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<word>[^\s()<>=!~"']+))"""
+)
+_FIELD_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+Predicate = Callable[[dict[str, Any]], bool]
+# Parsed query nodes: ("and", [nodes]), ("or", [nodes]), ("not", node),
+# ("cmp", field, op, value).
+Node = tuple
+
+
+def tokenize(text: str) -> list[tuple[str, str]]:
+    """Split a query into (kind, text) tokens. Raises ValueError."""
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN_PATTERN.match(text, pos)
+        if not match:
+            raise ValueError(f"Invalid query near: {text[pos:].strip()[:20]!r}")
+        pos = match.end()
+        if match.group("paren"):
+            tokens.append(("paren", match.group("paren")))
+        elif match.group("op"):
+            tokens.append(("op", match.group("op")))
+        elif match.group("dq") is not None:
+            tokens.append(("string", match.group("dq")))
+        elif match.group("sq") is not None:
+            tokens.append(("string", match.group("sq")))
+        else:
+            word = match.group("word")
+            kind = "keyword" if word.lower() in KEYWORDS else "word"
+            tokens.append((kind, word.lower() if kind == "keyword" else word))
+    return tokens
+
+
+def parse_query(text: str) -> Node:
+    """Parse a query string into a node tree. Raises ValueError."""
+    tokens = tokenize(text)
+    if not tokens:
+        raise ValueError("Empty query")
+    pos = 0
+
+    def peek() -> Optional[tuple[str, str]]:
+        return tokens[pos] if pos < len(tokens) else None
+
+    def take() -> tuple[str, str]:
+        nonlocal pos
+        if pos >= len(tokens):
+            raise ValueError("Unexpected end of query")
+        pos += 1
+        return tokens[pos - 1]
+
+    def parse_or() -> Node:
+        nodes = [parse_and()]
+        while peek() == ("keyword", "or"):
+            take()
+            nodes.append(parse_and())
+        return nodes[0] if len(nodes) == 1 else ("or", nodes)
+
+    def parse_and() -> Node:
+        nodes = [parse_not()]
+        while peek() == ("keyword", "and"):
+            take()
+            nodes.append(parse_not())
+        return nodes[0] if len(nodes) == 1 else ("and", nodes)
+
+    def parse_not() -> Node:
+        if peek() == ("keyword", "not"):
+            take()
+            return ("not", parse_not())
+        return parse_atom()
+
+    def parse_atom() -> Node:
+        kind, text = take()
+        if (kind, text) == ("paren", "("):
+            node = parse_or()
+            if take() != ("paren", ")"):
+                raise ValueError("Expected )")
+            return node
+        if kind != "word" or not _FIELD_PATTERN.match(text):
+            raise ValueError(f"Expected a field name, got {text!r}")
+        op_kind, op = take()
+        if op_kind != "op":
+            raise ValueError(f"Expected an operator after {text}, got {op!r}")
+        value_kind, value = take()
+        if value_kind not in ("word", "string"):
+            raise ValueError(f"Expected a value after {text}{op}")
+        return ("cmp", text, "=" if op == "==" else op, value)
+
+    node = parse_or()
+    if pos != len(tokens):
+        raise ValueError(f"Unexpected {tokens[pos][1]!r} in query")
+    return node
+
+
+def _as_instant(value: Any) -> Optional[datetime]:
+    """Parse a timestamp or bare date into an aware UTC datetime."""
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        text = str(value or "")
+        if len(text) == 10:
+            text += "T00:00:00Z"
+        dt = parse_rfc3339(text)
+    if dt is None:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+_COMPARE = {
+    "=": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+}
+
+
+def _compile_cmp(field: str, op: str, literal: str) -> Predicate:
+    compare = _COMPARE.get(op)
+
+    if op == "~":
+        needle = literal.lower()
+
+        def contains(task: dict[str, Any]) -> bool:
+            value = task.get(field)
+            if isinstance(value, list):
+                return any(needle in str(item).lower() for item in value)
+            return value is not None and needle in str(value).lower()
+        return contains
+
+    if field in LIST_FIELDS:
+        if op not in ("=", "!="):
+            raise ValueError(f"{field} supports only =, != and ~")
+        negate = op == "!="
+
+        def member(task: dict[str, Any]) -> bool:
+            value = task.get(field) or []
+            items = value if isinstance(value, list) else [value]
+            return (literal in (str(item) for item in items)) != negate
+        return member
+
+    if field in ORDERED_FIELDS:
+        ranks = {name: i for i, name in enumerate(ORDERED_FIELDS[field])}
+        if literal not in ranks:
+            raise ValueError(f"Unknown {field} value: {literal} (valid: {', '.join(ORDERED_FIELDS[field])})")
+        target = ranks[literal]
+
+        def ranked(task: dict[str, Any]) -> bool:
+            rank = ranks.get(str(task.get(field)))
+            if rank is None:
+                return op == "!="
+            return compare(rank, target)
+        return ranked
+
+    if field in TIME_FIELDS:
+        target = _as_instant(literal)
+        if target is None:
+            raise ValueError(f"Invalid timestamp for {field}: {literal}")
+
+        def timed(task: dict[str, Any]) -> bool:
+            instant = _as_instant(task.get(field))
+            if instant is None:
+                return op == "!="
+            return compare(instant, target)
+        return timed
+
+    number = int(literal) if re.fullmatch(r"-?\d+", literal) else None
+
+    def plain(task: dict[str, Any]) -> bool:
+        value = task.get(field)
+        if value is None:
+            return op == "!="
+        if number is not None and isinstance(value, int) and not isinstance(value, bool):
+            return compare(value, number)
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        return compare(str(value), literal)
+    return plain
+
+
+def compile_node(node: Node) -> Predicate:
+    """Compile a node tree into a predicate over task dicts. Raises ValueError."""
+    kind = node[0]
+    if kind == "cmp":
+        return _compile_cmp(node[1], node[2], node[3])
+    if kind == "not":
+        inner = compile_node(node[1])
+        return lambda task: not inner(task)
+    parts = [compile_node(child) for child in node[1]]
+    if kind == "and":
+        return lambda task: all(part(task) for part in parts)
+    return lambda task: any(part(task) for part in parts)
+
+
+def compile_query(text: str) -> Predicate:
+    """Parse and compile a query string. Raises ValueError."""
+    return compile_node(parse_query(text))
+
+
+def index_constraints(node: Node) -> dict[str, frozenset]:
+    """
+    Derive {field: allowed values} on INDEXED_FIELDS implied by a query.
+
+    Every task matching the query has, for each returned field, a value (or
+    list element) in the allowed set, so a secondary index lookup yields a
+    superset of the matches. Fields the query does not constrain are absent.
+    """
+    kind = node[0]
+    if kind == "cmp":
+        _, field, op, literal = node
+        if field not in INDEXED_FIELDS:
+            return {}
+        if op == "=":
+            return {field: frozenset([literal])}
+        if field in ORDERED_FIELDS and op in ("<", "<=", ">", ">=") and literal in ORDERED_FIELDS[field]:
+            names = ORDERED_FIELDS[field]
+            target = names.index(literal)
+            return {field: frozenset(name for i, name in enumerate(names) if _COMPARE[op](i, target))}
+        return {}
+    if kind == "not":
+        return {}
+    children = [index_constraints(child) for child in node[1]]
+    if kind == "and":
+        return merge_constraints(*children)
+    common = set(children[0])
+    for child in children[1:]:
+        common &= set(child)
+    return {field: frozenset().union(*(child[field] for child in children)) for field in common}
+
+
+def merge_constraints(*constraints: dict[str, frozenset]) -> dict[str, frozenset]:
+    """Intersect several constraint sets (all must hold)."""
+    merged: dict[str, frozenset] = {}
+    for constraint in constraints:
+        for field, values in constraint.items():
+            merged[field] = merged[field] & values if field in merged else values
+    return merged
+
+
+def attribute_values(frontmatter: dict[str, Any], field: str) -> list[str]:
+    """Return the index keys a task contributes for a field (list fields contribute each item)."""
+    value = frontmatter.get(field)
+    if value is None:
+        return []
+    items = value if isinstance(value, list) else [value]
+    return ["true" if item is True else "false" if item is False else str(item) for item in items]
+
+
+class AttributeIndex:
+    """In-memory secondary index: {field: {value: {task key}}} over INDEXED_FIELDS."""
+
+    def __init__(self):
+        self.postings: dict[str, dict[str, set]] = {field: {} for field in INDEXED_FIELDS}
+
+    def add(self, key: str, frontmatter: dict[str, Any]) -> None:
+        for field, postings in self.postings.items():
+            for value in attribute_values(frontmatter, field):
+                postings.setdefault(value, set()).add(key)
+
+    def remove(self, key: str, frontmatter: dict[str, Any]) -> None:
+        for field, postings in self.postings.items():
+            for value in attribute_values(frontmatter, field):
+                keys = postings.get(value)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del postings[value]
+
+    def candidates(self, constraints: dict[str, frozenset]) -> Optional[set]:
+        """Return keys satisfying every constraint, or None if unconstrained."""
+        result: Optional[set] = None
+        for field, values in sorted(constraints.items(), key=lambda item: len(item[1])):
+            postings = self.postings[field]
+            keys = set().union(*(postings.get(value, ()) for value in values))
+            result = keys if result is None else result & keys
+            if not result:
+                return set()
+        return result
+
+
+def describe(node: Node) -> Union[str, list]:
+    """Render a node tree as nested lists (for debugging output)."""
+    if node[0] == "cmp":
+        return f"{node[1]} {node[2]} {node[3]}"
+    if node[0] == "not":
+        return ["not", describe(node[1])]
+    return [node[0], *(describe(child) for child in node[1])]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Parse a task query and show the index constraints derived from it"
+    )
+    parser.add_argument("query", type=str, help='Query, e.g. "kind=feature and risk>=high"')
+
+    args = parser.parse_args()
+
+    try:
+        node = parse_query(args.query)
+        compile_node(node)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    constraints = index_constraints(node)
+    print(json.dumps({
+        "query": describe(node),
+        "index_constraints": {field: sorted(values) for field, values in constraints.items()},
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+task_record.py - Compact in-memory task records.
+
+A TaskRecord holds one task's frontmatter in __slots__ instead of a per-task
+dict. task.frontmatter.schema.json allows no fields beyond the schema, so
+every field has a slot:
+
+    enums         interned strings (one shared object per distinct value)
+    timestamps    the original strings
+    intent_hash   32 raw bytes when it is 64 lowercase hex digits
+    lists         tuples
+    path          the task directory; dir_name is derived from it
+
+Every other value is held as the frontmatter had it, so get() is a slot read
+for all but lists and intent_hash and costs about what a dict lookup does.
+Values that do not fit their slot (wrong type, explicit null, fields outside
+the schema) are kept as-is in a small per-record dict, so get() returns
+exactly what the frontmatter dict held, and filters, query predicates and
+output code accept either form.
+
+encode_time / format_epoch convert canonical timestamps to and from epoch
+seconds for callers that store them as integers (task_snapshot, timedelta).
+
+Usage:
+    from task_record import TaskRecord
+
+    record = TaskRecord.from_frontmatter("tasks/implement-auth", frontmatter)
+    record.get("lifecycle_state")
+"""
+
+import os
+import re
+import sys
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Any, Optional
+
+# Enum values from task.frontmatter.schema.json.
+ENUM_FIELDS = {
+    "kind": ["feature", "bugfix", "refactor", "research", "documentation", "maintenance", "exploration", "spike"],
+    "scope": ["trivial", "minor", "moderate", "major", "epic"],
+    "risk": ["none", "low", "medium", "high", "critical"],
+    "epistemic_state": ["candidate", "draft", "validated", "invalidated"],
+    "confidence": ["low", "medium", "high"],
+    "origin": ["human", "agent", "mixed"],
+    "lifecycle_state": ["inactive", "active", "blocked", "completed", "abandoned"],
+    "intent_hash_algo": ["sha256-v1"],
+    "intent_hash_scope": ["canonical-intent"],
+}
+TIME_FIELDS = ("created_at", "last_reviewed_at", "expires_at")
+LIST_FIELDS = ("blocked_by", "depends_on", "tags")
+PLAIN_FIELDS = (
+    "id",
+    "title",
+    "staleness_days_threshold",
+    "validated_by",
+    "validated_reason",
+    "invalidated_by",
+    "invalidated_reason",
+    "superseded_by",
+)
+HASH_FIELD = "intent_hash"
+SCHEMA_FIELDS = (*PLAIN_FIELDS, *ENUM_FIELDS, *TIME_FIELDS, HASH_FIELD, *LIST_FIELDS)
+DERIVED_SLOT = "_derived"
+
+# Slot encodings, by field. Timestamps are held as-is, like plain fields.
+_PLAIN, _ENUM, _LIST, _HASH = range(4)
+_FIELD_KINDS = {
+    **{field: _PLAIN for field in (*PLAIN_FIELDS, *TIME_FIELDS)},
+    **{field: _ENUM for field in ENUM_FIELDS},
+    **{field: _LIST for field in LIST_FIELDS},
+    HASH_FIELD: _HASH,
+}
+# get() also answers the record's own attributes; interned enums read as-is.
+_READ_KINDS = {
+    **{field: _PLAIN if kind == _ENUM else kind for field, kind in _FIELD_KINDS.items()},
+    "path": _PLAIN,
+    "dir_name": _PLAIN,
+    DERIVED_SLOT: _PLAIN,
+}
+
+_CANONICAL_DAY = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_HEX_HASH = re.compile(r"^[a-f0-9]{64}$")
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_DATE = _EPOCH.date()
+# Time-of-day lookup tables: "HH" and "MM:SS" to seconds, and back to text.
+_HOUR_SECONDS = {"%02d" % hour: hour * 3600 for hour in range(24)}
+_MINUTE_SECONDS = {"%02d:%02d" % divmod(second, 60): second for second in range(3600)}
+_HOUR_TEXT = ["T%02d:" % hour for hour in range(24)]
+_MINUTE_TEXT = ["%02d:%02dZ" % divmod(second, 60) for second in range(3600)]
+
+@lru_cache(maxsize=4096)
+def _day_seconds(day: str) -> int:
+    """Epoch seconds at 00:00Z of a YYYY-MM-DD date (raises ValueError)."""
+    if not _CANONICAL_DAY.match(day):
+        raise ValueError(f"Invalid date: {day}")
+    return (date.fromisoformat(day) - _EPOCH_DATE).days * 86400
+
+
+def encode_time(value: str) -> Any:
+    """Epoch seconds for a canonical UTC timestamp, else the string unchanged."""
+    if len(value) == 20 and value[10] == "T" and value[13] == ":" and value[19] == "Z":
+        # Task timestamps share few distinct days, so the date is cached and
+        # the time of day is two table lookups.
+        hours = _HOUR_SECONDS.get(value[11:13])
+        rest = _MINUTE_SECONDS.get(value[14:19])
+        if hours is not None and rest is not None:
+            try:
+                return _day_seconds(value[:10]) + hours + rest
+            except ValueError:
+                pass
+    return value
+
+
+@lru_cache(maxsize=4096)
+def _format_day(days: int) -> str:
+    return (_EPOCH + timedelta(days=days)).date().isoformat()
+
+
+def format_epoch(seconds: int) -> str:
+    """Canonical RFC3339 UTC text for epoch seconds (inverse of encode_time)."""
+    days, rest = divmod(seconds, 86400)
+    hours, rest = divmod(rest, 3600)
+    return _format_day(days) + _HOUR_TEXT[hours] + _MINUTE_TEXT[rest]
+
+
+def _encode(kind: int, value: Any) -> Any:
+    """Slot value for a frontmatter value, or None if it must go to `extra`."""
+    if value is None or kind == _PLAIN:
+        return value
+    if kind == _ENUM:
+        return sys.intern(value) if value.__class__ is str else value
+    if kind == _LIST:
+        return tuple(value) if value.__class__ is list else None
+    if value.__class__ is str and _HEX_HASH.match(value):
+        return bytes.fromhex(value)
+    return value
+
+
+class TaskRecord:
+    """One task's frontmatter plus its directory path, in slots (unset slots read as None)."""
+
+    __slots__ = ("path", "extra", DERIVED_SLOT, *SCHEMA_FIELDS)
+
+    def __init__(self, path: str):
+        self.path = path
+        self.extra: Optional[dict[str, Any]] = None
+
+    @classmethod
+    def from_frontmatter(cls, path: str, frontmatter: dict[str, Any]) -> "TaskRecord":
+        """Build a record for the task directory `path` from its frontmatter dict."""
+        record = cls(path)
+        extra = None
+        for field, value in frontmatter.items():
+            # Inlined _encode for the common well-formed values.
+            kind = _FIELD_KINDS.get(field)
+            if value is not None:
+                if kind == _PLAIN:
+                    setattr(record, field, value)
+                    continue
+                if kind == _ENUM:
+                    setattr(record, field, sys.intern(value) if value.__class__ is str else value)
+                    continue
+                if kind is not None:
+                    slot_value = _encode(kind, value)
+                    if slot_value is not None:
+                        setattr(record, field, slot_value)
+                        continue
+            if extra is None:
+                extra = {}
+            extra[field] = value
+        record.extra = extra
+        return record
+
+    @property
+    def dir_name(self) -> str:
+        return self.path.rpartition(os.sep)[2]
+
+    def __setitem__(self, field: str, value: Any) -> None:
+        kind = _FIELD_KINDS.get(field)
+        if kind is None:
+            if field == DERIVED_SLOT:
+                setattr(self, DERIVED_SLOT, value)
+                return
+            slot_value = None
+        else:
+            slot_value = _encode(kind, value)
+        if slot_value is not None:
+            setattr(self, field, slot_value)
+            if self.extra is not None:
+                self.extra.pop(field, None)
+            return
+        if kind is not None and hasattr(self, field):
+            delattr(self, field)
+        if self.extra is None:
+            self.extra = {}
+        self.extra[field] = value
+
+    def get(self, field: str, default: Any = None) -> Any:
+        """Return a field as the frontmatter dict held it (like dict.get)."""
+        kind = _READ_KINDS.get(field)
+        if kind is not None:
+            value = getattr(self, field, None)
+            if value is not None:
+                if kind == _PLAIN:
+                    return value
+                if kind == _LIST:
+                    return list(value)
+                return value.hex() if value.__class__ is bytes else value
+        extra = self.extra
+        if extra is not None and field in extra:
+            return extra[field]
+        return default
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the task as the dict form ({"path", "dir_name", **frontmatter})."""
+        result = {"path": self.path, "dir_name": self.dir_name}
+        for field in SCHEMA_FIELDS:
+            value = self.get(field)
+            if value is not None:
+                result[field] = value
+        if self.extra:
+            result.update(self.extra)
+        return result
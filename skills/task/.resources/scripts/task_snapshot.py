@@ -0,0 +1,649 @@
+#!/usr/bin/env python3
+"""
+task_snapshot.py - Columnar snapshot of a task root for analytics.
+
+Writes every task's frontmatter plus its derived status
+(task_status.compute_derived_status) as one array per column, and answers
+group-by counts and histograms over a snapshot without reparsing tasks.
+
+Formats (by --output / --input suffix):
+    .npz    NumPy archive, one array per column (requires numpy)
+    .json   The same columns as JSON lists (no dependencies)
+
+Columns:
+    path, id, title               strings (.npz: UTF-8 bytes <col>.data + <col>.offsets)
+    kind, scope, risk, confidence, origin, epistemic_state, lifecycle_state
+                                  int32 codes into a per-column dictionary
+                                  (-1 = unset); schema enum order first
+    created_at, last_reviewed_at, expires_at
+                                  int64 epoch seconds
+    staleness_threshold, days_since_review
+                                  int64
+    is_stale, is_expired, hash_mismatch, needs_revalidation,
+    execution_eligible, activation_eligible, dependencies_met
+                                  bool
+    tags, depends_on, blocked_by  int32 codes into a dictionary, per row
+                                  <col>.offsets[i]:<col>.offsets[i + 1]
+    Integer columns hold NULL_INT (-2**63) where unset or invalid.
+
+Usage:
+    python task_snapshot.py --root tasks/ --output tasks.npz
+    python task_snapshot.py --input tasks.npz --count-by kind,risk
+    python task_snapshot.py --input tasks.npz --count-by lifecycle_state --filter is_stale=true
+    python task_snapshot.py --input tasks.npz --histogram days_since_review --bins 0,7,14,30,90
+    python task_snapshot.py --root tasks/ --count-by tags --json
+    python task_snapshot.py --input tasks.npz --now 2026-03-01T00:00:00Z --count-by is_stale
+
+Options:
+    --jobs      Worker processes computing derived status (default: CPU count)
+    --filter    FIELD=VALUE on enum, bool, integer or list columns (repeatable;
+                all must hold)
+    --now       Evaluate as of an RFC3339 instant (default: $TASK_NOW, else
+                the current time). With --input, staleness, expiry and the
+                flags depending on them are re-evaluated in one vectorized
+                pass over the epoch columns (staleness_sweep), without
+                reading any task
+    --json      Output as JSON
+
+Output:
+    Group counts (largest first) or histogram buckets; with --output only,
+    a one-line summary on stderr
+"""
+
+import argparse
+import bisect
+import json
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+from task_index import scan_task_files
+from task_record import ENUM_FIELDS, encode_time
+from task_status import compute_derived_status, get_utc_now, load_blocking, load_cached_hashes
+from task_store import NOW_ENV, TASK_FILENAME, init_clock, parse_rfc3339, read_frontmatter, write_text_atomic
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SNAPSHOT_VERSION = 2
+NULL_INT = -2**63
+STRING_COLUMNS = ("path", "id", "title")
+ENUM_COLUMNS = ("kind", "scope", "risk", "confidence", "origin", "epistemic_state", "lifecycle_state")
+TIME_COLUMNS = ("created_at", "last_reviewed_at", "expires_at")
+INT_COLUMNS = ("staleness_threshold", "days_since_review")
+BOOL_COLUMNS = (
+    "is_stale",
+    "is_expired",
+    "hash_mismatch",
+    "needs_revalidation",
+    "execution_eligible",
+    "activation_eligible",
+    "dependencies_met",
+)
+# Status fields absent from a task's status: a task without dependencies has them met.
+BOOL_DEFAULTS = {"dependencies_met": True}
+LIST_COLUMNS = ("tags", "depends_on", "blocked_by")
+FILTER_COLUMNS = (*STRING_COLUMNS, *ENUM_COLUMNS, *INT_COLUMNS, *BOOL_COLUMNS, *LIST_COLUMNS)
+# Histograms of epoch columns are not useful with day-sized bins.
+HISTOGRAM_COLUMNS = INT_COLUMNS
+# Above this many distinct group keys, count with np.unique instead of bincount.
+MAX_BINCOUNT_KEYS = 1 << 22
+
+
+def _epoch(value: Any) -> int:
+    """Epoch seconds for a timestamp value, NULL_INT if unset or invalid."""
+    if isinstance(value, str):
+        encoded = encode_time(value)
+        if isinstance(encoded, int):
+            return encoded
+        value = parse_rfc3339(value)
+    if isinstance(value, datetime):
+        dt = value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+        return int(dt.timestamp() // 1)
+    return NULL_INT
+
+
+def _int(value: Any) -> int:
+    return value if isinstance(value, int) and not isinstance(value, bool) else NULL_INT
+
+
+class TaskSnapshot:
+    """A task set as columns: NumPy arrays when numpy is installed, else lists.
+
+    `values` maps each enum and list column to its dictionary (code -> value).
+    List columns come with a `<col>.offsets` column of length rows + 1.
+    """
+
+    def __init__(self, rows: int, computed_at: str, values: dict[str, list], columns: dict[str, Any]):
+        self.rows = rows
+        self.computed_at = computed_at
+        self.values = values
+        self.columns = columns
+
+    def column(self, name: str) -> Any:
+        """Return a column; string columns of a loaded .npz are decoded on first use."""
+        if name not in self.columns and name in STRING_COLUMNS:
+            data = self.columns[f"{name}.data"].tobytes()
+            offsets = self.columns[f"{name}.offsets"].tolist()
+            self.columns[name] = [data[a:b].decode("utf-8") for a, b in zip(offsets, offsets[1:])]
+        return self.columns[name]
+
+    def meta(self) -> dict:
+        return {
+            "version": SNAPSHOT_VERSION,
+            "rows": self.rows,
+            "computed_at": self.computed_at,
+            "values": self.values,
+        }
+
+
+def _as_arrays(columns: dict[str, list]) -> dict[str, Any]:
+    """Convert list columns to NumPy arrays (no-op without numpy)."""
+    if np is None:
+        return columns
+    arrays = {}
+    for name, column in columns.items():
+        if name in STRING_COLUMNS:
+            arrays[name] = column
+        elif name in BOOL_COLUMNS:
+            arrays[name] = np.asarray(column, dtype=np.bool_)
+        elif name in ENUM_COLUMNS or name in LIST_COLUMNS:
+            arrays[name] = np.asarray(column, dtype=np.int32)
+        else:
+            arrays[name] = np.asarray(column, dtype=np.int64)
+    return arrays
+
+
+def build_snapshot(rows: Iterable[tuple[str, dict, dict]], computed_at: Optional[str] = None) -> TaskSnapshot:
+    """Build a snapshot from (task path, frontmatter, derived status) rows."""
+    columns: dict[str, list] = {
+        name: [] for name in (*STRING_COLUMNS, *ENUM_COLUMNS, *TIME_COLUMNS, *INT_COLUMNS, *BOOL_COLUMNS)
+    }
+    for field in LIST_COLUMNS:
+        columns[field] = []
+        columns[f"{field}.offsets"] = [0]
+    values = {field: list(ENUM_FIELDS.get(field, ())) for field in (*ENUM_COLUMNS, *LIST_COLUMNS)}
+    codes = {field: {value: code for code, value in enumerate(dictionary)} for field, dictionary in values.items()}
+
+    def encode(field: str, value: Any) -> int:
+        key = value if isinstance(value, str) else str(value)
+        code = codes[field].get(key)
+        if code is None:
+            code = codes[field][key] = len(values[field])
+            values[field].append(key)
+        return code
+
+    count = 0
+    for path, frontmatter, status in rows:
+        count += 1
+        columns["path"].append(path)
+        columns["id"].append(str(frontmatter.get("id") or ""))
+        columns["title"].append(str(frontmatter.get("title") or ""))
+        for field in ENUM_COLUMNS:
+            value = frontmatter.get(field)
+            columns[field].append(-1 if value is None else encode(field, value))
+        for field in TIME_COLUMNS:
+            columns[field].append(_epoch(frontmatter.get(field)))
+        for field in INT_COLUMNS:
+            columns[field].append(_int(status.get(field)))
+        for field in BOOL_COLUMNS:
+            columns[field].append(bool(status.get(field, BOOL_DEFAULTS.get(field, False))))
+        for field in LIST_COLUMNS:
+            items = frontmatter.get(field) or []
+            if not isinstance(items, list):
+                items = [items]
+            column = columns[field]
+            column.extend(encode(field, item) for item in items)
+            columns[f"{field}.offsets"].append(len(column))
+
+    computed_at = computed_at or get_utc_now().strftime("%Y-%m-%dT%H:%M:%SZ")
+    return TaskSnapshot(count, computed_at, values, _as_arrays(columns))
+
+
+def snapshot_row(
+    task_dir: str,
+    blocking: Optional[list[str]] = None,
+    cached_hash: Optional[dict] = None,
+    now: Optional[datetime] = None,
+) -> Optional[tuple[str, dict, dict]]:
+    """Read one task's frontmatter and derived status (None if it cannot be read)."""
+    path = Path(task_dir)
+    try:
+        frontmatter = read_frontmatter(path / TASK_FILENAME)
+        status = compute_derived_status(path, frontmatter, blocking, now, cached_hash)
+    except Exception:
+        return None
+    return task_dir, frontmatter, status
+
+
+def iter_rows(root: Path, jobs: int) -> Iterator[Optional[tuple[str, dict, dict]]]:
+    """Yield snapshot_row results for every task under root, in path order."""
+    task_dirs = sorted(str(task_dir) for task_dir, _ in scan_task_files(root))
+    blocking = load_blocking(root, task_dirs)
+    cached_hashes = load_cached_hashes(root, task_dirs)
+    worker = partial(snapshot_row, now=get_utc_now())
+    if jobs <= 1 or len(task_dirs) <= 1:
+        yield from map(worker, task_dirs, blocking, cached_hashes)
+        return
+
+    chunksize = max(1, min(64, len(task_dirs) // (jobs * 4)))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(worker, task_dirs, blocking, cached_hashes, chunksize=chunksize)
+
+
+def staleness_sweep(snapshot: TaskSnapshot, now: datetime) -> dict[str, Any]:
+    """
+    Compute days_since_review, is_stale and is_expired for every row as of `now`.
+
+    One vectorized pass over the created_at / last_reviewed_at / expires_at
+    epoch columns and staleness_threshold (a plain loop without numpy).
+    Agrees with task_status.compute_staleness at whole seconds; a threshold
+    that is not an integer never makes a task stale.
+    """
+    at = int(now.timestamp() // 1)
+    created = snapshot.column("created_at")
+    reviewed = snapshot.column("last_reviewed_at")
+    expires = snapshot.column("expires_at")
+    threshold = snapshot.column("staleness_threshold")
+    if np is not None:
+        created, reviewed, expires, threshold = (
+            np.asarray(column, dtype=np.int64) for column in (created, reviewed, expires, threshold)
+        )
+        reference = np.where(reviewed != NULL_INT, reviewed, created)
+        has_reference = reference != NULL_INT
+        # Unset references are replaced by `at` so the subtraction cannot overflow.
+        days = (at - np.where(has_reference, reference, at)) // 86400
+        is_expired = (expires != NULL_INT) & (expires < at)
+        is_stale = is_expired | (has_reference & (threshold != NULL_INT) & (days > threshold))
+        return {
+            "days_since_review": np.where(has_reference, days, NULL_INT),
+            "is_stale": is_stale,
+            "is_expired": is_expired,
+        }
+
+    days_since_review, is_stale, is_expired = [], [], []
+    for created_at, reviewed_at, expires_at, limit in zip(created, reviewed, expires, threshold):
+        reference = reviewed_at if reviewed_at != NULL_INT else created_at
+        days = NULL_INT if reference == NULL_INT else (at - reference) // 86400
+        expired = expires_at != NULL_INT and expires_at < at
+        days_since_review.append(days)
+        is_expired.append(expired)
+        is_stale.append(expired or (days != NULL_INT and limit != NULL_INT and days > limit))
+    return {"days_since_review": days_since_review, "is_stale": is_stale, "is_expired": is_expired}
+
+
+def reevaluate(snapshot: TaskSnapshot, now: datetime) -> None:
+    """Re-evaluate a snapshot as of `now`: staleness_sweep plus the flags that depend on it."""
+    swept = staleness_sweep(snapshot, now)
+    stale = swept["is_stale"]
+    mismatch = snapshot.column("hash_mismatch")
+    met = snapshot.column("dependencies_met")
+    epistemic = snapshot.column("epistemic_state")
+    lifecycle = snapshot.column("lifecycle_state")
+
+    def code(field: str, value: str) -> int:
+        dictionary = snapshot.values[field]
+        return dictionary.index(value) if value in dictionary else -2
+
+    validated, invalidated = code("epistemic_state", "validated"), code("epistemic_state", "invalidated")
+    active, inactive = code("lifecycle_state", "active"), code("lifecycle_state", "inactive")
+    if np is not None:
+        eligible = (epistemic == validated) & ~mismatch & met & ~stale
+        swept["needs_revalidation"] = stale | mismatch | (epistemic == invalidated)
+        swept["execution_eligible"] = eligible & (lifecycle == active)
+        # An unset lifecycle_state counts as inactive (compute_derived_status's default).
+        swept["activation_eligible"] = eligible & ((lifecycle == inactive) | (lifecycle == -1))
+    else:
+        eligible = [e == validated and not h and d and not s for e, h, d, s in zip(epistemic, mismatch, met, stale)]
+        swept["needs_revalidation"] = [s or h or e == invalidated for s, h, e in zip(stale, mismatch, epistemic)]
+        swept["execution_eligible"] = [ok and state == active for ok, state in zip(eligible, lifecycle)]
+        swept["activation_eligible"] = [ok and state in (inactive, -1) for ok, state in zip(eligible, lifecycle)]
+    snapshot.columns.update(swept)
+    snapshot.computed_at = now.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _is_string_part(name: str) -> bool:
+    """True for a string column or its .npz encoding (<col>.data / <col>.offsets)."""
+    return name.rsplit(".", 1)[0] in STRING_COLUMNS
+
+
+def save_snapshot(snapshot: TaskSnapshot, path: Path) -> None:
+    """Write a snapshot as .npz (requires numpy) or columnar .json. Raises ValueError."""
+    if path.suffix == ".npz":
+        if np is None:
+            raise ValueError("numpy is required for .npz snapshots; use a .json output")
+        arrays = {"meta": np.array(json.dumps(snapshot.meta()))}
+        for name in STRING_COLUMNS:
+            encoded = [text.encode("utf-8") for text in snapshot.column(name)]
+            arrays[f"{name}.data"] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+            arrays[f"{name}.offsets"] = np.cumsum([0, *map(len, encoded)], dtype=np.int64)
+        for name, column in snapshot.columns.items():
+            if not _is_string_part(name):
+                arrays[name] = column
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp, "xb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        return
+
+    if path.suffix != ".json":
+        raise ValueError(f"Unsupported snapshot format: {path.suffix or path.name} (use .npz or .json)")
+    columns = {name: list(snapshot.column(name)) for name in STRING_COLUMNS}
+    for name, column in snapshot.columns.items():
+        if not _is_string_part(name):
+            columns[name] = column.tolist() if np is not None else list(column)
+    write_text_atomic(path, json.dumps({"meta": snapshot.meta(), "columns": columns}))
+
+
+def load_snapshot(path: Path) -> TaskSnapshot:
+    """Load a snapshot written by save_snapshot. Raises ValueError or OSError."""
+    if path.suffix == ".npz":
+        if np is None:
+            raise ValueError("numpy is required to read .npz snapshots")
+        with np.load(path) as archive:
+            columns = {name: archive[name] for name in archive.files}
+        meta = json.loads(str(columns.pop("meta")))
+    else:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        meta = data.get("meta", {})
+        columns = _as_arrays(data.get("columns", {}))
+    if meta.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {meta.get('version')}")
+    return TaskSnapshot(meta["rows"], meta["computed_at"], meta["values"], columns)
+
+
+def _list_rows(snapshot: TaskSnapshot, field: str) -> Any:
+    """Row number of each item of a list column."""
+    offsets = snapshot.column(f"{field}.offsets")
+    if np is not None:
+        return np.repeat(np.arange(snapshot.rows), np.diff(offsets))
+    return [row for row in range(snapshot.rows) for _ in range(offsets[row + 1] - offsets[row])]
+
+
+def select(snapshot: TaskSnapshot, filters: dict[str, str]) -> Optional[Any]:
+    """Return a per-row boolean mask for {column: value} equality filters (None if no filters).
+
+    List columns match rows containing the value. Raises ValueError for
+    unknown columns or values that cannot be compared.
+    """
+    if not filters:
+        return None
+    mask = np.ones(snapshot.rows, dtype=np.bool_) if np is not None else [True] * snapshot.rows
+    for field, literal in filters.items():
+        if field not in FILTER_COLUMNS:
+            raise ValueError(f"Cannot filter on column: {field}")
+        column = snapshot.column(field)
+        if field in BOOL_COLUMNS:
+            if literal.lower() not in ("true", "false"):
+                raise ValueError(f"{field} takes true or false, not {literal}")
+            target: Any = literal.lower() == "true"
+        elif field in INT_COLUMNS:
+            try:
+                target = int(literal)
+            except ValueError:
+                raise ValueError(f"{field} takes an integer, not {literal}") from None
+        elif field in STRING_COLUMNS:
+            target = literal
+        else:
+            dictionary = snapshot.values[field]
+            target = dictionary.index(literal) if literal in dictionary else -2
+
+        if field in LIST_COLUMNS:
+            rows = _list_rows(snapshot, field)
+            if np is not None:
+                hit = np.zeros(snapshot.rows, dtype=np.bool_)
+                hit[rows[column == target]] = True
+            else:
+                hit = [False] * snapshot.rows
+                for row, code in zip(rows, column):
+                    if code == target:
+                        hit[row] = True
+        elif np is not None and field not in STRING_COLUMNS:
+            hit = column == target
+        else:
+            hit = [value == target for value in column]
+
+        if np is not None:
+            mask &= np.asarray(hit, dtype=np.bool_)
+        else:
+            mask = [a and b for a, b in zip(mask, hit)]
+    return mask
+
+
+def _group_column(snapshot: TaskSnapshot, field: str) -> tuple[Any, int, list]:
+    """Return (non-negative key column, radix, labels) for a group-by column."""
+    if field in ENUM_COLUMNS:
+        labels = [None, *snapshot.values[field]]
+        column = snapshot.column(field)
+        return (column + 1 if np is not None else [code + 1 for code in column]), len(labels), labels
+    if field in LIST_COLUMNS:
+        labels = list(snapshot.values[field])
+        return snapshot.column(field), max(len(labels), 1), labels
+    if field in BOOL_COLUMNS:
+        column = snapshot.column(field)
+        return (column.astype(np.int64) if np is not None else [int(v) for v in column]), 2, [False, True]
+    raise ValueError(f"Cannot group by column: {field} (enum, bool and list columns only)")
+
+
+def count_by(snapshot: TaskSnapshot, fields: list[str], mask: Optional[Any] = None) -> list[tuple[tuple, int]]:
+    """Count rows per combination of values of `fields`, largest groups first.
+
+    A list column counts each row once per item (at most one list column
+    per call). `mask` restricts the rows counted (see select()). Raises
+    ValueError.
+    """
+    list_fields = [field for field in fields if field in LIST_COLUMNS]
+    if len(list_fields) > 1:
+        raise ValueError("count_by supports at most one list column")
+    rows = _list_rows(snapshot, list_fields[0]) if list_fields else None
+    groups = [_group_column(snapshot, field) for field in fields]
+
+    if np is not None:
+        keys = np.zeros(len(rows) if rows is not None else snapshot.rows, dtype=np.int64)
+        for field, (column, radix, _) in zip(fields, groups):
+            if rows is not None and field not in LIST_COLUMNS:
+                column = column[rows]
+            keys = keys * radix + column
+        if mask is not None:
+            keys = keys[mask[rows] if rows is not None else mask]
+        total = 1
+        for _, radix, _ in groups:
+            total *= radix
+        if total <= MAX_BINCOUNT_KEYS:
+            counts = np.bincount(keys, minlength=total)
+            present = np.flatnonzero(counts)
+            found = zip(present.tolist(), counts[present].tolist())
+        else:
+            unique, counts = np.unique(keys, return_counts=True)
+            found = zip(unique.tolist(), counts.tolist())
+        results = []
+        for key, count in found:
+            labels = []
+            for _, radix, names in reversed(groups):
+                key, code = divmod(key, radix)
+                labels.append(names[code])
+            results.append((tuple(reversed(labels)), count))
+    else:
+        columns = []
+        for field, (column, _, _) in zip(fields, groups):
+            if rows is not None and field not in LIST_COLUMNS:
+                column = [column[row] for row in rows]
+            columns.append(column)
+        keys = zip(*columns)
+        if mask is not None:
+            keep = mask if rows is None else [mask[row] for row in rows]
+            keys = (key for key, kept in zip(keys, keep) if kept)
+        results = [
+            (tuple(names[code] for code, (_, _, names) in zip(key, groups)), count)
+            for key, count in Counter(keys).items()
+        ]
+    results.sort(key=lambda item: (-item[1], [str(label) for label in item[0]]))
+    return results
+
+
+def histogram(snapshot: TaskSnapshot, field: str, edges: list[int], mask: Optional[Any] = None) -> tuple[list[int], int]:
+    """Bucket an integer column by sorted `edges`; return (counts, null count).
+
+    Buckets are (-inf, e0), [e0, e1), ..., [ek, inf). Raises ValueError.
+    """
+    if field not in HISTOGRAM_COLUMNS:
+        raise ValueError(f"Cannot build a histogram of: {field} (use {', '.join(HISTOGRAM_COLUMNS)})")
+    if list(edges) != sorted(set(edges)):
+        raise ValueError("Histogram bins must be strictly increasing")
+    column = snapshot.column(field)
+    if np is not None:
+        if mask is not None:
+            column = column[mask]
+        valid = column != NULL_INT
+        buckets = np.searchsorted(np.asarray(edges, dtype=np.int64), column[valid], side="right")
+        counts = np.bincount(buckets, minlength=len(edges) + 1).tolist()
+        return counts, int(len(column) - valid.sum())
+    counts = [0] * (len(edges) + 1)
+    nulls = 0
+    for value, kept in zip(column, mask if mask is not None else [True] * len(column)):
+        if not kept:
+            continue
+        if value == NULL_INT:
+            nulls += 1
+        else:
+            counts[bisect.bisect_right(edges, value)] += 1
+    return counts, nulls
+
+
+def bucket_label(edges: list[int], bucket: int) -> str:
+    if bucket == 0:
+        return f"<{edges[0]}"
+    if bucket == len(edges):
+        return f">={edges[-1]}"
+    low, high = edges[bucket - 1], edges[bucket] - 1
+    return str(low) if low == high else f"{low}-{high}"
+
+
+def parse_filters(items: list[str]) -> dict[str, str]:
+    """Parse FIELD=VALUE arguments. Raises ValueError."""
+    filters = {}
+    for item in items:
+        field, sep, value = item.partition("=")
+        if not sep or not field:
+            raise ValueError(f"Invalid filter (expected FIELD=VALUE): {item}")
+        filters[field.strip()] = value.strip()
+    return filters
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Write a columnar task snapshot and aggregate over it"
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--root", type=str, help="Root directory containing task directories")
+    source.add_argument("--input", type=str, help="Read an existing snapshot (.npz or .json)")
+    parser.add_argument("--output", type=str, help="Write the snapshot (.npz or .json)")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes computing derived status (default: CPU count)"
+    )
+    parser.add_argument("--count-by", type=str, help="Comma-separated columns to count by")
+    parser.add_argument("--histogram", type=str, help="Integer column to bucket (e.g. days_since_review)")
+    parser.add_argument("--bins", type=str, default="0,7,14,30,90", help="Histogram bucket edges (default: 0,7,14,30,90)")
+    parser.add_argument("--filter", action="append", default=[], help="FIELD=VALUE row filter (repeatable)")
+    parser.add_argument("--now", type=str, help="Evaluate as of this RFC3339 time (default: $TASK_NOW)")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+
+    if not (args.output or args.count_by or args.histogram):
+        print("Error: Nothing to do (use --output, --count-by or --histogram)", file=sys.stderr)
+        return 1
+
+    try:
+        now = init_clock(args.now)
+        if args.root:
+            root = Path(args.root)
+            if not root.is_dir():
+                print(f"Error: Root directory does not exist: {root}", file=sys.stderr)
+                return 1
+            rows = list(iter_rows(root, args.jobs))
+            errors = sum(row is None for row in rows)
+            snapshot = build_snapshot(row for row in rows if row is not None)
+            del rows
+            if errors:
+                print(f"Warning: Skipped {errors} unreadable task(s)", file=sys.stderr)
+        else:
+            snapshot = load_snapshot(Path(args.input))
+            if args.now or os.environ.get(NOW_ENV):
+                reevaluate(snapshot, now)
+
+        if args.output:
+            save_snapshot(snapshot, Path(args.output))
+            print(f"Wrote {snapshot.rows} task(s) to {args.output}", file=sys.stderr)
+
+        mask = select(snapshot, parse_filters(args.filter))
+        matched = snapshot.rows if mask is None else int(np.count_nonzero(mask) if np is not None else sum(mask))
+        if args.count_by:
+            fields = [field.strip() for field in args.count_by.split(",") if field.strip()]
+            groups = count_by(snapshot, fields, mask)
+        if args.histogram:
+            edges = [int(edge) for edge in args.bins.split(",") if edge.strip()]
+            if not edges:
+                raise ValueError("--bins needs at least one edge")
+            counts, nulls = histogram(snapshot, args.histogram, edges, mask)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.count_by:
+        if args.json:
+            print(json.dumps({
+                "computed_at": snapshot.computed_at,
+                "rows": matched,
+                "count_by": fields,
+                "groups": [{**dict(zip(fields, labels)), "count": count} for labels, count in groups],
+            }, indent=2))
+        else:
+            widths = [max([len(field), *(len(str(labels[i])) for labels, _ in groups)]) for i, field in enumerate(fields)]
+            print("  ".join(field.upper().ljust(width) for field, width in zip(fields, widths)) + "  COUNT")
+            for labels, count in groups:
+                print("  ".join(str(label if label is not None else "-").ljust(width) for label, width in zip(labels, widths)) + f"  {count}")
+            print(f"\n{matched} task(s) in {len(groups)} group(s)")
+
+    if args.histogram:
+        if args.json:
+            bounds = [None, *edges, None]
+            print(json.dumps({
+                "computed_at": snapshot.computed_at,
+                "rows": matched,
+                "histogram": args.histogram,
+                "buckets": [
+                    {"from": bounds[i], "to": bounds[i + 1], "count": count}
+                    for i, count in enumerate(counts)
+                ],
+                "null": nulls,
+            }, indent=2))
+        else:
+            width = max(len(args.histogram), *(len(bucket_label(edges, i)) for i in range(len(counts))))
+            print(f"{args.histogram.upper().ljust(width)}  COUNT")
+            for i, count in enumerate(counts):
+                print(f"{bucket_label(edges, i).ljust(width)}  {count}")
+            if nulls:
+                print(f"{'(unset)'.ljust(width)}  {nulls}")
+            print(f"\n{matched} task(s)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
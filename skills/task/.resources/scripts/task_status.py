@@ -5,109 +5,98 @@ task_status.py - Compute derived status flags for a task.
 Computes staleness, expiry, hash mismatch, and execution eligibility.
 Writes derived state to 99_STATE.md.
 
+A task that declares depends_on / blocked_by is only eligible while every
+dependency is satisfied: completed, not invalidated, and itself satisfied
+(see task_graph.py). When a task is completed or invalidated, --changed
+rewrites 99_STATE.md for that task and only those of its dependents whose
+recorded eligibility no longer matches, instead of recomputing the whole root.
+
 Usage:
     python task_status.py --task /path/to/task-dir
     python task_status.py --task /path/to/task-dir --json
+    python task_status.py --root tasks/ --jobs 8 --changed-only
+    python task_status.py --root tasks/ --changed implement-auth
+
+Options:
+    --root          Compute status for every task under root (NDJSON, one task per line)
+    --changed       With --root: propagate a changed task (repeatable) to the
+                    dependents it affects, reporting tasks touched vs total
+    --jobs          Worker processes for --root (default: CPU count)
+    --changed-only  Only rewrite 99_STATE.md where derived status changed
+    --no-write      Do not write 99_STATE.md
+    --now           Evaluate as of this RFC3339 instant (default: $TASK_NOW, else
+                    the system clock); one instant is used for the whole run
 
 Output:
-    Derived status summary or JSON object
+    Derived status summary or JSON object (NDJSON stream with --root)
 """
 
+import sys
+
+if __name__ == "__main__":
+    # Hand the call to a running task_daemon.py before the imports below (see task_client.py).
+    from task_client import delegate
+
+    delegate("task_status")
+
 import argparse
 import json
+import os
 import re
-import sys
-from datetime import datetime, timezone, timedelta
+from datetime import datetime
+from functools import partial
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple, Optional
+
+from task_hash import compute_intent_hash, lookup_hash_cache
+from task_index import load_hash_cache, scan_task_files
+from task_layout import find_root, read_layout, relative_task_path
+from task_store import (
+    STATE_FILENAME,
+    init_clock,
+    parse_rfc3339,
+    read_frontmatter,
+    read_frontmatter_raw,
+    utc_now,
+    write_state,
+)
+
+if TYPE_CHECKING:
+    # task_graph pulls in the listing stack; it is imported where a graph is built.
+    from task_graph import TaskGraph
 
 DEFAULT_STALENESS_DAYS = 14
+_DEPENDENCIES_MET_PATTERN = re.compile(r"^  dependencies_met: (true|false)$", re.MULTILINE)
+_WAITING_PATTERN = re.compile(r"^  - Waiting on dependencies: (.*)$", re.MULTILINE)
 
 
 def get_utc_now() -> datetime:
-    """Return current UTC datetime."""
-    return datetime.now(timezone.utc)
+    """Return current UTC datetime (the shared clock, see task_store.utc_now)."""
+    return utc_now()
 
 
-def parse_rfc3339(timestamp: str) -> datetime:
-    """Parse RFC3339 timestamp to datetime."""
-    if not timestamp:
-        return None
-    timestamp = timestamp.replace("Z", "+00:00")
-    try:
-        return datetime.fromisoformat(timestamp)
-    except ValueError:
-        return None
+def compute_hash(task_dir: Path, cached_hash: Optional[dict] = None) -> str:
+    """Compute current intent hash (served from the task's intent hash cache entry when valid)."""
+    return compute_intent_hash(task_dir, cached_hash).computed_hash
 
 
-def read_frontmatter(task_file: Path) -> dict:
-    """Read frontmatter from task file."""
-    content = task_file.read_text(encoding="utf-8")
-    
-    if not content.startswith("---"):
-        raise ValueError("Missing frontmatter delimiter")
-    
-    parts = content.split("---", 2)
-    if len(parts) < 3:
-        raise ValueError("Missing closing frontmatter delimiter")
-    
-    try:
-        import yaml
-        return yaml.safe_load(parts[1].strip()) or {}
-    except ImportError:
-        return _parse_simple_yaml(parts[1].strip())
-
-
-def _parse_simple_yaml(raw: str) -> dict:
-    """Simple YAML parser fallback."""
-    result = {}
-    for line in raw.split("\n"):
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-        if ":" in line:
-            key, _, value = line.partition(":")
-            value = value.strip().strip('"').strip("'")
-            if value.lower() == "true":
-                value = True
-            elif value.lower() == "false":
-                value = False
-            elif value.isdigit():
-                value = int(value)
-            result[key.strip()] = value
-    return result
-
-
-def compute_hash(task_dir: Path) -> str:
-    """Compute current intent hash."""
-    import importlib.util
-    import hashlib
-    
-    script_dir = Path(__file__).parent
-    extract_script = script_dir / "task_intent_extract.py"
-    
-    if extract_script.exists():
-        spec = importlib.util.spec_from_file_location("task_intent_extract", extract_script)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        canonical_blob = module.extract_canonical_intent(task_dir)
-        return hashlib.sha256(canonical_blob.encode("utf-8")).hexdigest()
-    
-    return None
+class Staleness(NamedTuple):
+    """A task's staleness and expiry as of one instant."""
 
+    is_stale: bool
+    is_expired: bool
+    stale_reason: Optional[str]
+    days_since_review: Optional[int]
+    staleness_threshold: Any
 
-def compute_derived_status(task_dir: Path, frontmatter: dict) -> dict:
-    """Compute all derived status flags."""
-    now = get_utc_now()
-    
+
+def compute_staleness(frontmatter: dict, now: datetime) -> Staleness:
+    """Compute staleness from created_at / last_reviewed_at / expires_at as of `now`."""
     created_at = parse_rfc3339(frontmatter.get("created_at", ""))
     last_reviewed_at = parse_rfc3339(frontmatter.get("last_reviewed_at", ""))
     expires_at = parse_rfc3339(frontmatter.get("expires_at", ""))
     staleness_threshold = frontmatter.get("staleness_days_threshold", DEFAULT_STALENESS_DAYS)
     
-    epistemic_state = frontmatter.get("epistemic_state", "candidate")
-    lifecycle_state = frontmatter.get("lifecycle_state", "inactive")
-    stored_hash = frontmatter.get("intent_hash", "")
-    
     reference_time = last_reviewed_at or created_at
     
     is_stale = False
@@ -126,10 +115,34 @@ def compute_derived_status(task_dir: Path, frontmatter: dict) -> dict:
         is_stale = True
         stale_reason = f"Expired at {expires_at.strftime('%Y-%m-%dT%H:%M:%SZ')}"
     
+    return Staleness(is_stale, is_expired, stale_reason, days_since_review, staleness_threshold)
+
+
+def compute_derived_status(
+    task_dir: Path,
+    frontmatter: dict,
+    blocking: Optional[list[str]] = None,
+    now: Optional[datetime] = None,
+    cached_hash: Optional[dict] = None,
+) -> dict:
+    """Compute all derived status flags as of `now` (default: get_utc_now()).
+
+    `blocking` lists the task's unsatisfied dependencies (see task_blocking);
+    None means dependencies were not evaluated and adds no dependency fields.
+    `cached_hash` is the task's intent hash cache entry (task_index.load_hash_cache),
+    if any; the cache is only read here.
+    """
+    now = now or get_utc_now()
+    is_stale, is_expired, stale_reason, days_since_review, staleness_threshold = compute_staleness(frontmatter, now)
+    
+    epistemic_state = frontmatter.get("epistemic_state", "candidate")
+    lifecycle_state = frontmatter.get("lifecycle_state", "inactive")
+    stored_hash = frontmatter.get("intent_hash", "")
+    
     hash_mismatch = False
     computed_hash = None
     try:
-        computed_hash = compute_hash(task_dir)
+        computed_hash = compute_hash(task_dir, cached_hash)
         if stored_hash and computed_hash and stored_hash != computed_hash:
             if not stored_hash.startswith("{{"):
                 hash_mismatch = True
@@ -146,14 +159,16 @@ def compute_derived_status(task_dir: Path, frontmatter: dict) -> dict:
         epistemic_state == "validated" and
         lifecycle_state in ["active"] and
         not is_stale and
-        not hash_mismatch
+        not hash_mismatch and
+        not blocking
     )
     
     activation_eligible = (
         epistemic_state == "validated" and
         lifecycle_state == "inactive" and
         not is_stale and
-        not hash_mismatch
+        not hash_mismatch and
+        not blocking
     )
     
     refusal_reasons = []
@@ -165,8 +180,10 @@ def compute_derived_status(task_dir: Path, frontmatter: dict) -> dict:
         refusal_reasons.append(stale_reason or "Task is stale")
     if hash_mismatch:
         refusal_reasons.append("Intent hash mismatch - content changed since validation")
+    if blocking:
+        refusal_reasons.append(f"Waiting on dependencies: {', '.join(blocking)}")
     
-    return {
+    status = {
         "computed_at": now.strftime("%Y-%m-%dT%H:%M:%SZ"),
         "task_id": frontmatter.get("id", "unknown"),
         "epistemic_state": epistemic_state,
@@ -182,14 +199,42 @@ def compute_derived_status(task_dir: Path, frontmatter: dict) -> dict:
         "needs_revalidation": needs_revalidation,
         "execution_eligible": execution_eligible,
         "activation_eligible": activation_eligible,
-        "refusal_reasons": refusal_reasons if refusal_reasons else None
     }
+    if blocking is not None:
+        status["dependencies_met"] = not blocking
+        status["blocking_dependencies"] = blocking
+    status["refusal_reasons"] = refusal_reasons if refusal_reasons else None
+    return status
 
 
-def write_state_file(task_dir: Path, status: dict) -> None:
-    """Write derived state to 99_STATE.md."""
-    state_file = task_dir / "99_STATE.md"
-    
+def task_blocking(graph: "TaskGraph", task_dir: Path) -> Optional[list[str]]:
+    """Unsatisfied dependencies of a task, or None if it declares none or is not in the graph."""
+    node = graph.locate(str(task_dir))
+    if node is None or not graph.tasks[node].depends_on:
+        return None
+    return graph.blocking(node)
+
+
+def load_blocking(root: Path, task_dirs: list[str]) -> list[Optional[list[str]]]:
+    """task_blocking for each task directory, from one dependency graph of root."""
+    from task_graph import load_graph
+
+    graph = load_graph(root)
+    return [task_blocking(graph, Path(task_dir)) for task_dir in task_dirs]
+
+
+def load_cached_hashes(root: Path, task_dirs: list[str]) -> list[Optional[dict]]:
+    """The intent hash cache entry of each task directory, from one read of root's index."""
+    cache = load_hash_cache(root)
+    return [cache.get(relative_task_path(root, Path(task_dir))) for task_dir in task_dirs]
+
+
+def render_state_file(status: dict) -> str:
+    """Render derived state as 99_STATE.md content."""
+    dependency_line = dependency_row = ""
+    if "dependencies_met" in status:
+        dependency_line = f"\n  dependencies_met: {str(status['dependencies_met']).lower()}"
+        dependency_row = f"\n| Dependencies Met | {status['dependencies_met']} |"
     refusal_block = ""
     if status.get("refusal_reasons"):
         reasons = "\n".join(f"  - {r}" for r in status["refusal_reasons"])
@@ -209,7 +254,7 @@ derived_status:
   hash_mismatch: {str(status['hash_mismatch']).lower()}
   needs_revalidation: {str(status['needs_revalidation']).lower()}
   execution_eligible: {str(status['execution_eligible']).lower()}
-  activation_eligible: {str(status['activation_eligible']).lower()}{refusal_block}
+  activation_eligible: {str(status['activation_eligible']).lower()}{dependency_line}{refusal_block}
 ---
 
 # Derived State
@@ -227,7 +272,7 @@ derived_status:
 | Hash Mismatch | {status['hash_mismatch']} |
 | Needs Revalidation | {status['needs_revalidation']} |
 | Execution Eligible | {status['execution_eligible']} |
-| Activation Eligible | {status['activation_eligible']} |
+| Activation Eligible | {status['activation_eligible']} |{dependency_row}
 
 ## Chronology
 
@@ -247,19 +292,169 @@ derived_status:
         for reason in status["refusal_reasons"]:
             state_content += f"- {reason}\n"
     
-    state_file.write_text(state_content, encoding="utf-8")
+    return state_content
+
+
+def write_state_file(task_dir: Path, status: dict, only_if_changed: bool = False) -> bool:
+    """Write derived state to 99_STATE.md. Returns True if the file was written.
+
+    With `only_if_changed`, the existing file is left untouched when it differs
+    from the new content only in `computed_at`.
+    """
+    return write_state(task_dir / STATE_FILENAME, render_state_file(status), only_if_changed)
+
+
+def status_for_task(
+    task_dir: str,
+    blocking: Optional[list[str]] = None,
+    cached_hash: Optional[dict] = None,
+    write: bool = False,
+    only_if_changed: bool = False,
+    now: Optional[datetime] = None,
+) -> dict:
+    """Compute (and optionally write) derived status for one task. Never raises.
+
+    Returns the status dict with `path` and `written` added, or
+    {"path": ..., "error": ...} if the task could not be processed.
+    """
+    path = Path(task_dir)
+    try:
+        frontmatter = read_frontmatter(path / "00_TASK.md")
+        status = compute_derived_status(path, frontmatter, blocking, now, cached_hash)
+        written = write_state_file(path, status, only_if_changed) if write else False
+    except Exception as e:
+        return {"path": str(path), "error": str(e)}
+    return {"path": str(path), **status, "written": written}
+
+
+def iter_root_status(root: Path, jobs: int, write: bool, only_if_changed: bool):
+    """Yield status_for_task results for every task under root, in directory-name order."""
+    task_dirs = sorted(str(task_dir) for task_dir, _ in scan_task_files(root))
+    blocking = load_blocking(root, task_dirs)
+    cached_hashes = load_cached_hashes(root, task_dirs)
+    # Workers get the instant explicitly, so every task is evaluated at the same now.
+    worker = partial(status_for_task, write=write, only_if_changed=only_if_changed, now=get_utc_now())
+    
+    if jobs <= 1 or len(task_dirs) <= 1:
+        yield from map(worker, task_dirs, blocking, cached_hashes)
+        return
+    
+    # Only --root uses a process pool; single-task runs skip the import.
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunksize = max(1, min(64, len(task_dirs) // (jobs * 4)))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(worker, task_dirs, blocking, cached_hashes, chunksize=chunksize)
+
+
+def run_root(root: Path, jobs: int, write: bool, only_if_changed: bool) -> int:
+    """Stream NDJSON status for every task under root. Summary goes to stderr."""
+    total = written = errors = 0
+    for result in iter_root_status(root, jobs, write, only_if_changed):
+        total += 1
+        if "error" in result:
+            errors += 1
+        elif result["written"]:
+            written += 1
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
+    
+    print(f"Processed {total} task(s): {written} written, {errors} error(s)", file=sys.stderr)
+    return 1 if errors else 0
+
+
+def recorded_blocking(task_dir: Path) -> Optional[list[str]]:
+    """Blocking dependencies recorded in a task's 99_STATE.md ([] if met), or None if none are recorded."""
+    try:
+        state = read_frontmatter_raw(task_dir / STATE_FILENAME)
+    except (OSError, ValueError):
+        return None
+    met = _DEPENDENCIES_MET_PATTERN.search(state)
+    if met is None:
+        return None
+    if met.group(1) == "true":
+        return []
+    waiting = _WAITING_PATTERN.search(state)
+    return waiting.group(1).split(", ") if waiting else None
+
+
+def affected_nodes(graph: "TaskGraph", task_id: str) -> list[int]:
+    """
+    Return the changed task and every transitive dependent whose recorded status is out of date.
+
+    Each dependent's blocking dependencies are recomputed on the graph and
+    compared with what its own 99_STATE.md records, so a dependent is caught
+    even when the changed task's state file was rewritten in between (e.g.
+    by task_status.py --task). Raises KeyError for unknown tasks.
+    """
+    node = graph.node(task_id)
+    return [
+        node,
+        *(
+            dependent for dependent in graph.transitive_dependents(task_id)
+            if graph.blocking(dependent) != recorded_blocking(Path(graph.tasks[dependent].path))
+        ),
+    ]
+
+
+def run_changed(root: Path, task_ids: list[str], write: bool, only_if_changed: bool) -> int:
+    """Recompute status for changed tasks and the dependents they affect (NDJSON)."""
+    from task_graph import load_graph
+
+    graph = load_graph(root)
+    nodes: dict[int, None] = {}
+    for task_id in task_ids:
+        try:
+            nodes.update(dict.fromkeys(affected_nodes(graph, task_id)))
+        except KeyError:
+            print(f"Error: Task not found: {task_id}", file=sys.stderr)
+            return 1
+    
+    written = errors = 0
+    now = get_utc_now()
+    task_dirs = [graph.tasks[node].path for node in sorted(nodes)]
+    for task_dir, cached_hash in zip(task_dirs, load_cached_hashes(root, task_dirs)):
+        blocking = task_blocking(graph, Path(task_dir))
+        result = status_for_task(task_dir, blocking, cached_hash, write, only_if_changed, now)
+        if "error" in result:
+            errors += 1
+        elif result["written"]:
+            written += 1
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
+    
+    print(
+        f"Touched {len(nodes)} of {len(graph)} task(s): {written} written, {errors} error(s)",
+        file=sys.stderr,
+    )
+    return 1 if errors else 0
+
+
+def dependency_blocking(task_dir: Path, frontmatter: dict) -> Optional[list[str]]:
+    """task_blocking for a single task, resolving only its dependency chain (see dependency_subgraph)."""
+    if not (frontmatter.get("depends_on") or frontmatter.get("blocked_by")):
+        return None
+    from task_graph import dependency_subgraph, graph_task
+
+    task = graph_task({**frontmatter, "path": str(task_dir), "dir_name": task_dir.name})
+    return task_blocking(dependency_subgraph(find_root(task_dir), task), task_dir)
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="Compute derived status flags for a task"
     )
-    parser.add_argument(
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument(
         "--task",
         type=str,
-        required=True,
         help="Path to task directory"
     )
+    target.add_argument(
+        "--root",
+        type=str,
+        help="Root directory: compute status for every task (NDJSON output)"
+    )
     parser.add_argument(
         "--json",
         action="store_true",
@@ -270,8 +465,55 @@ def main() -> int:
         action="store_true",
         help="Do not write 99_STATE.md"
     )
+    parser.add_argument(
+        "--changed-only",
+        action="store_true",
+        help="Only rewrite 99_STATE.md when derived status changed"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes for --root (default: CPU count)"
+    )
+    parser.add_argument(
+        "--changed",
+        action="append",
+        metavar="TASK_ID",
+        help="With --root: update only this task and the dependents it affects (repeatable)"
+    )
+    parser.add_argument(
+        "--now",
+        type=str,
+        help="Evaluate as of this RFC3339 timestamp (default: $TASK_NOW, else current time)"
+    )
 
     args = parser.parse_args()
+
+    try:
+        init_clock(args.now)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.changed and not args.root:
+        print("Error: --changed requires --root", file=sys.stderr)
+        return 1
+
+    if args.root:
+        root = Path(args.root)
+        if not root.is_dir():
+            print(f"Error: Root directory does not exist: {root}", file=sys.stderr)
+            return 1
+        try:
+            read_layout(root)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        if args.changed:
+            return run_changed(root, args.changed, not args.no_write, args.changed_only)
+        return run_root(root, args.jobs, not args.no_write, args.changed_only)
+
     task_dir = Path(args.task)
 
     if not task_dir.exists() or not task_dir.is_dir():
@@ -285,10 +527,13 @@ def main() -> int:
 
     try:
         frontmatter = read_frontmatter(task_file)
-        status = compute_derived_status(task_dir, frontmatter)
+        _, _, cached_hash = lookup_hash_cache(task_dir)
+        status = compute_derived_status(
+            task_dir, frontmatter, dependency_blocking(task_dir, frontmatter), cached_hash=cached_hash
+        )
         
         if not args.no_write:
-            write_state_file(task_dir, status)
+            write_state_file(task_dir, status, only_if_changed=args.changed_only)
         
         if args.json:
             print(json.dumps(status, indent=2))
@@ -300,6 +545,8 @@ def main() -> int:
             print(f"  Hash Mismatch: {status['hash_mismatch']}")
             print(f"  Needs Revalidation: {status['needs_revalidation']}")
             print(f"  Execution Eligible: {status['execution_eligible']}")
+            if "dependencies_met" in status:
+                print(f"  Dependencies Met: {status['dependencies_met']}")
             if status.get("refusal_reasons"):
                 print("  Refusal Reasons:")
                 for reason in status["refusal_reasons"]:
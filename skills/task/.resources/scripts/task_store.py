@@ -0,0 +1,488 @@
+#!/usr/bin/env python3
+"""
+task_store.py - Shared task file access for the task scripts.
+
+Single code path for reading 00_TASK.md: frontmatter splitting, YAML parsing
+(with a dependency-free fallback), RFC3339 parsing, and a per-process parse
+cache so a task touched by several scripts in one process is parsed once.
+
+Also the one clock every script reads "now" from (utc_now). Each CLI pins it
+once per run (init_clock), from --now, else the TASK_NOW environment
+variable, else the system clock, so a whole sweep uses a single instant and
+can be replayed.
+
+Usage:
+    from task_store import load_task, read_frontmatter, parse_rfc3339
+
+    task = load_task(Path("tasks/implement-auth"))
+    task.frontmatter["id"]
+"""
+
+import os
+import re
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, NamedTuple, Optional
+
+TASK_FILENAME = "00_TASK.md"
+STATE_FILENAME = "99_STATE.md"
+NOW_ENV = "TASK_NOW"
+MAX_FRONTMATTER_BYTES = 64 * 1024
+READ_CHUNK_BYTES = 4096
+
+# Fast-path frontmatter grammar (see parse_frontmatter_fast). Plain strings
+# must start with a letter so they can never resolve to YAML numbers or
+# timestamps; bool/null words are matched exactly as PyYAML (YAML 1.1) does.
+_ENTRY_PATTERN = re.compile(r"^([A-Za-z_][A-Za-z0-9_]*):(?: +(\S.*))?$")
+_LIST_ITEM_PATTERN = re.compile(r"^( *)- +(\S.*)$")
+_FLOW_LIST_PATTERN = re.compile(r"^\[([^\[\]{}]*)\]$")
+_QUOTED_PATTERN = re.compile(r"""^(?:"([^"\\]*)"|'([^']*)')$""")
+_INT_PATTERN = re.compile(r"^[-+]?(?:0|[1-9][0-9]*)$")
+_PLAIN_STRING_PATTERN = re.compile(r"^[A-Za-z][A-Za-z0-9_ .,/()+-]*$")
+_YAML_BOOLS = {
+    word: value
+    for words, value in (("yes true on", True), ("no false off", False))
+    for base in words.split()
+    for word in (base, base.capitalize(), base.upper())
+}
+_YAML_NULLS = frozenset(["~", "null", "Null", "NULL"])
+_UNRECOGNIZED = object()
+# Characters PyYAML treats as line breaks or rejects as non-printable.
+_UNSAFE_CHARS_PATTERN = re.compile("[^\x09\x0A\x20-\x7E\xA0-\u2027\u202A-\uD7FF\uE000-\uFEFE\uFF00-\uFFFD\U00010000-\U0010FFFF]")
+
+# Lines in 99_STATE.md that only record when the state was computed.
+COMPUTED_AT_PATTERN = re.compile(r"^(?:  computed_at: |- \*\*Computed\*\*: ).*$", re.MULTILINE)
+
+
+class TaskFile(NamedTuple):
+    """Parsed 00_TASK.md. Treat `frontmatter` as read-only: it is shared via the cache."""
+    task_dir: Path
+    frontmatter: dict[str, Any]
+    frontmatter_raw: str
+    body: str
+    mtime_ns: int
+    size: int
+
+
+_cache: dict[str, TaskFile] = {}
+_frontmatter_cache: dict[str, tuple[int, int, dict[str, Any]]] = {}
+
+# Resident task sets published by task_daemon.py, keyed by resolved root:
+# {root: {path relative to root: frontmatter}}. Kept current from filesystem events, so
+# discovery inside the daemon skips the directory scan entirely.
+_resident: dict[str, dict[str, dict[str, Any]]] = {}
+# Optional secondary index over each resident set (task_query.AttributeIndex).
+_resident_indexes: dict[str, Any] = {}
+# Instant pinned by init_clock for the current run (None: not pinned).
+_now: Optional[datetime] = None
+
+
+def parse_rfc3339(timestamp: str) -> Optional[datetime]:
+    """Parse RFC3339 timestamp to datetime. Returns None if empty or invalid."""
+    if not timestamp:
+        return None
+    timestamp = timestamp.replace("Z", "+00:00")
+    try:
+        return datetime.fromisoformat(timestamp)
+    except ValueError:
+        return None
+
+
+def parse_now(timestamp: str) -> datetime:
+    """Parse a --now / TASK_NOW timestamp to aware UTC, whole seconds. Raises ValueError."""
+    parsed = parse_rfc3339(timestamp)
+    if parsed is None:
+        raise ValueError(f"Invalid RFC3339 timestamp: {timestamp}")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def init_clock(now: Optional[str] = None) -> datetime:
+    """
+    Pin utc_now() for this run and return the pinned instant.
+
+    Uses `now`, else TASK_NOW, else the system clock. Raises ValueError for an
+    invalid timestamp.
+    """
+    global _now
+    value = now or os.environ.get(NOW_ENV)
+    _now = parse_now(value) if value else datetime.now(timezone.utc).replace(microsecond=0)
+    return _now
+
+
+def reset_clock() -> None:
+    """Unpin the clock (used between requests by task_daemon.py)."""
+    global _now
+    _now = None
+
+
+def utc_now() -> datetime:
+    """The current UTC time to the second: the pinned instant, else TASK_NOW, else the system clock."""
+    if _now is not None:
+        return _now
+    value = os.environ.get(NOW_ENV)
+    if value:
+        return parse_now(value)
+    return datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def split_frontmatter(content: str) -> tuple[str, str]:
+    """Split markdown content into (frontmatter_raw, body)."""
+    if not content.startswith("---"):
+        raise ValueError("Missing frontmatter delimiter at start of file")
+
+    parts = content.split("---", 2)
+    if len(parts) < 3:
+        raise ValueError("Missing closing frontmatter delimiter")
+
+    return parts[1], parts[2]
+
+
+def read_frontmatter_raw(task_file: Path, max_bytes: int = MAX_FRONTMATTER_BYTES) -> str:
+    """
+    Read only the leading frontmatter block of a task file.
+
+    Streams the file in chunks and stops at the closing "---" (same delimiter
+    rules as split_frontmatter), so large bodies are never read.
+
+    Raises ValueError on missing delimiters, or if no closing delimiter
+    appears within `max_bytes`.
+    """
+    buf = b""
+    with open(task_file, "rb") as f:
+        while True:
+            chunk = f.read(READ_CHUNK_BYTES)
+            search_from = max(3, len(buf) - 2)
+            buf += chunk
+            if len(buf) >= 3 and not buf.startswith(b"---"):
+                raise ValueError("Missing frontmatter delimiter at start of file")
+            end = buf.find(b"---", search_from)
+            if end >= 0:
+                return buf[3:end].decode("utf-8")
+            if not chunk:
+                if not buf.startswith(b"---"):
+                    raise ValueError("Missing frontmatter delimiter at start of file")
+                raise ValueError("Missing closing frontmatter delimiter")
+            if len(buf) > max_bytes:
+                raise ValueError(
+                    f"Frontmatter exceeds {max_bytes} bytes without a closing delimiter: {task_file}"
+                )
+
+
+def _parse_fast_scalar(value: str) -> Any:
+    """Resolve a single-line scalar exactly as yaml.safe_load would, or return _UNRECOGNIZED."""
+    quoted = _QUOTED_PATTERN.match(value)
+    if quoted:
+        return quoted.group(1) if quoted.group(1) is not None else quoted.group(2)
+    if value in _YAML_BOOLS:
+        return _YAML_BOOLS[value]
+    if value in _YAML_NULLS:
+        return None
+    if _INT_PATTERN.match(value):
+        return int(value)
+    if _PLAIN_STRING_PATTERN.match(value):
+        return value
+    return _UNRECOGNIZED
+
+
+def parse_frontmatter_fast(raw: str) -> Optional[dict[str, Any]]:
+    """
+    Parse the flat frontmatter subset used by task.frontmatter.schema.json.
+
+    Handles top-level `key: value` pairs with quoted strings, plain strings,
+    booleans, null, decimal ints, block lists (`- item`) and flat flow lists
+    (`[a, b]`). Results match yaml.safe_load for everything accepted; any
+    other construct (nested mappings, multi-line scalars, unquoted timestamps,
+    floats, comments after values, ...) returns None so the caller can fall
+    back to PyYAML.
+    """
+    if _UNSAFE_CHARS_PATTERN.search(raw):
+        return None
+
+    result = {}
+    current_list = None
+    list_indent = None
+
+    for line in raw.strip().split("\n"):
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+
+        if current_list is not None:
+            item = _LIST_ITEM_PATTERN.match(line)
+            if item:
+                if list_indent is None:
+                    list_indent = item.group(1)
+                elif item.group(1) != list_indent:
+                    return None
+                value = _parse_fast_scalar(item.group(2))
+                if value is _UNRECOGNIZED:
+                    return None
+                current_list.append(value)
+                continue
+            if line[0] in " \t":
+                return None
+            if not current_list:
+                result[current_key] = None
+            current_list = None
+
+        entry = _ENTRY_PATTERN.match(line)
+        if not entry:
+            return None
+        current_key, value = entry.group(1), entry.group(2)
+        if current_key in _YAML_BOOLS or current_key in _YAML_NULLS:
+            return None
+
+        if value is None:
+            current_list = []
+            list_indent = None
+            result[current_key] = current_list
+        elif value.startswith("["):
+            flow = _FLOW_LIST_PATTERN.match(value)
+            if not flow:
+                return None
+            items = []
+            if flow.group(1).strip():
+                for part in flow.group(1).split(","):
+                    item = _parse_fast_scalar(part.strip())
+                    if item is _UNRECOGNIZED:
+                        return None
+                    items.append(item)
+            result[current_key] = items
+        else:
+            parsed = _parse_fast_scalar(value)
+            if parsed is _UNRECOGNIZED:
+                return None
+            result[current_key] = parsed
+
+    if current_list is not None and not current_list:
+        result[current_key] = None
+
+    return result
+
+
+def parse_yaml(raw: str) -> dict[str, Any]:
+    """
+    Parse a frontmatter block.
+
+    Tries the schema-aware fast path first, then PyYAML (using the libyaml
+    safe loader when available), then the simple dependency-free parser if
+    PyYAML is not installed.
+    """
+    fast = parse_frontmatter_fast(raw)
+    if fast is not None:
+        return fast
+    try:
+        import yaml
+    except ImportError:
+        return _parse_simple_yaml(raw.strip())
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return yaml.load(raw.strip(), Loader=loader) or {}
+
+
+def _parse_scalar(value: str) -> Any:
+    """Convert a simple YAML scalar to bool/int/str."""
+    value = value.strip().strip('"').strip("'")
+    if value.lower() == "true":
+        return True
+    if value.lower() == "false":
+        return False
+    if value.isdigit():
+        return int(value)
+    return value
+
+
+def _parse_simple_yaml(raw: str) -> dict[str, Any]:
+    """Simple YAML parser for key-value pairs and block lists (fallback)."""
+    result = {}
+    current_list = None
+
+    for line in raw.split("\n"):
+        line = line.rstrip()
+        if not line or line.lstrip().startswith("#"):
+            continue
+
+        stripped = line.lstrip()
+        if stripped.startswith("- "):
+            if current_list is not None:
+                current_list.append(_parse_scalar(stripped[2:]))
+            continue
+
+        if ":" in line:
+            key, _, value = line.partition(":")
+            key = key.strip()
+            value = value.strip()
+
+            if value == "" or value == "|" or value == ">":
+                current_list = []
+                result[key] = current_list
+            else:
+                result[key] = _parse_scalar(value)
+                current_list = None
+
+    return result
+
+
+def load_task(task_dir: Path) -> TaskFile:
+    """
+    Load and parse 00_TASK.md from a task directory.
+
+    Results are cached per process and revalidated against the file's
+    mtime and size, so repeated loads of an unchanged task cost one stat.
+
+    Raises FileNotFoundError if 00_TASK.md is missing and ValueError if the
+    frontmatter delimiters are malformed.
+    """
+    task_file = Path(task_dir) / TASK_FILENAME
+    key = os.path.abspath(task_file)
+
+    try:
+        st = os.stat(key)
+    except FileNotFoundError:
+        _cache.pop(key, None)
+        raise FileNotFoundError(f"{TASK_FILENAME} not found in {task_dir}") from None
+
+    cached = _cache.get(key)
+    if cached and cached.mtime_ns == st.st_mtime_ns and cached.size == st.st_size:
+        return cached
+
+    content = task_file.read_text(encoding="utf-8")
+    frontmatter_raw, body = split_frontmatter(content)
+    fm_cached = _frontmatter_cache.get(key)
+    if fm_cached and fm_cached[0] == st.st_mtime_ns and fm_cached[1] == st.st_size:
+        frontmatter = fm_cached[2]
+    else:
+        frontmatter = parse_yaml(frontmatter_raw)
+
+    task = TaskFile(
+        task_dir=Path(task_dir),
+        frontmatter=frontmatter,
+        frontmatter_raw=frontmatter_raw,
+        body=body,
+        mtime_ns=st.st_mtime_ns,
+        size=st.st_size,
+    )
+    _cache[key] = task
+    return task
+
+
+def read_frontmatter(task_file: Path) -> dict[str, Any]:
+    """
+    Read frontmatter from a 00_TASK.md path without reading the body.
+
+    Uses the bounded reader (see read_frontmatter_raw) and shares the
+    per-process cache with load_task. Raises on missing or malformed files.
+    """
+    key = os.path.abspath(task_file)
+
+    try:
+        st = os.stat(key)
+    except FileNotFoundError:
+        _frontmatter_cache.pop(key, None)
+        raise FileNotFoundError(f"{TASK_FILENAME} not found: {task_file}") from None
+
+    cached = _cache.get(key)
+    if cached and cached.mtime_ns == st.st_mtime_ns and cached.size == st.st_size:
+        return cached.frontmatter
+
+    fm_cached = _frontmatter_cache.get(key)
+    if fm_cached and fm_cached[0] == st.st_mtime_ns and fm_cached[1] == st.st_size:
+        return fm_cached[2]
+
+    frontmatter = parse_yaml(read_frontmatter_raw(Path(task_file)))
+    _frontmatter_cache[key] = (st.st_mtime_ns, st.st_size, frontmatter)
+    return frontmatter
+
+
+def invalidate(task_dir: Path) -> None:
+    """Drop a task from the parse cache (call after rewriting 00_TASK.md)."""
+    key = os.path.abspath(Path(task_dir) / TASK_FILENAME)
+    _cache.pop(key, None)
+    _frontmatter_cache.pop(key, None)
+
+
+def clear_cache() -> None:
+    """Drop every cached task."""
+    _cache.clear()
+    _frontmatter_cache.clear()
+
+
+def set_resident(root: Path, tasks: dict[str, dict[str, Any]], index: Any = None) -> None:
+    """Publish the live {relative path: frontmatter} mapping (and its attribute index) for a task root."""
+    key = str(Path(root).resolve())
+    _resident[key] = tasks
+    _resident_indexes[key] = index
+
+
+def resident_tasks(root: Path) -> Optional[dict[str, dict[str, Any]]]:
+    """Return the resident task set for a root, or None outside the daemon."""
+    if not _resident:
+        return None
+    return _resident.get(str(Path(root).resolve()))
+
+
+def resident_index(root: Path) -> Any:
+    """Return the attribute index published with a root's resident set, if any."""
+    return _resident_indexes.get(str(Path(root).resolve()))
+
+
+def _new_file_mode() -> int:
+    """Permission bits open() would give a new file under the current umask."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+# Read once: os.umask can only be queried by setting it, which is not thread-safe.
+_NEW_FILE_MODE = _new_file_mode()
+
+
+def write_text_atomic(path: Path, content: str) -> None:
+    """Write a file via temp-file-and-rename so readers never see a partial file.
+
+    The temp file gets a unique name (mkstemp) in the target's directory and
+    the target's permissions (or the umask default for a new file).
+    """
+    path = Path(path)
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = _NEW_FILE_MODE
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with open(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        # os.chmod on the path, not os.fchmod: Windows lacks fchmod before Python 3.13.
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def strip_computed_at(content: str) -> str:
+    """Remove computed_at lines so state files can be compared semantically."""
+    return COMPUTED_AT_PATTERN.sub("", content)
+
+
+def write_state(path: Path, content: str, only_if_changed: bool = False) -> bool:
+    """
+    Atomically write a derived state file. Returns True if the file was written.
+
+    With `only_if_changed`, the existing file is left untouched when it differs
+    from `content` only in computed_at lines.
+    """
+    if only_if_changed:
+        try:
+            existing = Path(path).read_text(encoding="utf-8")
+        except OSError:
+            existing = None
+        if existing is not None and strip_computed_at(existing) == strip_computed_at(content):
+            return False
+
+    write_text_atomic(path, content)
+    return True
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+task_watch.py - Incremental change tracking for a task root.
+
+Reports add/modify/delete events for 00_TASK.md files so resident views
+(task_daemon.py) are updated in O(changes) instead of rescanning every task.
+
+Backends:
+    inotify   Linux; watches the root and each task directory. Draining the
+              event queue is a single non-blocking read.
+    polling   Fallback, and the backend for sharded roots (task_layout.py);
+              stats each task directory (for added and removed tasks) and
+              every tracked 00_TASK.md, so in-place edits that leave the
+              directory mtime untouched are detected too.
+
+Usage:
+    python task_watch.py --root tasks/
+    python task_watch.py --root tasks/ --poll --interval 2
+
+Output:
+    NDJSON, one event per line: {"event": "add|modify|delete", "task": "<dir>"}
+    where <dir> is the task directory relative to the root.
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import json
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from task_layout import read_layout, relative_task_path, walk_task_dirs
+from task_store import TASK_FILENAME
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+ROOT_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_ONLYDIR
+TASK_DIR_MASK = IN_CLOSE_WRITE | IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_ONLYDIR
+EVENT_HEADER = struct.Struct("iIII")
+READ_BYTES = 64 * 1024
+
+
+class TaskEvent(NamedTuple):
+    """A change to a task's 00_TASK.md ("add", "modify" or "delete").
+
+    `dir_name` is the task directory relative to the root ("/"-separated).
+    """
+
+    kind: str
+    dir_name: str
+
+
+def file_signature(task_file: Path) -> Optional[tuple[int, int, int]]:
+    """Return (inode, mtime_ns, size) for a task file, or None if it is missing."""
+    try:
+        st = os.stat(task_file)
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+class PollingWatcher:
+    """Stat-polling watcher; works on every platform and filesystem."""
+
+    backend = "polling"
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.layout = read_layout(root)
+        self.files: dict[str, tuple[int, int, int]] = {}
+        self.dir_mtimes: dict[str, int] = self._snapshot()
+        self.resolve(self.dir_mtimes)
+
+    @property
+    def known(self) -> list[str]:
+        """Directory names of every tracked task."""
+        return list(self.files)
+
+    def _snapshot(self) -> dict[str, int]:
+        mtimes = {}
+        if self.layout:
+            for task_dir in walk_task_dirs(self.root, self.layout):
+                try:
+                    mtimes[relative_task_path(self.root, task_dir)] = os.stat(task_dir).st_mtime_ns
+                except OSError:
+                    continue
+            return mtimes
+        with os.scandir(self.root) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir():
+                        mtimes[entry.name] = entry.stat().st_mtime_ns
+                except OSError:
+                    continue
+        return mtimes
+
+    def resolve(self, names) -> list[TaskEvent]:
+        """Re-check 00_TASK.md in the given directories and return the resulting events."""
+        events = []
+        for name in sorted(names):
+            signature = file_signature(self.root / name / TASK_FILENAME)
+            previous = self.files.get(name)
+            if signature is None:
+                if previous is not None:
+                    del self.files[name]
+                    events.append(TaskEvent("delete", name))
+            elif previous is None:
+                self.files[name] = signature
+                events.append(TaskEvent("add", name))
+            elif previous != signature:
+                self.files[name] = signature
+                events.append(TaskEvent("modify", name))
+        return events
+
+    def poll(self) -> list[TaskEvent]:
+        """Return events since the previous poll."""
+        mtimes = self._snapshot()
+        touched = {name for name, mtime in mtimes.items() if self.dir_mtimes.get(name) != mtime}
+        touched.update(name for name in self.dir_mtimes if name not in mtimes)
+        # An in-place write changes the file but not its directory's mtime.
+        touched.update(self.files)
+        self.dir_mtimes = mtimes
+        return self.resolve(touched)
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher(PollingWatcher):
+    """Linux inotify watcher for flat roots; raises OSError if inotify is unavailable or exhausted."""
+
+    backend = "inotify"
+
+    def __init__(self, root: Path):
+        if read_layout(root):
+            raise OSError("inotify watching supports flat task roots only")
+        libc_name = ctypes.util.find_library("c")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches: dict[int, Optional[str]] = {}
+        self.dir_watches: dict[str, int] = {}
+        self.unwatched: set[str] = set()
+        try:
+            self._add_watch(str(root), None, ROOT_MASK)
+            super().__init__(root)
+            for name in self.dir_mtimes:
+                self._watch_dir(name, strict=True)
+        except OSError:
+            self.close()
+            raise
+        self.dir_mtimes = {}
+        # Catch files created between the initial scan and the watches.
+        self.resolve(self.dir_watches)
+
+    def _add_watch(self, path: str, name: Optional[str], mask: int) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_add_watch failed: {os.strerror(errno)}", path)
+        self.watches[wd] = name
+        return wd
+
+    def _watch_dir(self, name: str, strict: bool = False) -> None:
+        try:
+            self.dir_watches[name] = self._add_watch(str(self.root / name), name, TASK_DIR_MASK)
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+        except OSError:
+            # Watch limit reached: at startup fall back to polling, later
+            # re-check the directory on every poll instead.
+            if strict:
+                raise
+            self.unwatched.add(name)
+
+    def _unwatch_dir(self, name: str) -> None:
+        self.unwatched.discard(name)
+        wd = self.dir_watches.pop(name, None)
+        if wd is not None:
+            self.watches.pop(wd, None)
+            self._libc.inotify_rm_watch(self.fd, wd)
+
+    def _read_events(self) -> list[tuple[int, int, str]]:
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, READ_BYTES)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                events.append((wd, mask, name))
+
+    def poll(self) -> list[TaskEvent]:
+        """Drain pending inotify events and return the resulting task events."""
+        touched = set(self.unwatched)
+        for wd, mask, name in self._read_events():
+            if mask & IN_Q_OVERFLOW:
+                return self._rescan()
+            if mask & IN_IGNORED:
+                dir_name = self.watches.pop(wd, None)
+                if dir_name is not None and self.dir_watches.get(dir_name) == wd:
+                    del self.dir_watches[dir_name]
+                    touched.add(dir_name)
+                continue
+            if wd not in self.watches:
+                continue
+            dir_name = self.watches[wd]
+            if dir_name is None:
+                if not mask & IN_ISDIR:
+                    continue
+                if mask & (IN_DELETE | IN_MOVED_FROM):
+                    self._unwatch_dir(name)
+                elif name not in self.dir_watches:
+                    self._watch_dir(name)
+                touched.add(name)
+            elif name == TASK_FILENAME:
+                touched.add(dir_name)
+        return self.resolve(touched)
+
+    def _rescan(self) -> list[TaskEvent]:
+        """Recover from a queue overflow by re-checking every directory."""
+        names = set(self._snapshot())
+        for name in set(self.dir_watches) - names:
+            self._unwatch_dir(name)
+        for name in names - set(self.dir_watches):
+            self._watch_dir(name)
+        return self.resolve(names | set(self.files))
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def open_watcher(root: Path, use_inotify: bool = True) -> PollingWatcher:
+    """Return the best available watcher for a task root."""
+    if use_inotify and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root)
+        except OSError:
+            pass
+    return PollingWatcher(root)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Report add/modify/delete events for task files under a root"
+    )
+    parser.add_argument(
+        "--root",
+        type=str,
+        default="tasks/",
+        help="Root directory containing task directories"
+    )
+    parser.add_argument("--poll", action="store_true", help="Force the polling backend")
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between polls")
+
+    args = parser.parse_args()
+    root = Path(args.root)
+
+    if not root.is_dir():
+        print(f"Error: Root directory does not exist: {root}", file=sys.stderr)
+        return 1
+
+    try:
+        read_layout(root)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    watcher = open_watcher(root, use_inotify=not args.poll)
+    print(f"Watching {len(watcher.known)} task(s) in {root} ({watcher.backend})", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(args.interval)
+            for event in watcher.poll():
+                print(json.dumps({"event": event.kind, "task": event.dir_name}), flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
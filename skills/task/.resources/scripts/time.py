@@ -7,22 +7,46 @@ No external APIs. No locale dependence.
 
 Usage:
     python time.py
-    
+    python time.py --now 2026-01-09T17:23:10Z
+    TASK_NOW=2026-01-09T17:23:10Z python time.py
+
+Options:
+    --now       Report this instant instead of the system clock (default:
+                $TASK_NOW), as every task script does
+
 Output:
     2026-01-09T17:23:10Z
 """
 
+import argparse
 import sys
-from datetime import datetime, timezone
+
+from task_store import init_clock, utc_now
 
 
 def get_utc_now_rfc3339() -> str:
-    """Return current UTC time in RFC3339 format."""
-    now = datetime.now(timezone.utc)
-    return now.strftime("%Y-%m-%dT%H:%M:%SZ")
+    """Return current UTC time in RFC3339 format (the shared clock, see task_store.utc_now)."""
+    return utc_now().strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
 def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Output current UTC time in RFC3339 format"
+    )
+    parser.add_argument(
+        "--now",
+        type=str,
+        help="Use this RFC3339 timestamp as the current time (default: $TASK_NOW)"
+    )
+
+    args = parser.parse_args()
+
+    try:
+        init_clock(args.now)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
     print(get_utc_now_rfc3339())
     return 0
 
@@ -9,14 +9,39 @@ Usage:
     python timedelta.py --from 2026-01-09T17:23:10Z --days 7
     python timedelta.py --from 2026-01-09T17:23:10Z --days -3 --hours 2
     python timedelta.py --now --days 14
+    TASK_NOW=2026-01-09T17:23:10Z python timedelta.py --now --days 14
+    python timedelta.py --batch pairs.txt
+    python timedelta.py --batch --days 14 < timestamps.txt
+
+Options:
+    --now       Base on the current time: $TASK_NOW when set, else the system
+                clock (see task_store.init_clock)
+    --batch     Read "TIMESTAMP [OFFSET]" lines from a file (default: stdin)
+                and write one result line per input line, as they are read
+
+Batch lines:
+    TIMESTAMP is RFC3339 or "now"; OFFSET is whole days (-3) or
+    [+-]NdNhNmNs (7d, -3d12h, 90m), separated by a space or comma. Lines
+    without an OFFSET use --days/--hours/--minutes. A line that cannot be
+    computed yields an empty output line and an error on stderr (exit 1).
+    Canonical UTC timestamps (YYYY-MM-DDTHH:MM:SSZ) are converted with
+    integer arithmetic and cached day tables (task_record.encode_time /
+    format_epoch); other RFC3339 forms go through fromisoformat.
 
 Output:
     2026-01-16T17:23:10Z
 """
 
 import argparse
+import re
 import sys
 from datetime import datetime, timedelta, timezone
+from typing import Iterable, TextIO
+
+from task_record import encode_time, format_epoch
+from task_store import init_clock
+
+_OFFSET_PATTERN = re.compile(r"^([+-]?)(?:(\d+)d)?(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s)?$")
 
 
 def parse_rfc3339(timestamp: str) -> datetime:
@@ -34,6 +59,58 @@ def format_rfc3339(dt: datetime) -> str:
     return utc_dt.strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
+def parse_epoch(timestamp: str) -> int:
+    """Epoch seconds of an RFC3339 timestamp (fractions dropped, as in format_rfc3339). Raises ValueError."""
+    epoch = encode_time(timestamp)
+    if epoch.__class__ is int:
+        return epoch
+    return int(parse_rfc3339(timestamp).timestamp() // 1)
+
+
+def parse_offset(text: str) -> int:
+    """Seconds in a batch offset: whole days, or [+-]NdNhNmNs. Raises ValueError."""
+    if text.lstrip("+-").isdigit():
+        return int(text) * 86400
+    match = _OFFSET_PATTERN.match(text)
+    if not match or not any(match.groups()[1:]):
+        raise ValueError(f"Invalid offset: {text} (e.g. 7, -3d12h, 90m)")
+    sign, days, hours, minutes, seconds = match.groups()
+    total = int(days or 0) * 86400 + int(hours or 0) * 3600 + int(minutes or 0) * 60 + int(seconds or 0)
+    return -total if sign == "-" else total
+
+
+def run_batch(lines: Iterable[str], default_offset: int, out: TextIO) -> int:
+    """Shift each "TIMESTAMP [OFFSET]" line and write the results in order. Returns the error count."""
+    write = out.write
+    now = None
+    errors = 0
+    for number, line in enumerate(lines, 1):
+        fields = line.replace(",", " ").split()
+        if not fields:
+            write("\n")
+            continue
+        try:
+            if len(fields) > 2:
+                raise ValueError("Expected TIMESTAMP [OFFSET]")
+            timestamp = fields[0]
+            # Inlined parse_epoch for the canonical case.
+            base = encode_time(timestamp)
+            if base.__class__ is not int:
+                if timestamp == "now":
+                    if now is None:
+                        now = int(init_clock().timestamp())
+                    base = now
+                else:
+                    base = parse_epoch(timestamp)
+            offset = parse_offset(fields[1]) if len(fields) == 2 else default_offset
+            write(format_epoch(base + offset) + "\n")
+        except (ValueError, OverflowError) as e:
+            errors += 1
+            print(f"Error: line {number}: {e}", file=sys.stderr)
+            write("\n")
+    return errors
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="Compute time offsets from a base RFC3339 timestamp"
@@ -47,7 +124,7 @@ def main() -> int:
     parser.add_argument(
         "--now",
         action="store_true",
-        help="Use current UTC time as base"
+        help="Use current UTC time as base ($TASK_NOW when set)"
     )
     parser.add_argument(
         "--days",
@@ -67,11 +144,38 @@ def main() -> int:
         default=0,
         help="Minutes to add (negative to subtract)"
     )
+    parser.add_argument(
+        "--batch",
+        nargs="?",
+        const="-",
+        metavar="FILE",
+        help="Read TIMESTAMP [OFFSET] lines from FILE (default: stdin)"
+    )
 
     args = parser.parse_args()
 
+    if args.batch:
+        if args.now or args.from_time:
+            print("Error: --batch takes timestamps from its input, not --from/--now", file=sys.stderr)
+            return 1
+        default_offset = args.days * 86400 + args.hours * 3600 + args.minutes * 60
+        try:
+            if args.batch == "-":
+                errors = run_batch(sys.stdin, default_offset, sys.stdout)
+            else:
+                with open(args.batch, encoding="utf-8") as f:
+                    errors = run_batch(f, default_offset, sys.stdout)
+        except OSError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        return 1 if errors else 0
+
     if args.now:
-        base_dt = datetime.now(timezone.utc)
+        try:
+            base_dt = init_clock()
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
     elif args.from_time:
         try:
             base_dt = parse_rfc3339(args.from_time)
@@ -17,6 +17,9 @@ Options:
     --goal      Goal statement (optional)
     --expires   Expiry date RFC3339 (optional)
     --staleness Staleness threshold in days (optional)
+
+In a sharded root (<root>/.task_layout, see .resources/scripts/task_layout.py)
+the task directory is created inside its shard, e.g. tasks/2026/10/<id>/.
 """
 
 import argparse
@@ -26,12 +29,16 @@ import shutil
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Optional
 
 
 VALID_KINDS = ["feature", "bugfix", "refactor", "research", "documentation", "maintenance", "exploration", "spike"]
 VALID_SCOPES = ["trivial", "minor", "moderate", "major", "epic"]
 VALID_RISKS = ["none", "low", "medium", "high", "critical"]
 VALID_ORIGINS = ["human", "agent", "mixed"]
+LAYOUT_FILENAME = ".task_layout"
+SHARD_KEYS = ("year", "month", "kind", "prefix")
+MAX_PREFIX = 4
 
 
 def get_utc_now_rfc3339() -> str:
@@ -52,6 +59,65 @@ def validate_id(task_id: str) -> tuple[bool, str]:
     return True, "Valid"
 
 
+def read_layout(root: Path) -> list[str]:
+    """Return the root's shard layout ([] for flat); raises ValueError if invalid.
+
+    Accepts exactly what task_layout.parse_layout accepts.
+    """
+    layout_file = root / LAYOUT_FILENAME
+    if not layout_file.exists():
+        return []
+    layout = [part.strip() for part in layout_file.read_text(encoding="utf-8").strip().split("/") if part.strip()]
+    seen = set()
+    for shard in layout:
+        key, _, arg = shard.partition(":")
+        if key not in SHARD_KEYS:
+            raise ValueError(f"Invalid {layout_file}: unknown shard key: {shard}")
+        if key == "prefix":
+            if not arg.isdigit() or not 1 <= int(arg) <= MAX_PREFIX:
+                raise ValueError(f"Invalid {layout_file}: prefix shard needs a length 1-{MAX_PREFIX}")
+        elif arg:
+            raise ValueError(f"Invalid {layout_file}: shard key {key} takes no argument")
+        if key in seen:
+            raise ValueError(f"Invalid {layout_file}: shard key repeated: {key}")
+        if key == "month" and "year" not in seen:
+            raise ValueError(f"Invalid {layout_file}: month shard must come after a year shard")
+        seen.add(key)
+    return layout
+
+
+def find_existing_task(root: Path, task_id: str, layout: list[str]) -> Optional[Path]:
+    """Return an existing directory named task_id in any shard of the root, if there is one."""
+    shards = [root]
+    for _ in layout:
+        shards = [
+            child
+            for shard in shards
+            for child in sorted(shard.iterdir())
+            if child.is_dir() and not child.name.startswith(".")
+        ]
+    for shard in shards:
+        if (shard / task_id).exists():
+            return shard / task_id
+    return None
+
+
+def task_parent_dir(root: Path, task_id: str, kind: str, created_at: str, layout: list[str]) -> Path:
+    """Return the directory a new task goes in, following the root's shard layout."""
+    parent = root
+    for shard in layout:
+        key, _, arg = shard.partition(":")
+        if key == "year":
+            parent = parent / created_at[:4]
+        elif key == "month":
+            parent = parent / created_at[5:7]
+        elif key == "kind":
+            parent = parent / kind
+        elif key == "prefix":
+            parent = parent / hashlib.sha256(task_id.encode("utf-8")).hexdigest()[:int(arg)]
+    return parent
+
+
 def compute_hash(canonical_blob: str) -> str:
     """Compute SHA256 hash of canonical intent."""
     return hashlib.sha256(canonical_blob.encode("utf-8")).hexdigest()
@@ -84,12 +150,18 @@ def create_task(
     if origin not in VALID_ORIGINS:
         return False, f"Invalid origin: {origin} (valid: {VALID_ORIGINS})"
     
-    task_dir = root / task_id
-    if task_dir.exists():
-        return False, f"Task directory already exists: {task_dir}"
-    
     created_at = get_utc_now_rfc3339()
     
+    try:
+        layout = read_layout(root)
+        # The same id in another shard (other year, month or kind) is a duplicate too.
+        existing = find_existing_task(root, task_id, layout)
+    except (OSError, ValueError) as e:
+        return False, str(e)
+    if existing is not None:
+        return False, f"Task directory already exists: {existing}"
+    task_dir = task_parent_dir(root, task_id, kind, created_at, layout) / task_id
+    
     staleness_line = ""
     if staleness_days:
         staleness_line = f"staleness_days_threshold: {staleness_days}\n"